@@ -24,23 +24,45 @@ class BaseWatcher(ABC):
     def create_action_file(self, item) -> Path:
         """Create .md file in Inbox folder"""
         pass
+
+    def end_cycle(self, failed_items=(), aborted=False):
+        """Called after each poll; override to commit, report or drop per-poll state.
+
+        ``failed_items`` are the items whose ``create_action_file`` returned
+        None. ``aborted`` is True when the poll raised before every item was
+        handled, so nothing about it should be committed.
+        """
+        pass
+
+    def poll_once(self):
+        """Check for updates and write an action file for each one"""
+        failed_items, aborted = [], True
+        try:
+            items = self.check_for_updates()
+            for item in items:
+                if self.create_action_file(item) is None:
+                    failed_items.append(item)
+                    self.log_action('watcher_action_file_failed',
+                                  action_type=self.__class__.__name__,
+                                  result='failure')
+                    continue
+                self.log_action('watcher_detected_event', 
+                              action_type=self.__class__.__name__,
+                              result='success')
+            aborted = False
+        except Exception as e:
+            self.logger.error(f'Error: {e}')
+            self.log_action('watcher_error',
+                          action_type=self.__class__.__name__,
+                          result='failure',
+                          error=str(e))
+        finally:
+            self.end_cycle(failed_items, aborted)
       
     def run(self):
         self.logger.info(f'Starting {self.__class__.__name__}')
         while True:
-            try:
-                items = self.check_for_updates()
-                for item in items:
-                    self.create_action_file(item)
-                    self.log_action('watcher_detected_event', 
-                                  action_type=self.__class__.__name__,
-                                  result='success')
-            except Exception as e:
-                self.logger.error(f'Error: {e}')
-                self.log_action('watcher_error',
-                              action_type=self.__class__.__name__,
-                              result='failure',
-                              error=str(e))
+            self.poll_once()
             time.sleep(self.check_interval)
     
     def log_action(self, event_type: str, action_type: str = None, result: str = 'pending', **kwargs):
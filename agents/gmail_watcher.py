@@ -2,6 +2,9 @@
 import os
 import json
 import logging
+import sys
+import time
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime
 try:
@@ -9,6 +12,11 @@ try:
 except ImportError:
     from base_watcher import BaseWatcher
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.email_classifier import BotClassifier
+from utils.email_prefilter import HUMAN, BOT, EmailPrefilter
+from utils.gmail_batch import GmailBatchClient
+
 try:
     from google.auth.transport.requests import Request
     from google.oauth2.credentials import Credentials
@@ -39,10 +47,37 @@ class GmailWatcher(BaseWatcher):
         'https://www.googleapis.com/auth/gmail.readonly',
         'https://www.googleapis.com/auth/gmail.send'
     ]
+    THREAD_CACHE_SIZE = 256
+    WATCH_LABELS = {'UNREAD', 'IMPORTANT'}  # Same filter as the 'is:unread is:important' query
+    RETRY_LIMIT = 5  # Polls a message may fail to produce an action file before it is given up on
     
     def __init__(self, vault_path: str):
         super().__init__(vault_path, check_interval=20)
         self.service = self._authenticate()
+        self.batch = GmailBatchClient(self.service) if self.service else None
+
+        # Each message and thread is downloaded once per poll: full messages
+        # fetched for filtering are reused by create_action_file, and parsed
+        # threads are keyed by (threadId, historyId) so any change misses.
+        self.message_cache = {}
+        self.thread_history = {}
+        self.thread_cache = OrderedDict()
+        self.cache_hits = {'messages': 0, 'threads': 0}
+
+        # 'history' pulls only mailbox changes since the last stored historyId;
+        # 'unread' re-lists the newest unread important mail every poll.
+        self.sync_mode = os.getenv('GMAIL_SYNC_MODE', 'history').lower()
+        self.full_sync_limit = int(os.getenv('GMAIL_FULL_SYNC_LIMIT', '200'))
+        self.sync_state_file = self.vault_path / '.gmail_sync_state.json'
+        sync_state = self._load_sync_state()
+        self.history_id = sync_state.get('history_id')
+        self.pending_history_id = None
+        # Messages whose action file failed; history has moved past them, so they are re-fetched by id
+        self.retry_ids = dict(sync_state.get('retry_ids') or {})
+
+        # Headers and known contacts settle most emails; only ambiguous ones reach the model
+        self.prefilter = EmailPrefilter(self.vault_path / 'Company_Handbook.md')
+        self.prefilter_logged = 0
 
         # Initialize OpenAI for smart email filtering
         api_key = os.getenv('OPENAI_API_KEY')
@@ -52,6 +87,9 @@ class GmailWatcher(BaseWatcher):
         else:
             self.ai_client = None
             logger.warning("⚠️  OpenAI API key not found - using basic filtering")
+        self.classifier = BotClassifier(
+            self.ai_client, batch_size=int(os.getenv('GMAIL_CLASSIFY_BATCH_SIZE', '10'))
+        ) if self.ai_client else None
     
     def _get_client_config(self) -> dict:
         """Build OAuth client config from environment variables"""
@@ -103,85 +141,77 @@ class GmailWatcher(BaseWatcher):
     
     def _should_reply_to_email(self, msg) -> bool:
         """Use AI to intelligently determine if this email is from a real person (not spam/automated)"""
-        if not self.ai_client:
-            return True  # Default to include if AI not available
-
-        try:
-            headers = {h['name'].lower(): h['value'] for h in msg['payload'].get('headers', [])}
-            subject = headers.get('subject', '')
-            sender = headers.get('from', '')
-            body = self._get_email_body(msg.get('payload', ''))[:2000]  # Limit to 2000 chars
-
-            # Use AI to analyze if this is from a real person or automated system
-            response = self.ai_client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """You are an email filter that determines if an email is from a REAL PERSON or an AUTOMATED SYSTEM.
-
-Return only "HUMAN" or "BOT".
-
-Return BOT for:
-- No-reply addresses (noreply@, donotreply@, automated@, etc)
-- System notifications (password reset, verification, alerts)
-- Transactional emails (receipts, confirmations, invoices, shipping)
-- Automated responses (out of office, auto-reply, undeliverable)
-- Marketing/bulk emails (newsletters, promotional, surveys)
-- Explicitly says "do not reply"
-
-Return HUMAN for:
-- Emails from real people (even if brief like "Hi" or "Yes")
-- Questions or requests
-- Conversations from colleagues/friends/contacts
-- Anything that seems personally addressed to you
-- When in doubt, assume HUMAN (don't be aggressive)"""
-                    },
-                    {
-                        "role": "user",
-                        "content": f"""Email Analysis:
-
-From: {sender}
-Subject: {subject}
-Body: {body}
-
-Is this from a HUMAN or a BOT/AUTOMATED SYSTEM?"""
-                    }
-                ],
-                temperature=0.3,
-                max_tokens=10
+        return self._classify_messages([msg])[msg.get('id', '')]
+
+    def _classify_messages(self, msgs: list) -> dict:
+        """{message id: is_human}: header pre-filter first, then one batched LLM call for the rest"""
+        verdicts, ambiguous = {}, []
+        for msg in msgs:
+            headers = {h['name'].lower(): h['value'] for h in msg.get('payload', {}).get('headers', [])}
+            verdict, reason = self.prefilter.classify(headers)
+            if verdict:
+                logger.debug(f"Pre-filter: {verdict} ({reason}) for {headers.get('from', 'Unknown')}")
+                verdicts[msg.get('id', '')] = verdict == HUMAN
+            elif not self.classifier:
+                verdicts[msg.get('id', '')] = True  # Default to include if AI not available
+            else:
+                ambiguous.append((msg, headers))
+
+        if ambiguous:
+            started = time.perf_counter()
+            results = self.classifier.classify(
+                {
+                    'id': msg.get('id', ''),
+                    'from': headers.get('from', ''),
+                    'subject': headers.get('subject', ''),
+                    'body': self._get_email_body(msg.get('payload', {})),
+                }
+                for msg, headers in ambiguous
             )
-
-            decision = response.choices[0].message.content.strip().upper()
-            return "HUMAN" in decision
-
-        except Exception as e:
-            logger.error(f"AI filtering error: {e}")
-            return True  # Default to include if AI fails
+            per_email = (time.perf_counter() - started) / len(ambiguous)
+            for msg, headers in ambiguous:
+                is_human = results[msg.get('id', '')]
+                if is_human is None:
+                    # The model call failed: include the email, but keep the sender out of the verdict cache
+                    verdicts[msg.get('id', '')] = True
+                    continue
+                self.prefilter.record_llm(headers, HUMAN if is_human else BOT, per_email)
+                verdicts[msg.get('id', '')] = is_human
+        return verdicts
 
     def check_for_updates(self) -> list:
         """Check for unread important emails - filter for human-relevant ones"""
         if not self.service:
             return []
 
+        self.message_cache.clear()
+        self.thread_history.clear()
         try:
-            results = self.service.users().messages().list(
-                userId='me', q='is:unread is:important', maxResults=10
-            ).execute()
-            messages = results.get('messages', [])
+            candidates = self._list_candidates()
+            listed = {m['id'] for m in candidates}
+            candidates += [{'id': message_id} for message_id in self.retry_ids if message_id not in listed]
+            messages = [m for m in candidates if m['id'] not in self.processed_ids]
+
+            # Fetch every candidate in one batch request to check with AI
+            full_messages, fetch_errors = self.batch.get_messages([m['id'] for m in messages])
+            for full_msg in full_messages.values():
+                self._remember_message(full_msg)
+
+            # One pass over the fetched messages; ambiguous ones share batched LLM calls
+            try:
+                verdicts = self._classify_messages(list(full_messages.values()))
+            except Exception as e:
+                logger.error(f"Error classifying emails: {e}")
+                verdicts = {}
 
             filtered_messages = []
             for m in messages:
-                if m['id'] in self.processed_ids:
-                    continue
-
-                # Get full message to check with AI
                 try:
-                    full_msg = self.service.users().messages().get(
-                        userId='me', id=m['id'], format='full'
-                    ).execute()
+                    if m['id'] in fetch_errors:
+                        raise fetch_errors[m['id']]
+                    full_msg = full_messages[m['id']]
 
-                    if self._should_reply_to_email(full_msg):
+                    if verdicts.get(m['id'], True):
                         filtered_messages.append(m)
                     else:
                         # Not a human email - skip this
@@ -195,6 +225,7 @@ Is this from a HUMAN or a BOT/AUTOMATED SYSTEM?"""
             return filtered_messages
         except Exception as e:
             logger.error(f"Gmail check error: {e}")
+            self.pending_history_id = None  # Retry the same changes next poll
             return []
       
     def _get_email_body(self, payload) -> str:
@@ -229,12 +260,164 @@ Is this from a HUMAN or a BOT/AUTOMATED SYSTEM?"""
 
         return body.strip()[:5000]  # Limit to 5000 chars
 
+    def _list_candidates(self) -> list:
+        """Message ids ({'id': ...}) that may need a reply this poll"""
+        if self.sync_mode != 'history':
+            results = self.batch.execute(self.service.users().messages().list(
+                userId='me', q='is:unread is:important', maxResults=10
+            ))
+            return results.get('messages', [])
+
+        if self.history_id:
+            try:
+                return self._list_history_changes()
+            except Exception as e:
+                if getattr(getattr(e, 'resp', None), 'status', None) != 404:
+                    raise
+                logger.warning(f"Gmail historyId {self.history_id} expired - running a full resync")
+        return self._full_sync()
+
+    def _list_history_changes(self) -> list:
+        """New unread important messages since history_id, following every page"""
+        candidates = {}
+        page_token = None
+        while True:
+            request = {'userId': 'me', 'startHistoryId': self.history_id,
+                       'historyTypes': ['messageAdded', 'labelAdded']}
+            if page_token:
+                request['pageToken'] = page_token
+            results = self.batch.execute(self.service.users().history().list(**request))
+            for record in results.get('history', []):
+                for change in record.get('messagesAdded', []) + record.get('labelsAdded', []):
+                    message = change.get('message', {})
+                    if self.WATCH_LABELS <= set(message.get('labelIds', [])):
+                        candidates[message['id']] = {'id': message['id'], 'threadId': message.get('threadId')}
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                self.pending_history_id = results.get('historyId') or self.history_id
+                return list(candidates.values())
+
+    def _full_sync(self) -> list:
+        """Bounded re-list of unread important mail, anchoring history at the current mailbox state"""
+        # Read the anchor first so anything arriving during the listing shows up in the next delta
+        anchor = self.batch.execute(self.service.users().getProfile(userId='me')).get('historyId')
+        messages = []
+        page_token = None
+        while len(messages) < self.full_sync_limit:
+            request = {'userId': 'me', 'q': 'is:unread is:important',
+                       'maxResults': min(100, self.full_sync_limit - len(messages))}
+            if page_token:
+                request['pageToken'] = page_token
+            results = self.batch.execute(self.service.users().messages().list(**request))
+            messages.extend(results.get('messages', []))
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                break
+        logger.info(f"📥 Gmail full sync: {len(messages)} unread important message(s)")
+        self.pending_history_id = anchor
+        return messages
+
+    def _load_sync_state(self) -> dict:
+        try:
+            state = json.loads(self.sync_state_file.read_text())
+        except (OSError, ValueError):
+            return {}
+        return state if isinstance(state, dict) else {}
+
+    def _load_history_id(self):
+        return self._load_sync_state().get('history_id')
+
+    def _save_sync_state(self, history_id):
+        """Persist the sync point and pending retries atomically so a restart resumes from them"""
+        state = {'history_id': str(history_id)} if history_id else {}
+        if self.retry_ids:
+            state['retry_ids'] = self.retry_ids
+        tmp_file = self.sync_state_file.with_suffix('.tmp')
+        tmp_file.write_text(json.dumps(state))
+        tmp_file.replace(self.sync_state_file)
+        if history_id:
+            self.history_id = str(history_id)
+
+    def _track_retries(self, failed_items) -> bool:
+        """Update retry_ids after a poll; returns whether they changed"""
+        before = dict(self.retry_ids)
+        for message_id in list(self.retry_ids):
+            if message_id in self.processed_ids:  # written (or skipped as automated) this time
+                del self.retry_ids[message_id]
+        for item in failed_items:
+            attempts = self.retry_ids.get(item['id'], 0) + 1
+            if attempts > self.RETRY_LIMIT:
+                logger.error(f"Giving up on Gmail message {item['id']} after {self.RETRY_LIMIT} failed attempts")
+                self.retry_ids.pop(item['id'], None)
+            else:
+                self.retry_ids[item['id']] = attempts
+        return self.retry_ids != before
+
+    def _remember_message(self, msg: dict):
+        """Keep a fetched message for this poll and track its thread's newest historyId"""
+        self.message_cache[msg['id']] = msg
+        thread_id = msg.get('threadId')
+        if thread_id:
+            history_id = int(msg.get('historyId') or 0)
+            self.thread_history[thread_id] = max(history_id, self.thread_history.get(thread_id, 0))
+
+    def _get_message(self, message_id: str) -> dict:
+        """Full message, from this poll's cache when check_for_updates already fetched it"""
+        msg = self.message_cache.get(message_id)
+        if msg is not None:
+            self.cache_hits['messages'] += 1
+            return msg
+        msg = self.batch.execute(self.service.users().messages().get(
+            userId='me', id=message_id, format='full'
+        ))
+        self._remember_message(msg)
+        return msg
+
+    def end_cycle(self, failed_items=(), aborted=False):
+        """Commit the sync point, log what this poll cost and drop its message cache"""
+        # Advance only after the poll's action files were written. A poll that
+        # raised part-way replays the same changes; messages whose file failed
+        # are kept in retry_ids (saved with the sync point) and fetched by id.
+        if aborted:
+            self.pending_history_id = None
+        elif self._track_retries(failed_items) or self.pending_history_id:
+            try:
+                self._save_sync_state(self.pending_history_id or self.history_id)
+            except OSError as e:
+                logger.error(f"Could not save Gmail sync state: {e}")
+        self.pending_history_id = None
+        stats = self.batch.take_stats() if self.batch else {'round_trips': 0, 'bytes_received': 0}
+        if stats['round_trips']:
+            logger.info(
+                f"📊 Gmail poll: {stats['round_trips']} API call(s), "
+                f"~{stats['bytes_received'] / 1024:.1f} KB received, "
+                f"cache hits {self.cache_hits['messages']} message(s) / {self.cache_hits['threads']} thread(s)"
+            )
+        self.message_cache.clear()
+        self.thread_history.clear()
+        self.cache_hits = {'messages': 0, 'threads': 0}
+
+        # Cumulative since startup; logged on polls that checked new email
+        filter_stats = self.prefilter.stats()
+        if filter_stats['checked'] != self.prefilter_logged:
+            self.prefilter_logged = filter_stats['checked']
+            logger.info(
+                f"📊 Email pre-filter: {filter_stats['decided_locally']}/{filter_stats['checked']} decided locally "
+                f"({filter_stats['hit_rate']:.0%}), {filter_stats['llm_calls']} LLM call(s), "
+                f"~{filter_stats['est_saved_s']:.1f}s saved"
+            )
+
     def _get_email_thread(self, thread_id: str) -> list[dict]:
-        """Fetch full thread conversation from Gmail"""
+        """Fetch full thread conversation from Gmail (once per thread version)"""
+        key = (thread_id, self.thread_history.get(thread_id))
+        if key[1] is not None and key in self.thread_cache:
+            self.thread_cache.move_to_end(key)
+            self.cache_hits['threads'] += 1
+            return self.thread_cache[key]
         try:
-            thread = self.service.users().threads().get(
+            thread = self.batch.execute(self.service.users().threads().get(
                 userId='me', id=thread_id, format='full'
-            ).execute()
+            ))
 
             messages = []
             for msg in thread.get('messages', []):
@@ -250,6 +433,12 @@ Is this from a HUMAN or a BOT/AUTOMATED SYSTEM?"""
                 })
 
             logger.debug(f"✓ Fetched thread {thread_id} with {len(messages)} message(s)")
+            history_id = int(thread.get('historyId') or 0) or key[1]
+            if history_id is not None:
+                self.thread_history[thread_id] = history_id
+                self.thread_cache[(thread_id, history_id)] = messages
+                while len(self.thread_cache) > self.THREAD_CACHE_SIZE:
+                    self.thread_cache.popitem(last=False)
             return messages
         except Exception as e:
             logger.error(f"Failed to fetch thread {thread_id}: {e}")
@@ -258,9 +447,7 @@ Is this from a HUMAN or a BOT/AUTOMATED SYSTEM?"""
     def create_action_file(self, message) -> Path:
         """Create markdown file for new email"""
         try:
-            msg = self.service.users().messages().get(
-                userId='me', id=message['id'], format='full'
-            ).execute()
+            msg = self._get_message(message['id'])
 
             headers = {h['name']: h['value'] for h in msg['payload'].get('headers', [])}
             snippet = msg.get('snippet', '')
@@ -328,16 +515,18 @@ status: pending
 
     def mark_as_read(self, message_id: str) -> bool:
         """Mark an email as read in Gmail"""
+        return self.mark_many_as_read([message_id])
+
+    def mark_many_as_read(self, message_ids: list) -> bool:
+        """Mark emails as read with one batchModify call per 1000 ids"""
         if not self.service:
             return False
+        if not message_ids:
+            return True
 
         try:
-            self.service.users().messages().modify(
-                userId='me',
-                id=message_id,
-                body={'removeLabelIds': ['UNREAD']}
-            ).execute()
-            logger.info(f"✓ Marked as read in Gmail: {message_id}")
+            self.batch.mark_read(message_ids)
+            logger.info(f"✓ Marked {len(message_ids)} email(s) as read in Gmail")
             return True
         except Exception as e:
             logger.error(f"Failed to mark as read: {e}")
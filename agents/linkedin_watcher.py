@@ -2,10 +2,13 @@
 import os
 import json
 import logging
-import requests
+import sys
 from pathlib import Path
 from datetime import datetime, timezone
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.http_client import get_session
+
 try:
     from dotenv import load_dotenv
     load_dotenv()
@@ -23,6 +26,8 @@ class LinkedInAPI:
         self.access_token = access_token
         self.api_version = "v2"
         self.base_url = f"https://api.linkedin.com/{self.api_version}"
+        self.session = get_session('linkedin')
+        self.profile_id = None  # Fetched once, then reused for every post
 
         if not self.access_token:
             logger.warning("⚠️ LINKEDIN_ACCESS_TOKEN not set")
@@ -40,7 +45,7 @@ class LinkedInAPI:
         """Get authenticated user's profile"""
         try:
             headers = self._get_headers()
-            response = requests.get(
+            response = self.session.get(
                 "https://api.linkedin.com/v2/userinfo",
                 headers=headers
             )
@@ -50,18 +55,22 @@ class LinkedInAPI:
             logger.error(f"Failed to fetch profile: {e}")
             raise
 
+    def get_profile_id(self) -> str:
+        """Person id for post authorship; the profile call is made once per client"""
+        if not self.profile_id:
+            profile_id = self.get_profile().get('sub')
+            if not profile_id:
+                raise ValueError("Could not get user profile ID")
+            self.profile_id = profile_id
+        return self.profile_id
+
     def post_text(self, text: str) -> dict:
         """Post text to LinkedIn feed"""
         if not self.access_token:
             raise RuntimeError("LinkedIn access token not configured")
 
         try:
-            # Get profile to get ID
-            profile = self.get_profile()
-            profile_id = profile.get('sub')
-
-            if not profile_id:
-                raise ValueError("Could not get user profile ID")
+            profile_id = self.get_profile_id()
 
             headers = self._get_headers()
 
@@ -84,7 +93,7 @@ class LinkedInAPI:
                 }
             }
 
-            response = requests.post(url, json=payload, headers=headers)
+            response = self.session.post(url, json=payload, headers=headers)
 
             if response.status_code not in [200, 201]:
                 error_msg = response.text
@@ -113,12 +122,7 @@ class LinkedInAPI:
             raise RuntimeError("LinkedIn access token not configured")
 
         try:
-            # Get profile to get ID
-            profile = self.get_profile()
-            profile_id = profile.get('sub')
-
-            if not profile_id:
-                raise ValueError("Could not get user profile ID")
+            profile_id = self.get_profile_id()
 
             headers = self._get_headers()
 
@@ -147,7 +151,7 @@ class LinkedInAPI:
                 }
             }
 
-            response = requests.post(api_url, json=payload, headers=headers)
+            response = self.session.post(api_url, json=payload, headers=headers)
 
             if response.status_code not in [200, 201]:
                 error_msg = response.text
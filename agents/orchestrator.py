@@ -5,12 +5,13 @@ import time
 import logging
 import hashlib
 import re
-import subprocess
 import sys
 import base64
 import threading
 import importlib.util
 import site
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
@@ -112,6 +113,15 @@ try:
 except ImportError:
     HAS_SOCIAL_DRAFTER = False
 
+from utils.action_scheduler import ActionScheduler, urgency_class
+from utils.dedup_store import open_dedup_store
+from utils.invoice_draft_index import InvoiceDraftIndex, read_draft_keys
+from utils.vault_markdown import load_document, parse_markdown
+from utils.keyword_classifier import route_signals
+from utils.odoo_adapter import OdooAdapterPool
+from utils.http_client import close_sessions, get_session, oauth1_session
+from utils.llm_cache import cache_stats, close_caches
+
 try:
     from agents.whatsapp_watcher import WhatsAppWatcher as WhatsAppBusinessAPI
     HAS_WHATSAPP_API = True
@@ -140,6 +150,14 @@ class VaultHandler(FileSystemEventHandler):
         'https://www.googleapis.com/auth/gmail.send'
     ]
 
+    # Drafting concurrency: worker threads per batch and per-channel caps so a
+    # Gmail backlog cannot starve WhatsApp replies (override via env).
+    DRAFT_WORKERS = 8
+    CHANNEL_CONCURRENCY = {'email': 4, 'whatsapp': 4, 'tweet': 2, 'social': 2}
+    BATCH_SIZE = 50  # Flush a queue immediately once this many events are waiting
+    ODOO_BATCH_SIZE = 20  # Approved invoices/payments sent per create_invoices/log_transactions call
+    URGENCY_INDICATORS = {'URGENT': '🔴', 'BUSINESS': '🟠', 'INFO': '🟢', 'NORMAL': '⚪'}
+
     def __init__(self, vault_path):
         self.vault = Path(vault_path)
         self.inbox = self.vault / 'Inbox'  # Legacy, for backwards compatibility
@@ -189,6 +207,9 @@ class VaultHandler(FileSystemEventHandler):
             except Exception as e:
                 logger.warning(f"Could not initialize WhatsApp Business API: {e}")
 
+        # LinkedIn client is created on first post and keeps its profile id cached
+        self.linkedin_api = None
+
         # Initialize Gmail Watcher for marking emails as read
         self.gmail_watcher = None
         if GmailWatcher:
@@ -200,34 +221,57 @@ class VaultHandler(FileSystemEventHandler):
 
         # Batching optimization: buffer events and deduplicate
         self.event_queue = defaultdict(list)
-        self.processed_hashes = set()
-        self.executed_files = set()  # Track executed files to avoid double processing
-        self.invoice_drafts_created = set()  # Track (source_file, message_id) pairs to prevent duplication
+        # Bounded TTL/LRU stores that persist across restarts (DEDUP_BACKEND=memory to disable)
+        dedup_kwargs = {
+            'path': self.vault / '.dedup_state.sqlite3',
+            'backend': os.getenv('DEDUP_BACKEND', 'sqlite'),
+            'max_entries': int(os.getenv('DEDUP_MAX_ENTRIES', '100000')),
+            'ttl_seconds': float(os.getenv('DEDUP_TTL_HOURS', '168')) * 3600,
+        }
+        self.processed_hashes = open_dedup_store('processed', **dedup_kwargs)
+        self.executed_files = open_dedup_store('executed', **dedup_kwargs)  # Track executed files to avoid double processing
+        self.executing_files = set()  # Actions mid-execution; in memory only so a crash mid-send is retried on boot
+        self.invoice_drafts_created = open_dedup_store('invoice_drafts', **dedup_kwargs)  # Track (source_file, message_id) pairs to prevent duplication
+        self.invoice_index = InvoiceDraftIndex(self.pending, self.vault / '.dedup_state.sqlite3')
         self.recently_processed_files = {}  # Track (filename: timestamp) to prevent duplicate drafting
         self.dedup_window = 5.0  # Prevent reprocessing same file within 5 seconds
-        self.last_batch_time = time.time()
-        self.batch_timeout = 2.0  # Batch events every 2 seconds
+        self.batch_timeout = 2.0  # Flush a batch 2 seconds after its first event
+        self.batch_deadlines = {}  # queue_type -> monotonic time the pending batch must flush
 
         # Lock for thread-safe deduplication (prevents race conditions when multiple events fire simultaneously)
         self.dedup_lock = threading.Lock()
+        self.queue_lock = threading.Lock()  # Guards event_queue between watchdog and batch threads
+        self.batch_ready = threading.Condition(self.queue_lock)  # Wakes the flusher on new events
+
+        # Worker pool for drafting: each item blocks on one to three LLM round-trips
+        self.draft_pool = ThreadPoolExecutor(
+            max_workers=int(os.getenv('DRAFT_WORKERS', self.DRAFT_WORKERS)),
+            thread_name_prefix='drafter',
+        )
+        self.channel_slots = {
+            channel: threading.BoundedSemaphore(
+                int(os.getenv(f'DRAFT_CONCURRENCY_{channel.upper()}', limit))
+            )
+            for channel, limit in self.CHANNEL_CONCURRENCY.items()
+        }
+        self.gmail_lock = threading.Lock()  # googleapiclient services are not thread-safe
+        self.pending_read_marks = []  # Gmail ids drafted this batch; marked read in one call
+        self.last_batch_stats = {}
+
+        # Approved actions run most-urgent first; waiting ages NORMAL items forward
+        self.action_scheduler = ActionScheduler(
+            aging_seconds=float(os.getenv('ACTION_AGING_SECONDS', '60'))
+        )
+        self.drain_lock = threading.Lock()  # Only one thread executes approved actions at a time
+
+        # Odoo adapter processes are reused across invoice/payment actions
+        self.odoo_adapter = None
+        self.odoo_pool_lock = threading.Lock()
+        self.odoo_batch_size = int(os.getenv('ODOO_BATCH_SIZE', self.ODOO_BATCH_SIZE))
 
     def _extract_gmail_message_id(self, email_content: str) -> str:
         """Extract gmail_message_id from email file content"""
-        lines = email_content.split('\n')
-        for line in lines:
-            if line.startswith('gmail_message_id:'):
-                return line.split(':', 1)[1].strip()
-        return None
-
-    def _is_post_request(self, email_content: str) -> bool:
-        """Check if email is requesting a social media post"""
-        content_lower = email_content.lower()
-        post_keywords = [
-            'post to', 'post about', 'post this', 'tweet about', 'tweet this',
-            'share on', 'share to', 'social media', 'facebook', 'linkedin',
-            'twitter', 'please post', 'can you post', 'pls post'
-        ]
-        return any(keyword in content_lower for keyword in post_keywords)
+        return parse_markdown(email_content).get('gmail_message_id')
 
     def _extract_post_request(self, email_content: str) -> tuple:
         """Extract topic and context from post request email. Returns (topic, context)"""
@@ -275,34 +319,36 @@ class VaultHandler(FileSystemEventHandler):
         if inbox_files:
             logger.info(f"Found {len(inbox_files)} existing file(s) in Inbox")
             for filepath in inbox_files:
+                if filepath.name in self.processed_hashes:
+                    continue
                 try:
                     # Mark as processed before processing to prevent watcher events from re-processing
                     self.processed_hashes.add(filepath.name)
                     self._process_inbox(filepath)
                 except Exception as e:
                     logger.error(f"Error processing {filepath.name}: {e}")
+            self._flush_read_marks()
 
         # Scan Needs_Action folder for emails needing drafting
-        needs_action_files = [f for f in self.needs_action.glob('*.md') if f.name != '.gitkeep']
+        # Files drafted before a restart are remembered by the persistent dedup store
+        needs_action_files = [
+            f for f in self.needs_action.glob('*.md')
+            if f.name != '.gitkeep' and f.name not in self.processed_hashes
+        ]
         if needs_action_files:
-            logger.info(f"Found {len(needs_action_files)} existing file(s) in Needs_Action")
-            for filepath in needs_action_files:
-                try:
-                    # Mark as processed before processing to prevent watcher events from re-processing
-                    self.processed_hashes.add(filepath.name)
-                    self._process_inbox(filepath)
-                except Exception as e:
-                    logger.error(f"Error processing {filepath.name}: {e}")
+            logger.info(f"Found {len(needs_action_files)} unprocessed file(s) in Needs_Action")
+            with self.dedup_lock:
+                # Mark as processed before processing to prevent watcher events from re-processing
+                self.processed_hashes.update(filepath.name for filepath in needs_action_files)
+            self._draft_concurrently(needs_action_files)
 
         # Scan Approved
         approved_files = [f for f in self.approved.glob('*.md') if f.name != '.gitkeep']
         if approved_files:
             logger.info(f"Found {len(approved_files)} existing file(s) in Approved")
             for filepath in approved_files:
-                try:
-                    self._execute_action(filepath)
-                except Exception as e:
-                    logger.error(f"Error executing {filepath.name}: {e}")
+                self._schedule_action(filepath)
+            self._drain_actions()
 
     def _init_gmail_service(self):
         """Initialize Gmail API service"""
@@ -346,9 +392,8 @@ class VaultHandler(FileSystemEventHandler):
                 # Mark as processed immediately to prevent ANY re-processing
                 self.processed_hashes.add(filepath.name)
 
-            # Queue outside lock to avoid holding it during batch processing
-            self.event_queue['inbox'].append(filepath)
-            self._process_batch_if_ready('inbox')
+            # Queue outside lock; the flusher drafts the batch once its deadline passes
+            self._enqueue('inbox', filepath)
 
         # Handle approved actions → execute
         elif filepath.parent == self.approved:
@@ -359,11 +404,13 @@ class VaultHandler(FileSystemEventHandler):
                     logger.debug(f"Skipping already-executed file: {filepath.name}")
                     return
 
-            # Queue outside lock to avoid holding it during batch processing
-            # But don't process the batch here - let the queue handler do it
-            # to avoid double-execution if the batch is already being processed
-            self.event_queue['approved'].append(filepath)
-            self._process_batch_if_ready('approved')
+            # The writer may still be filling in the frontmatter, so urgency is read
+            # once the file is closed (on_closed) or when the flusher's batch is due
+            self._enqueue('approved', filepath)
+
+        # Drafts written into Pending_Approval by another process (or by hand)
+        elif filepath.parent == self.pending:
+            self._index_invoice_draft(filepath)
 
     def on_modified(self, event):
         """Handle file modifications - same deduplication as on_created"""
@@ -374,20 +421,91 @@ class VaultHandler(FileSystemEventHandler):
 
         # For Needs_Action and Approved folders, modified events should be ignored
         # since we already process on_created and use deduplication
-        logger.debug(f"Ignoring modified event for: {Path(event.src_path).name}")
+        filepath = Path(event.src_path)
+        if filepath.parent == self.pending:
+            # Re-read the keys once the writer has finished the frontmatter
+            self._index_invoice_draft(filepath)
+            return
+        logger.debug(f"Ignoring modified event for: {filepath.name}")
 
-    def _process_batch_if_ready(self, queue_type):
-        """Process batch if timeout reached or queue is large enough"""
-        queue = self.event_queue[queue_type]
-        current_time = time.time()
+    def on_closed(self, event):
+        """Schedule an approved file as soon as its writer closes it.
 
-        # Process if batch is large (50 files) or timeout reached
-        if len(queue) >= 50 or (current_time - self.last_batch_time) > self.batch_timeout:
-            self._process_batch(queue_type)
+        The scheduler is thread-safe, so a drain already running picks an
+        URGENT file ahead of the NORMAL work still waiting; the flusher then
+        only has to drain. Platforms without close events fall back to the
+        flusher scheduling the batch.
+        """
+        if event.is_directory:
+            return
+        filepath = Path(event.src_path)
+        if filepath.parent == self.approved and filepath.exists():
+            self._schedule_action(filepath)
+
+    def on_moved(self, event):
+        """Keep the invoice draft index in step with drafts leaving or entering Pending_Approval"""
+        if event.is_directory:
+            return
+        self._forget_invoice_draft(Path(event.src_path))
+        dest = Path(event.dest_path)
+        if dest.parent == self.pending:
+            self._index_invoice_draft(dest)
+
+    def on_deleted(self, event):
+        if not event.is_directory:
+            self._forget_invoice_draft(Path(event.src_path))
+
+    def _index_invoice_draft(self, filepath):
+        """Add (or refresh) a Pending_Approval invoice draft in the index from its frontmatter"""
+        if not filepath.match(InvoiceDraftIndex.PATTERN):
+            return
+        try:
+            self.invoice_index.add(filepath.name, *read_draft_keys(filepath))
+        except OSError as e:
+            logger.debug(f"Could not index invoice draft {filepath.name}: {e}")
+
+    def _forget_invoice_draft(self, filepath):
+        if filepath.parent == self.pending and filepath.match(InvoiceDraftIndex.PATTERN):
+            self.invoice_index.discard(filepath.name)
+
+    def _enqueue(self, queue_type, filepath):
+        """Append a detected file to its batch queue and wake the flusher"""
+        with self.batch_ready:
+            queue = self.event_queue[queue_type]
+            if not queue:
+                self.batch_deadlines[queue_type] = time.monotonic() + self.batch_timeout
+            queue.append(filepath)
+            self.batch_ready.notify_all()
+
+    def _wait_for_ready_batches(self, timeout):
+        """Sleep until a batch deadline passes or a queue reaches BATCH_SIZE.
+
+        Returns the queue types that are ready to flush, or [] once timeout expires.
+        """
+        give_up_at = time.monotonic() + max(timeout, 0)
+        with self.batch_ready:
+            while True:
+                now = time.monotonic()
+                pending = {
+                    queue_type: self.batch_deadlines.get(queue_type, now)
+                    for queue_type, queue in self.event_queue.items() if queue
+                }
+                ready = [
+                    queue_type for queue_type, deadline in pending.items()
+                    if deadline <= now or len(self.event_queue[queue_type]) >= self.BATCH_SIZE
+                ]
+                if ready:
+                    return ready
+                if now >= give_up_at:
+                    return []
+                self.batch_ready.wait(min([give_up_at, *pending.values()]) - now)
 
     def _process_batch(self, queue_type):
         """Process all files in queue"""
-        queue = self.event_queue[queue_type]
+        # Take ownership of the queued files so events arriving mid-batch land in the next batch
+        with self.queue_lock:
+            queue = self.event_queue.pop(queue_type, [])
+            self.batch_deadlines.pop(queue_type, None)
         if not queue:
             return
 
@@ -404,17 +522,136 @@ class VaultHandler(FileSystemEventHandler):
         # No need to filter here since _execute_action checks self.executed_files
 
         logger.info(f"Processing batch of {len(unique_queue)} {queue_type} files")
-        for filepath in unique_queue:
+        batch_start = time.perf_counter()
+        if queue_type == 'inbox':
+            latencies = self._draft_concurrently(unique_queue)
+        else:
+            # on_closed usually scheduled these already; pushing again is a no-op for waiting keys
+            for filepath in unique_queue:
+                self._schedule_action(filepath)
+            latencies = self._drain_actions()
+
+        self._record_batch_stats(queue_type, time.perf_counter() - batch_start, latencies)
+
+    def _draft_concurrently(self, filepaths):
+        """Draft Needs_Action files on the worker pool. Returns {filename: seconds}"""
+        futures = {
+            self.draft_pool.submit(self._timed_process_inbox, filepath): filepath
+            for filepath in filepaths
+        }
+        latencies = {}
+        for future in as_completed(futures):
+            filepath = futures[future]
             try:
-                if queue_type == 'inbox':
-                    self._process_inbox(filepath)
-                elif queue_type == 'approved':
-                    self._execute_action(filepath)
+                latencies[filepath.name] = future.result()
             except Exception as e:
-                logger.error(f"Batch processing error: {e}")
+                logger.error(f"Error processing {filepath.name}: {e}")
+        self._flush_read_marks()
+        return latencies
+
+    def _flush_read_marks(self):
+        """Mark every email drafted since the last flush as read with one batchModify"""
+        with self.gmail_lock:
+            message_ids, self.pending_read_marks = self.pending_read_marks, []
+            if message_ids and self.gmail_watcher:
+                self.gmail_watcher.mark_many_as_read(message_ids)
+
+    def _timed_process_inbox(self, filepath):
+        """Run _process_inbox and return its latency in seconds"""
+        started = time.perf_counter()
+        self._process_inbox(filepath)
+        elapsed = time.perf_counter() - started
+        logger.info(f"⏱️ {filepath.name} processed in {elapsed:.2f}s")
+        return elapsed
+
+    def _record_batch_stats(self, queue_type, wall_clock, latencies):
+        """Keep and log wall-clock and per-item latency for the last batch of a queue"""
+        ordered = sorted(latencies.values())
+        p50 = ordered[len(ordered) // 2] if ordered else 0.0
+        slowest = ordered[-1] if ordered else 0.0
+        self.last_batch_stats[queue_type] = {
+            'items': len(latencies),
+            'wall_clock_s': round(wall_clock, 3),
+            'p50_item_s': round(p50, 3),
+            'max_item_s': round(slowest, 3),
+            'item_latency_s': {name: round(seconds, 3) for name, seconds in latencies.items()},
+        }
+        logger.info(
+            f"📦 {queue_type} batch of {len(latencies)} done in {wall_clock:.2f}s "
+            f"(item p50 {p50:.2f}s, max {slowest:.2f}s)"
+        )
 
-        self.event_queue[queue_type].clear()
-        self.last_batch_time = time.time()
+    def _schedule_action(self, filepath):
+        """Queue an approved file for execution by urgency class"""
+        if filepath.name in self.executed_files:
+            logger.debug(f"Skipping already-executed file: {filepath.name}")
+            return
+        try:
+            urgency, priority = self._parse_urgency(load_document(filepath).content)
+        except OSError as e:
+            logger.warning(f"Could not read {filepath.name} for scheduling: {e}")
+            urgency, priority = 'NORMAL', 'NORMAL'
+        label = urgency_class(filepath.name, urgency, priority)
+        if self.action_scheduler.push(filepath.name, filepath, label):
+            logger.debug(f"Scheduled {label} action: {filepath.name}")
+
+    def _drain_actions(self):
+        """Execute scheduled approved actions, most urgent first. Returns {filename: seconds}"""
+        latencies = {}
+        while True:
+            # Another thread already draining will pick up anything we just scheduled
+            if not self.drain_lock.acquire(blocking=False):
+                return latencies
+            try:
+                while True:
+                    scheduled = self.action_scheduler.pop()
+                    if scheduled is None:
+                        break
+                    batch = [scheduled]
+                    # Approved invoices/payments queued in the same window share one Odoo call,
+                    # but only those at least as urgent as the head so nothing jumps its class
+                    if self.odoo_batch_size > 1 and self._finance_kind(scheduled[0]):
+                        batch += self.action_scheduler.pop_matching(
+                            lambda item: self._finance_kind(item) is not None,
+                            self.odoo_batch_size - 1,
+                            label=scheduled[1],
+                        )
+                    for filepath, label, waited in batch:
+                        logger.info(f"⏳ {filepath.name} waited {waited:.2f}s in {label} queue")
+                    started = time.perf_counter()
+                    try:
+                        if len(batch) > 1:
+                            self._execute_finance_batch([filepath for filepath, _, _ in batch])
+                        else:
+                            self._execute_action(batch[0][0])
+                    except Exception as e:
+                        logger.error(f"Error executing {', '.join(f.name for f, _, _ in batch)}: {e}")
+                    elapsed = time.perf_counter() - started
+                    for filepath, _, _ in batch:
+                        latencies[filepath.name] = elapsed
+            finally:
+                self.drain_lock.release()
+            # Close the gap between our last empty pop and releasing the lock
+            if not len(self.action_scheduler):
+                break
+        if latencies:
+            waits = self.action_scheduler.wait_stats()
+            summary = ', '.join(
+                f"{label} avg {stats['avg_wait_s']:.2f}s/max {stats['max_wait_s']:.2f}s"
+                for label, stats in waits.items() if stats['count']
+            )
+            logger.info(f"⏳ Queue wait by urgency: {summary}")
+        return latencies
+
+    @contextmanager
+    def _channel_slot(self, channel):
+        """Hold one of the channel's concurrency slots while drafting"""
+        slot = self.channel_slots.get(channel)
+        if slot is None:
+            yield
+            return
+        with slot:
+            yield
     
     def _process_inbox(self, filepath):
         """Needs_Action item detected → Route to appropriate drafter"""
@@ -437,12 +674,16 @@ class VaultHandler(FileSystemEventHandler):
                 # Mark this file as processed now
                 self.recently_processed_files[filepath.name] = current_time
 
-            content = filepath.read_text()
+            # Drafters reload the same file; load_document lets them reuse this parse
+            content = load_document(filepath).content
 
-            # Check file type based on content or filename
-            is_email = 'type: email' in content.lower() or ('from:' in content.lower() and 'type: whatsapp' not in content.lower())
-            is_tweet = 'type: tweet' in content.lower() or 'TWEET' in filepath.name.upper() or 'SOCIAL' in filepath.name.upper()
-            is_whatsapp = 'type: whatsapp' in content.lower() or 'WHATSAPP' in filepath.name.upper()
+            # Check file type and keyword signals in one pass over the content
+            signals = route_signals(content, filepath.name)
+            is_email = signals['is_email']
+            is_tweet = signals['is_tweet']
+            is_whatsapp = signals['is_whatsapp']
+            # Only real drafting errors release the dedup key; skips stay committed
+            failed = False
 
             # Route to WhatsApp Drafter
             if is_whatsapp and self.whatsapp_drafter:
@@ -450,64 +691,73 @@ class VaultHandler(FileSystemEventHandler):
                 # NOTE: Do NOT auto-create invoice drafts for WhatsApp messages
                 # Let user manually request invoice if needed by moving draft to Approved
                 try:
-                    draft_file = self.whatsapp_drafter.draft_reply(filepath)
+                    with self._channel_slot('whatsapp'):
+                        draft_file = self.whatsapp_drafter.draft_reply(filepath)
                     if draft_file:
                         logger.info(f"💬 WhatsApp draft created: {draft_file.name}")
                         self._log_action('whatsapp_draft_created', filepath.name, 'success')
-                    else:
+                    elif not self._draft_skipped(self.whatsapp_drafter, filepath):
+                        failed = True
                         logger.warning(f"Failed to draft WhatsApp reply for {filepath.name}")
                         self._log_action('whatsapp_draft_failed', filepath.name, 'failure')
                 except Exception as e:
+                    failed = True
                     logger.error(f"Error drafting WhatsApp reply: {e}")
                     self._log_action('whatsapp_draft_error', filepath.name, 'failure', str(e))
-                return
 
             # Route to Tweet Drafter
-            if is_tweet and self.tweet_drafter:
+            elif is_tweet and self.tweet_drafter:
                 logger.info(f"📱 Using AI to draft tweet for: {filepath.name}")
                 try:
-                    draft_file = self.tweet_drafter.draft_tweet(filepath)
+                    with self._channel_slot('tweet'):
+                        draft_file = self.tweet_drafter.draft_tweet(filepath)
                     if draft_file:
                         logger.info(f"🐦 Tweet draft created: {draft_file.name}")
                         self._log_action('tweet_draft_created', filepath.name, 'success')
-                    else:
+                    elif not self._draft_skipped(self.tweet_drafter, filepath):
+                        failed = True
                         logger.warning(f"Failed to draft tweet for {filepath.name}")
                         self._log_action('tweet_draft_failed', filepath.name, 'failure')
                 except Exception as e:
+                    failed = True
                     logger.error(f"Error drafting tweet for {filepath.name}: {e}")
                     self._log_action('tweet_draft_error', filepath.name, 'failure', str(e))
-                return
 
             # Route to Email Drafter
-            if is_email and self.email_drafter:
+            elif is_email and self.email_drafter:
                 # Use AI Assistant to draft reply
                 logger.info(f"🤖 Using AI Assistant to draft reply for: {filepath.name}")
-                self._maybe_create_invoice_draft(filepath, content, channel='email')
+                self._maybe_create_invoice_draft(filepath, content, channel='email', signals=signals)
                 try:
-                    draft_file = self.email_drafter.draft_reply(filepath)
+                    with self._channel_slot('email'):
+                        draft_file = self.email_drafter.draft_reply(filepath)
 
                     if draft_file:
                         logger.info(f"✉️ Draft created: {draft_file.name}")
                         self._log_action('email_draft_created', filepath.name, 'success')
 
-                        # Mark original email as read in Gmail
+                        # Mark original email as read in Gmail once the batch finishes
                         gmail_msg_id = self._extract_gmail_message_id(content)
                         if gmail_msg_id and self.gmail_watcher:
-                            self.gmail_watcher.mark_as_read(gmail_msg_id)
-                    else:
+                            with self.gmail_lock:
+                                self.pending_read_marks.append(gmail_msg_id)
+                    elif not self._draft_skipped(self.email_drafter, filepath):
+                        failed = True
                         logger.warning(f"Failed to draft reply for {filepath.name}")
                         self._log_action('email_draft_failed', filepath.name, 'failure')
                 except Exception as e:
+                    failed = True
                     logger.error(f"Error drafting reply for {filepath.name}: {e}")
                     self._log_action('email_draft_error', filepath.name, 'failure', str(e))
 
                 # Check if email is requesting a social media post
-                if self.social_drafter and self._is_post_request(content):
+                if self.social_drafter and signals['post_request']:
                     logger.info(f"📱 Detected social media post request in: {filepath.name}")
                     try:
                         topic, context = self._extract_post_request(content)
                         if topic:
-                            posts = self.social_drafter.draft_posts(topic, context)
+                            with self._channel_slot('social'):
+                                posts = self.social_drafter.draft_posts(topic, context)
                             if posts:
                                 logger.info(f"📱 Generated {len(posts)} social media drafts")
                                 for platform, draft_path in posts.items():
@@ -527,10 +777,25 @@ class VaultHandler(FileSystemEventHandler):
         except Exception as e:
             logger.error(f"Inbox processing error: {e}")
             self._log_action('inbox_error', filepath.name, 'failure', str(e))
+            failed = True
+
+        if failed:
+            self._release_inbox_item(filepath)
 
-    def _maybe_create_invoice_draft(self, filepath, content, channel):
+    @staticmethod
+    def _draft_skipped(drafter, filepath):
+        """True when a drafter returned no draft on purpose: the file is gone or it drafted it before"""
+        handled = getattr(drafter, 'processed_emails', None) or getattr(drafter, 'processed_ids', None) or ()
+        return not filepath.exists() or filepath.name in handled
+
+    def _release_inbox_item(self, filepath):
+        """Forget a Needs_Action file whose drafting failed so a re-drop or restart retries it"""
+        with self.dedup_lock:
+            self.processed_hashes.discard(filepath.name)
+
+    def _maybe_create_invoice_draft(self, filepath, content, channel, signals=None):
         """Create an invoice draft when an incoming message requests an invoice."""
-        if not self._is_invoice_request(content):
+        if not (signals or route_signals(content))['invoice_request']:
             return
         message_id = self._extract_message_id(content)
 
@@ -551,7 +816,7 @@ class VaultHandler(FileSystemEventHandler):
             due_date = (datetime.now() + timedelta(days=14)).strftime('%Y-%m-%d')
             description = f"Invoice requested via {channel}"
 
-            draft_name = f"INVOICE_DRAFT_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
+            draft_name = f"INVOICE_DRAFT_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.md"
             draft_path = self.vault / 'Pending_Approval' / draft_name
             draft_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -582,6 +847,7 @@ status: pending_approval
 
             draft_path.write_text(draft_content)
             self.invoice_drafts_created.add(dedupe_key)
+            self.invoice_index.add(draft_name, filepath.name, message_id or '')
             logger.info(f"🧾 Invoice draft created: {draft_path.name} (amount: ${amount:.2f})")
             self._log_action('invoice_draft_created', filepath.name, 'success', draft_path.name)
         except Exception as e:
@@ -589,41 +855,18 @@ status: pending_approval
             self._log_action('invoice_draft_error', filepath.name, 'failure', str(e))
 
     def _invoice_draft_exists(self, source_filename, message_id=None):
-        drafts_dir = self.vault / 'Pending_Approval'
-        if not drafts_dir.exists():
-            return False
-        for draft in drafts_dir.glob('INVOICE_DRAFT_*.md'):
-            try:
-                text = draft.read_text()
-            except Exception:
-                continue
-            if f"source_file: {source_filename}" in text:
-                return True
-            if message_id and f"message_id: {message_id}" in text:
-                return True
-        return False
-
-    def _is_invoice_request(self, content):
-        return 'invoice' in content.lower()
+        return self.invoice_index.find(source_filename, message_id=message_id) is not None
 
     def _extract_amount(self, content):
         """Extract invoice amount from message content. Prefer body over metadata."""
-        lines = content.splitlines()
+        # Only the body counts; frontmatter fields like phone numbers are not amounts
+        lines = parse_markdown(content).body.splitlines()
         body_lines = []
 
-        # Find the message content section (skip frontmatter & metadata)
-        in_frontmatter = True
+        # Find the message content section
         for i, line in enumerate(lines):
             lowered = line.strip().lower()
 
-            # Exit frontmatter at closing ---
-            if in_frontmatter and line.strip() == '---' and i > 0:
-                in_frontmatter = False
-                continue
-
-            if in_frontmatter:
-                continue
-
             # Look for content section markers
             if (
                 lowered == '## message content'
@@ -635,7 +878,7 @@ status: pending_approval
                 body_lines = lines[i + 1 :]
                 break
 
-        # If no content section found, use all non-frontmatter lines
+        # If no content section found, use all body lines
         if not body_lines:
             body_lines = [l for l in lines if not l.strip().startswith('---') and l.strip()]
 
@@ -700,7 +943,10 @@ status: pending_approval
         return 100.00
 
     def _extract_message_id(self, content):
-        for line in content.splitlines():
+        document = parse_markdown(content)
+        if document.get('message_id'):
+            return document.get('message_id')
+        for line in document.body.splitlines():
             if line.lower().startswith('message_id:'):
                 return line.split(':', 1)[1].strip()
             if line.lower().startswith('**message id**'):
@@ -708,46 +954,50 @@ status: pending_approval
         return None
 
     def _extract_contact_name(self, content, fallback):
-        for line in content.splitlines():
-            if line.lower().startswith('from:'):
-                value = line.split(':', 1)[1].strip()
-                if '<' in value:
-                    return value.split('<', 1)[0].strip() or fallback
-                return value or fallback
-        return fallback
+        document = parse_markdown(content)
+        value = document.get('from')
+        if value is None:
+            for line in document.body.splitlines():
+                if line.lower().startswith('from:'):
+                    value = line.split(':', 1)[1].strip()
+                    break
+        if not value:
+            return fallback
+        if '<' in value:
+            return value.split('<', 1)[0].strip() or fallback
+        return value
     
-    def _execute_action(self, filepath):
-        """Approved action detected → Execute"""
-        # Atomically reserve the action before any worker can execute it.
+    def _parse_urgency(self, content):
+        """Return (urgency, priority) from frontmatter, defaulting to NORMAL"""
+        document = parse_markdown(content)
+        return document.get('urgency', 'NORMAL'), document.get('priority', 'NORMAL')
+
+    def _reserve_action(self, filepath) -> bool:
+        """Atomically reserve the action before any worker can execute it.
+
+        The reservation lives in executing_files until the action finishes;
+        only _complete_action persists the key to executed_files.
+        """
         with self.dedup_lock:
-            if filepath.name in self.executed_files:
+            if filepath.name in self.executed_files or filepath.name in self.executing_files:
                 logger.debug(f"Skipping already-executed file: {filepath.name}")
-                return
-            self.executed_files.add(filepath.name)
+                return False
+            self.executing_files.add(filepath.name)
+            return True
+
+    def _execute_action(self, filepath):
+        """Approved action detected → Execute"""
+        if not self._reserve_action(filepath):
+            return
 
         try:
-            content = filepath.read_text()
+            content = load_document(filepath).content
 
             # Extract urgency and priority from frontmatter
-            urgency = 'NORMAL'
-            priority = 'NORMAL'
-            if content.startswith('---'):
-                frontmatter_end = content.find('---', 3)
-                if frontmatter_end > 0:
-                    frontmatter = content[:frontmatter_end]
-                    for line in frontmatter.split('\n'):
-                        if line.startswith('urgency:'):
-                            urgency = line.split(':', 1)[1].strip()
-                        elif line.startswith('priority:'):
-                            priority = line.split(':', 1)[1].strip()
+            urgency, priority = self._parse_urgency(content)
 
             # Log urgency
-            urgency_indicator = {
-                'URGENT': '🔴',
-                'BUSINESS': '🟠',
-                'INFO': '🟢',
-                'NORMAL': '⚪'
-            }.get(urgency, '⚪')
+            urgency_indicator = self.URGENCY_INDICATORS.get(urgency, '⚪')
 
             logger.info(f"⚡ Executing {urgency_indicator} {urgency} action (priority: {priority}): {filepath.name}")
 
@@ -765,84 +1015,59 @@ status: pending_approval
             else:
                 raise ValueError(f"Unknown action type: {filepath.name}")
 
-            # Move to done (gracefully handle if file already gone)
-            if filepath.exists():
-                done_file = self.done / filepath.name
-                filepath.rename(done_file)
-                logger.info(f"✔️ Done: {done_file.name} [{urgency_indicator} {urgency}]")
-                self._log_action('action_executed', filepath.name, 'success', f"urgency={urgency}")
-            else:
-                logger.warning(f"File already moved or deleted: {filepath.name}")
-                self._log_action('action_executed', filepath.name, 'success', f"urgency={urgency} (file already moved)")
+            self._complete_action(filepath, urgency)
         except Exception as e:
-            moved_to_failed = False
-            if filepath.exists():
-                try:
-                    self.failed.mkdir(parents=True, exist_ok=True)
-                    failed_file = self.failed / filepath.name
-                    if failed_file.exists():
-                        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                        failed_file = self.failed / f"{filepath.stem}_{timestamp}{filepath.suffix}"
-                    filepath.rename(failed_file)
-                    moved_to_failed = True
-                    logger.error(f"Moved failed action to {failed_file}")
-                except OSError as move_error:
-                    logger.error(f"Could not move failed action: {move_error}")
-            if moved_to_failed:
-                with self.dedup_lock:
-                    self.executed_files.discard(filepath.name)
-            logger.error(f"Action error: {e}")
-            self._log_action('action_error', filepath.name, 'failure', str(e))
+            self._fail_action(filepath, e)
+
+    def _complete_action(self, filepath, urgency):
+        """Move an executed action to Done (gracefully handle if file already gone)"""
+        with self.dedup_lock:
+            self.executed_files.add(filepath.name)
+            self.executing_files.discard(filepath.name)
+        urgency_indicator = self.URGENCY_INDICATORS.get(urgency, '⚪')
+        if filepath.exists():
+            done_file = self.done / filepath.name
+            filepath.rename(done_file)
+            logger.info(f"✔️ Done: {done_file.name} [{urgency_indicator} {urgency}]")
+            self._log_action('action_executed', filepath.name, 'success', f"urgency={urgency}")
+        else:
+            logger.warning(f"File already moved or deleted: {filepath.name}")
+            self._log_action('action_executed', filepath.name, 'success', f"urgency={urgency} (file already moved)")
+
+    def _fail_action(self, filepath, error):
+        """Move a failed action to Failed so it can be retried by re-approving it"""
+        moved_to_failed = False
+        if filepath.exists():
+            try:
+                self.failed.mkdir(parents=True, exist_ok=True)
+                failed_file = self.failed / filepath.name
+                if failed_file.exists():
+                    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                    failed_file = self.failed / f"{filepath.stem}_{timestamp}{filepath.suffix}"
+                filepath.rename(failed_file)
+                moved_to_failed = True
+                logger.error(f"Moved failed action to {failed_file}")
+            except OSError as move_error:
+                logger.error(f"Could not move failed action: {move_error}")
+        with self.dedup_lock:
+            self.executing_files.discard(filepath.name)
+            if not moved_to_failed:
+                # Still in Approved: don't let the periodic scan retry it every cycle
+                self.executed_files.add(filepath.name)
+        logger.error(f"Action error: {error}")
+        self._log_action('action_error', filepath.name, 'failure', str(error))
     
     def _execute_email(self, filepath, content):
         """Execute email action - Send reply via Email MCP"""
         try:
-            # Parse YAML frontmatter
-            lines = content.split('\n')
-            metadata = {}
-            attachments = []
-            in_frontmatter = False
-            in_attachments = False
-            frontmatter_end = 0
-
-            for i, line in enumerate(lines):
-                if line.strip() == '---':
-                    if not in_frontmatter:
-                        in_frontmatter = True
-                    else:
-                        frontmatter_end = i
-                        break
-                elif in_frontmatter:
-                    if line.strip() == 'attachments:':
-                        in_attachments = True
-                    elif in_attachments and line.strip().startswith('- '):
-                        attachment = line.strip().lstrip('- ').strip()
-                        if attachment:
-                            attachments.append(attachment)
-                    elif in_attachments and not line.strip().startswith('- '):
-                        in_attachments = False
-
-                    if ':' in line and not in_attachments:
-                        key, val = line.split(':', 1)
-                        metadata[key.strip()] = val.strip()
+            document = parse_markdown(content)
+            metadata = dict(document.frontmatter)
+            attachments = document.attachments
 
             # Extract reply text - support both formats:
             # 1. New format: ## Proposed Response (from Email Drafter)
             # 2. Legacy format: ## Your Reply
-            reply_text = ''
-            reply_started = False
-            reply_sections = ['## Proposed Response', '## Your Reply']
-
-            for i, line in enumerate(lines[frontmatter_end:]):
-                if any(section in line for section in reply_sections):
-                    reply_started = True
-                    continue
-                elif reply_started and line.startswith('##'):
-                    break
-                elif reply_started:
-                    reply_text += line + '\n'
-
-            reply_text = reply_text.strip()
+            reply_text = document.section('Proposed Response', 'Your Reply')
 
             # Handle both metadata formats
             # Format 1: from (new drafts)
@@ -1006,15 +1231,8 @@ status: pending_approval
             raise RuntimeError("Twitter OAuth credentials not fully configured in .env")
 
         try:
-            from requests_oauthlib import OAuth1Session
-
-            # Create OAuth1 session
-            oauth = OAuth1Session(
-                api_key,
-                client_secret=api_secret,
-                resource_owner_key=access_token,
-                resource_owner_secret=access_token_secret,
-            )
+            # Signed session is built once per credential set and keeps its connections open
+            oauth = oauth1_session(api_key, api_secret, access_token, access_token_secret)
 
             # Post tweet
             url = "https://api.twitter.com/2/tweets"
@@ -1062,7 +1280,6 @@ status: pending_approval
     def _call_meta_api(self, text: str, metadata: dict):
         """Post to Facebook via Graph API"""
         import os
-        import requests
 
         # Support both META_ and FACEBOOK_ naming conventions
         access_token = os.getenv('META_ACCESS_TOKEN') or os.getenv('FACEBOOK_ACCESS_TOKEN')
@@ -1082,7 +1299,7 @@ status: pending_approval
                 'access_token': access_token
             }
 
-            response = requests.post(url, data=payload)
+            response = get_session('meta').post(url, data=payload)
 
             if response.status_code not in [200, 201]:
                 error_msg = response.text
@@ -1137,7 +1354,10 @@ status: pending_approval
                 except ImportError:
                     from agents.linkedin_watcher import LinkedInAPI
 
-            linkedin = LinkedInAPI(access_token)
+            # Reuse the client (and its cached profile id) while the token is unchanged
+            linkedin = self.linkedin_api
+            if linkedin is None or linkedin.access_token != access_token:
+                linkedin = self.linkedin_api = LinkedInAPI(access_token)
 
             # Check for link in metadata
             link_url = metadata.get('url', metadata.get('link', ''))
@@ -1180,38 +1400,11 @@ status: pending_approval
     def _execute_whatsapp(self, filepath, content):
         """Execute WhatsApp action - Send reply via WhatsApp Business API"""
         try:
-            # Parse YAML frontmatter
-            lines = content.split('\n')
-            metadata = {}
-            in_frontmatter = False
-            frontmatter_end = 0
-
-            for i, line in enumerate(lines):
-                if line.strip() == '---':
-                    if not in_frontmatter:
-                        in_frontmatter = True
-                    else:
-                        frontmatter_end = i
-                        break
-                elif in_frontmatter and ':' in line:
-                    key, val = line.split(':', 1)
-                    metadata[key.strip()] = val.strip()
+            document = parse_markdown(content)
+            metadata = dict(document.frontmatter)
 
             # Extract reply text from ## Proposed Reply section
-            reply_text = ''
-            reply_started = False
-            reply_sections = ['## Proposed Reply', '## Your Reply', '## Reply']
-
-            for line in lines[frontmatter_end:]:
-                if any(section in line for section in reply_sections):
-                    reply_started = True
-                    continue
-                elif reply_started and line.startswith('##'):
-                    break
-                elif reply_started:
-                    reply_text += line + '\n'
-
-            reply_text = reply_text.strip()
+            reply_text = document.section('Proposed Reply', 'Your Reply', 'Reply')
 
             # Get recipient phone number
             recipient = metadata.get('to', metadata.get('from', ''))
@@ -1259,45 +1452,28 @@ status: pending_approval
         except Exception as e:
             logger.warning(f"Failed to move original WhatsApp message from Needs_Action: {e}")
 
+    def _payment_fields(self, content):
+        """Payment details from an approved PAYMENT file's frontmatter"""
+        metadata = dict(parse_markdown(content).frontmatter)
+        return {
+            'amount': float(metadata.get('amount', '0')),
+            'description': metadata.get('description', 'Payment from orchestrator'),
+            'account': metadata.get('account', '200'),  # Default to sales revenue
+            'transaction_type': metadata.get('transaction_type', 'BANK'),
+            'bank_account_code': metadata.get('bank_account_code', metadata.get('bank_account', '')),
+        }
+
     def _execute_payment(self, filepath, content):
         """Execute payment action - Log transaction via Odoo MCP"""
         try:
-            # Parse YAML frontmatter
-            lines = content.split('\n')
-            metadata = {}
-            in_frontmatter = False
-            frontmatter_end = 0
-
-            for i, line in enumerate(lines):
-                if line.strip() == '---':
-                    if not in_frontmatter:
-                        in_frontmatter = True
-                    else:
-                        frontmatter_end = i
-                        break
-                elif in_frontmatter and ':' in line:
-                    key, val = line.split(':', 1)
-                    metadata[key.strip()] = val.strip()
+            fields = self._payment_fields(content)
 
-            # Extract payment details from content
-            amount = metadata.get('amount', '0')
-            description = metadata.get('description', 'Payment from orchestrator')
-            account = metadata.get('account', '200')  # Default to sales revenue
-            transaction_type = metadata.get('transaction_type', 'BANK')
-            bank_account_code = metadata.get('bank_account_code', metadata.get('bank_account', ''))
-
-            logger.info(f"💰 Processing payment: {description}")
-            logger.info(f"   Amount: {amount}")
-            logger.info(f"   Account: {account}")
+            logger.info(f"💰 Processing payment: {fields['description']}")
+            logger.info(f"   Amount: {fields['amount']}")
+            logger.info(f"   Account: {fields['account']}")
 
             # Call Odoo MCP to log transaction
-            transaction_id = self._call_odoo_mcp_log_transaction(
-                float(amount),
-                description,
-                account,
-                transaction_type,
-                bank_account_code=bank_account_code
-            )
+            transaction_id = self._call_odoo_mcp_log_transaction(**fields)
 
             logger.info(f"✅ Payment logged successfully (ID: {transaction_id})")
 
@@ -1329,6 +1505,11 @@ status: pending_approval
         if response.get('status') != 'logged' or not transaction_id:
             raise RuntimeError("Odoo did not confirm the transaction")
 
+        self._record_transaction(amount, description, account, transaction_type, transaction_id)
+        return transaction_id
+
+    def _record_transaction(self, amount, description, account, transaction_type, transaction_id):
+        """Append a logged transaction to Logs/odoo_transactions.jsonl"""
         log_file = self.vault / 'Logs' / 'odoo_transactions.jsonl'
         log_file.parent.mkdir(parents=True, exist_ok=True)
         txn_log = {
@@ -1342,43 +1523,34 @@ status: pending_approval
         }
         with open(log_file, 'a') as f:
             f.write(json.dumps(txn_log) + '\n')
-        return transaction_id
 
-    def _execute_invoice(self, filepath, content):
-        """Execute invoice action - Create invoice in Odoo MCP"""
-        try:
-            lines = content.split('\n')
-            metadata = {}
-            in_frontmatter = False
-            frontmatter_end = 0
-
-            for i, line in enumerate(lines):
-                if line.strip() == '---':
-                    if not in_frontmatter:
-                        in_frontmatter = True
-                    else:
-                        frontmatter_end = i
-                        break
-                elif in_frontmatter and ':' in line:
-                    key, val = line.split(':', 1)
-                    metadata[key.strip()] = val.strip()
+    def _invoice_fields(self, content):
+        """Invoice details from an approved INVOICE file's frontmatter; raises ValueError if incomplete"""
+        metadata = dict(parse_markdown(content).frontmatter)
 
-            contact_name = metadata.get('contact_name') or metadata.get('contact') or ''
-            amount_raw = metadata.get('amount', '').strip()
-            description = metadata.get('description', 'Invoice from orchestrator')
-            due_date = metadata.get('due_date', '')
+        contact_name = metadata.get('contact_name') or metadata.get('contact') or ''
+        amount_raw = metadata.get('amount', '').strip()
 
-            if not contact_name:
-                raise ValueError("Missing contact_name in invoice draft")
-            if not amount_raw:
-                raise ValueError("Missing amount in invoice draft")
+        if not contact_name:
+            raise ValueError("Missing contact_name in invoice draft")
+        if not amount_raw:
+            raise ValueError("Missing amount in invoice draft")
 
-            amount = float(amount_raw)
-            logger.info(f"🧾 Creating Odoo invoice for {contact_name} ({amount:.2f})")
+        return {
+            'contact_name': contact_name,
+            'amount': float(amount_raw),
+            'description': metadata.get('description', 'Invoice from orchestrator'),
+            'due_date': metadata.get('due_date', '')
+            or (datetime.now() + timedelta(days=30)).strftime('%Y-%m-%d'),
+        }
 
-            invoice_id = self._call_odoo_mcp_create_invoice(
-                contact_name, amount, description, due_date
-            )
+    def _execute_invoice(self, filepath, content):
+        """Execute invoice action - Create invoice in Odoo MCP"""
+        try:
+            fields = self._invoice_fields(content)
+            logger.info(f"🧾 Creating Odoo invoice for {fields['contact_name']} ({fields['amount']:.2f})")
+
+            invoice_id = self._call_odoo_mcp_create_invoice(**fields)
             logger.info(f"✅ Invoice created successfully (ID: {invoice_id})")
 
         except Exception as e:
@@ -1402,6 +1574,104 @@ status: pending_approval
             raise RuntimeError("Odoo did not confirm the invoice")
         return invoice_id
 
+    def _finance_kind(self, filepath):
+        """'PAYMENT' or 'INVOICE' for actions _execute_action would send to Odoo, else None"""
+        name = filepath.name
+        if 'EMAIL' in name or 'WHATSAPP' in name:
+            return None
+        if 'PAYMENT' in name:
+            return 'PAYMENT'
+        if 'INVOICE' in name:
+            return 'INVOICE'
+        return None
+
+    def _execute_finance_batch(self, filepaths):
+        """Execute approved invoices/payments with one Odoo call per kind.
+
+        Each file still ends in Done or Failed on its own: a draft with bad
+        frontmatter or an item Odoo rejects fails alone, while an adapter-level
+        error (credentials, crash, timeout) fails every file in that call.
+        """
+        pending = {'INVOICE': [], 'PAYMENT': []}
+        for filepath in filepaths:
+            if not self._reserve_action(filepath):
+                continue
+            try:
+                content = load_document(filepath).content
+                urgency, _ = self._parse_urgency(content)
+                kind = self._finance_kind(filepath)
+                fields = self._invoice_fields(content) if kind == 'INVOICE' else self._payment_fields(content)
+            except Exception as e:
+                self._fail_action(filepath, e)
+                continue
+            pending[kind].append((filepath, urgency, fields))
+
+        batches = (
+            ('INVOICE', 'create_invoices', 'invoices', 'created', 'invoice_id'),
+            ('PAYMENT', 'log_transactions', 'transactions', 'logged', 'transaction_id'),
+        )
+        for kind, tool, key, ok_status, id_field in batches:
+            items = pending[kind]
+            if not items:
+                continue
+            logger.info(f"🧾 Sending {len(items)} approved {kind.lower()} action(s) to Odoo in one {tool} call")
+            # The file name is the Odoo ref, so a retry after an ambiguous failure
+            # (timeout, lost reply) returns the records Odoo already created
+            tool_input = [dict(fields, ref=filepath.name) for filepath, _, fields in items]
+            if kind == 'PAYMENT':
+                today = datetime.now().strftime('%Y-%m-%d')
+                for fields in tool_input:
+                    fields['date'] = today
+            try:
+                results = self._call_odoo_adapter(tool, {key: tool_input}).get('results')
+                if not isinstance(results, list) or len(results) != len(items):
+                    raise RuntimeError(f"Odoo adapter returned no per-item results for {tool}")
+            except Exception as e:
+                for filepath, _, _ in items:
+                    self._fail_action(filepath, e)
+                continue
+
+            for (filepath, urgency, fields), result in zip(items, results):
+                record_id = result.get(id_field) if isinstance(result, dict) else None
+                if not isinstance(result, dict) or result.get('status') != ok_status or not record_id:
+                    detail = (result.get('detail') or result.get('error')) if isinstance(result, dict) else None
+                    self._fail_action(filepath, RuntimeError(
+                        f"Odoo did not confirm the {kind.lower()}" + (f": {detail}" if detail else '')
+                    ))
+                    continue
+                try:
+                    if kind == 'PAYMENT':
+                        self._record_transaction(
+                            fields['amount'], fields['description'], fields['account'],
+                            fields['transaction_type'], record_id,
+                        )
+                    logger.info(f"✅ {kind.title()} {filepath.name} confirmed by Odoo (ID: {record_id})")
+                    self._complete_action(filepath, urgency)
+                except Exception as e:
+                    self._fail_action(filepath, e)
+
+    def _odoo_pool(self, odoo_username, odoo_password):
+        """Long-lived adapter processes, started on first use; each logs in to Odoo once"""
+        with self.odoo_pool_lock:
+            if self.odoo_adapter is None:
+                mcp_path = Path(__file__).parent.parent / 'mcp_servers' / 'odoo_mcp' / 'index.js'
+                env = os.environ.copy()
+                env.update(
+                    {
+                        'ODOO_URL': os.getenv('ODOO_URL', 'http://localhost:8069'),
+                        'ODOO_DB': os.getenv('ODOO_DB', 'gte'),
+                        'ODOO_USERNAME': odoo_username,
+                        'ODOO_PASSWORD': odoo_password,
+                    }
+                )
+                self.odoo_adapter = OdooAdapterPool(
+                    ['node', str(mcp_path), '--legacy-stdio'],
+                    env=env,
+                    size=int(os.getenv('ODOO_ADAPTER_POOL_SIZE', '1')),
+                    timeout=30,
+                )
+            return self.odoo_adapter
+
     def _call_odoo_adapter(self, tool: str, tool_input: dict) -> dict:
         """Call the local Odoo adapter and require a structured success response."""
         odoo_username = os.getenv('ODOO_USERNAME')
@@ -1409,42 +1679,7 @@ status: pending_approval
         if not odoo_username or not odoo_password:
             raise RuntimeError("Odoo credentials are not configured")
 
-        mcp_path = Path(__file__).parent.parent / 'mcp_servers' / 'odoo_mcp' / 'index.js'
-        env = os.environ.copy()
-        env.update(
-            {
-                'ODOO_URL': os.getenv('ODOO_URL', 'http://localhost:8069'),
-                'ODOO_DB': os.getenv('ODOO_DB', 'gte'),
-                'ODOO_USERNAME': odoo_username,
-                'ODOO_PASSWORD': odoo_password,
-            }
-        )
-
-        try:
-            result = subprocess.run(
-                ['node', str(mcp_path), '--legacy-stdio'],
-                input=json.dumps({'tool': tool, 'input': tool_input}) + '\n',
-                capture_output=True,
-                text=True,
-                env=env,
-                timeout=30,
-                check=False,
-            )
-        except subprocess.TimeoutExpired as error:
-            raise RuntimeError("Odoo adapter request timed out") from error
-
-        if result.returncode != 0:
-            detail = result.stderr.strip() or f"exit status {result.returncode}"
-            raise RuntimeError(f"Odoo adapter failed: {detail}")
-        if not result.stdout.strip():
-            raise RuntimeError("Odoo adapter returned no response")
-
-        try:
-            response = json.loads(result.stdout.strip().splitlines()[-1])
-        except json.JSONDecodeError as error:
-            raise RuntimeError("Odoo adapter returned invalid JSON") from error
-        if not isinstance(response, dict):
-            raise RuntimeError("Odoo adapter returned an invalid response")
+        response = self._odoo_pool(odoo_username, odoo_password).request(tool, tool_input)
         if response.get('status') == 'error':
             detail = response.get('detail') or response.get('error') or 'unknown error'
             raise RuntimeError(f"Odoo adapter rejected the request: {detail}")
@@ -1453,22 +1688,8 @@ status: pending_approval
     def _execute_post(self, filepath, content):
         """Execute social post action - Post to Twitter/X or Facebook"""
         try:
-            # Parse YAML frontmatter
-            lines = content.split('\n')
-            metadata = {}
-            in_frontmatter = False
-            frontmatter_end = 0
-
-            for i, line in enumerate(lines):
-                if line.strip() == '---':
-                    if not in_frontmatter:
-                        in_frontmatter = True
-                    else:
-                        frontmatter_end = i
-                        break
-                elif in_frontmatter and ':' in line:
-                    key, val = line.split(':', 1)
-                    metadata[key.strip()] = val.strip()
+            document = parse_markdown(content)
+            metadata = dict(document.frontmatter)
 
             # Determine platforms from metadata or filename
             # Support both 'platform:' (single) and 'platforms:' (multiple)
@@ -1487,20 +1708,9 @@ status: pending_approval
                     platforms = ['linkedin', 'facebook']  # Default to LinkedIn + Facebook
 
             # Extract post text - support formats: ## Proposed Post, ## Tweet, ## Post Text, ## Post Content, ## Content
-            post_text = ''
-            post_started = False
-            post_sections = ['## Proposed Post', '## Tweet', '## Post Text', '## Post Content', '## Facebook Post', '## Content']
-
-            for i, line in enumerate(lines[frontmatter_end:]):
-                if any(section in line for section in post_sections):
-                    post_started = True
-                    continue
-                elif post_started and line.startswith('##'):
-                    break
-                elif post_started:
-                    post_text += line + '\n'
-
-            post_text = post_text.strip()
+            post_text = document.section(
+                'Proposed Post', 'Tweet', 'Post Text', 'Post Content', 'Facebook Post', 'Content'
+            )
 
             if not post_text:
                 raise ValueError("No post text found")
@@ -1595,7 +1805,10 @@ def start_orchestrator():
     handler._scan_existing_files()
 
     logger.info(f"🚀 Orchestrator started (watching {vault_path})")
-    logger.info("📦 Batching enabled: processes events in batches every 2s or when 50+ events queue")
+    logger.info(
+        f"📦 Batching enabled: flushes {handler.batch_timeout:.0f}s after the first event "
+        f"or as soon as {handler.BATCH_SIZE}+ events queue"
+    )
 
     # Track last approved folder scan
     last_approved_scan = time.time()
@@ -1607,12 +1820,14 @@ def start_orchestrator():
 
     try:
         while True:
-            # Periodically flush batches to ensure timely processing
+            # Sleep until a batch is due or the next periodic check, whichever comes first
+            next_periodic = min(
+                last_briefing_check + briefing_check_interval,
+                last_approved_scan + approved_scan_interval,
+            )
+            for queue_type in handler._wait_for_ready_batches(next_periodic - time.time()):
+                handler._process_batch(queue_type)
             current_time = time.time()
-            if (current_time - handler.last_batch_time) > handler.batch_timeout:
-                for queue_type in ['inbox', 'approved']:
-                    if handler.event_queue[queue_type]:
-                        handler._process_batch(queue_type)
 
             # Periodically check if it's Monday 9 AM for briefing generation
             if (current_time - last_briefing_check) > briefing_check_interval:
@@ -1632,13 +1847,11 @@ def start_orchestrator():
                     if filepath.name in handler.executed_files:
                         logger.debug(f"Periodic scan: Skipping already-executed file: {filepath.name}")
                         continue
-                    try:
-                        handler._execute_action(filepath)
-                    except Exception as e:
-                        logger.error(f"Error executing {filepath.name}: {e}")
+                    handler._schedule_action(filepath)
+                handler._drain_actions()
+                if handler.odoo_adapter:
+                    handler.odoo_adapter.check_health()
                 last_approved_scan = current_time
-
-            time.sleep(1)
     except KeyboardInterrupt:
         logger.info("Stopping orchestrator...")
         # Flush any remaining batches
@@ -1646,6 +1859,19 @@ def start_orchestrator():
             if handler.event_queue[queue_type]:
                 handler._process_batch(queue_type)
         observer.stop()
+        handler.draft_pool.shutdown(wait=True)
+        if handler.email_drafter:
+            handler.email_drafter.close()
+        if handler.odoo_adapter:
+            handler.odoo_adapter.close()
+        close_sessions()
+        for path, stats in cache_stats().items():
+            logger.info(f"🧠 LLM cache {Path(path).name}: {stats['hits']} hit(s), {stats['misses']} miss(es), "
+                        f"hit rate {stats['hit_rate']:.0%}, ~{stats['saved_s']}s saved")
+        close_caches()
+        for store in (handler.processed_hashes, handler.executed_files,
+                      handler.invoice_drafts_created, handler.invoice_index):
+            store.close()
     observer.join()
 
 # ============================================================================
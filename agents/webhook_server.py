@@ -3,6 +3,7 @@ import base64
 import hashlib
 import hmac
 import os
+import sys
 import json
 import logging
 from pathlib import Path
@@ -11,6 +12,10 @@ from fastapi import FastAPI, Request, Query, HTTPException
 from fastapi.responses import PlainTextResponse
 import uvicorn
 
+# Add utils to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.keyword_classifier import classify_urgency
+
 try:
     from dotenv import load_dotenv
     load_dotenv()
@@ -28,10 +33,6 @@ VERIFY_TOKEN = os.getenv('WHATSAPP_WEBHOOK_VERIFY_TOKEN', '')
 NEEDS_ACTION = VAULT_PATH / 'Needs_Action'
 NEEDS_ACTION.mkdir(parents=True, exist_ok=True)
 
-# Keyword classifications for message urgency
-URGENT_KEYWORDS = ['urgent', 'asap', 'emergency', 'help', 'problem', 'crisis', 'down', 'broken', 'critical', 'immediately']
-BUSINESS_KEYWORDS = ['pricing', 'rate', 'invoice', 'payment', 'contract', 'proposal', 'quote', 'budget', 'cost', 'fee']
-INFO_KEYWORDS = ['thanks', 'ok', 'yes', 'no', 'sounds', 'great', 'perfect', 'confirmed', 'received']
 
 # Track processed message IDs to prevent duplicates
 PROCESSED_FILE = VAULT_PATH / '.processed_twilio_messages'
@@ -75,29 +76,6 @@ def validate_meta_signature(body: bytes, signature: str) -> bool:
     return hmac.compare_digest(expected, signature.removeprefix('sha256='))
 
 
-def classify_urgency(message_text: str) -> str:
-    """Classify message urgency based on keywords"""
-    text_lower = message_text.lower()
-
-    # Check for urgent keywords first
-    for keyword in URGENT_KEYWORDS:
-        if keyword in text_lower:
-            return 'URGENT'
-
-    # Check for business keywords
-    for keyword in BUSINESS_KEYWORDS:
-        if keyword in text_lower:
-            return 'BUSINESS'
-
-    # Check for info keywords
-    for keyword in INFO_KEYWORDS:
-        if keyword in text_lower:
-            return 'INFO'
-
-    # Default to NORMAL
-    return 'NORMAL'
-
-
 @app.get("/webhook")
 async def verify_webhook(
     hub_mode: str = Query(None, alias="hub.mode"),
@@ -2,7 +2,7 @@
 import os
 import json
 import logging
-import requests
+import sys
 from pathlib import Path
 from datetime import datetime, timezone
 try:
@@ -10,6 +10,9 @@ try:
 except ImportError:
     from base_watcher import BaseWatcher
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from utils.http_client import get_session
+
 try:
     from dotenv import load_dotenv
     load_dotenv()
@@ -165,7 +168,8 @@ urgency: {urgency}
         }
 
         try:
-            response = requests.post(
+            # Shared Twilio session: a burst of replies reuses one TLS connection
+            response = get_session('twilio').post(
                 url,
                 data=payload,
                 auth=(self.account_sid, self.auth_token)
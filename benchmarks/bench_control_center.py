@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Overview and queue-listing latency on a large vault: per-request disk scans vs the live vault index.
+
+Builds a throwaway vault with --items markdown files (most of them in Done/,
+like a long-running install), then times the vault part of /api/overview,
+the full Done listing the UI used to request, and one cursor page of it
+(plain and filtered). Service probes are excluded so only vault work is
+measured. --body-kb pads every item so full reads and header-only reads
+can be told apart.
+
+Usage: python benchmarks/bench_control_center.py [--items N] [--body-kb N] [--iterations N] [--disk-iterations N]
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from control_center import server
+from control_center.vault_index import VaultIndex
+from utils import vault_markdown
+
+SHARES = {"needs_action": 0.02, "pending_approval": 0.02, "approved": 0.01, "failed": 0.01, "rejected": 0.04}
+ITEM = """---
+type: email
+subject: Invoice follow-up {index}
+from: client{index}@example.com
+priority: {priority}
+status: {queue}
+---
+
+## Original Email
+
+Hi, checking in on invoice {index}. {filler}
+
+## Thread History
+
+{history}
+"""
+
+
+def build_vault(vault: Path, items: int, body_kb: int = 0) -> None:
+    server.ensure_vault_structure(vault)
+    counts = {queue: int(items * share) for queue, share in SHARES.items()}
+    counts["done"] = items - sum(counts.values())
+    index = 0
+    for queue, count in counts.items():
+        directory = vault / server.QUEUE_DIRS[queue]
+        for _ in range(count):
+            priority = "high" if index % 7 == 0 else "normal"
+            (directory / f"EMAIL_{index:06d}.md").write_text(
+                ITEM.format(
+                    index=index,
+                    priority=priority,
+                    queue=queue,
+                    filler="Lorem ipsum dolor. " * 20,
+                    history="Earlier reply quoted in full. " * (body_kb * 34),
+                ),
+                encoding="utf-8",
+            )
+            index += 1
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return statistics.median(ordered) * 1000, p99 * 1000
+
+
+def measure(label, call, iterations):
+    call()  # warm up caches the same way a running server would
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - started)
+    p50, p99 = percentiles(samples)
+    print(f"{label:<34} p50 {p50:9.2f} ms   p99 {p99:9.2f} ms   ({iterations} runs)")
+
+
+def legacy_overview(vault):
+    """The pre-index request path: glob every queue, stat each file, read_item every item twice"""
+    counts = {key: len(list((vault / folder).glob("*.md"))) for key, folder in server.QUEUE_DIRS.items()}
+    for queue_key in ("done", "pending_approval", "needs_action"):
+        [path.stat().st_mtime for path in (vault / server.QUEUE_DIRS[queue_key]).glob("*.md")]
+    recent = [
+        server.read_item(path, key, include_content=False)
+        for key, folder in server.QUEUE_DIRS.items()
+        for path in (vault / folder).glob("*.md")
+    ]
+    recent.sort(key=lambda item: item["modified_at"], reverse=True)
+    stale = [
+        server.read_item(path, key, include_content=False)
+        for key in ("pending_approval", "needs_action", "approved", "failed")
+        for path in (vault / server.QUEUE_DIRS[key]).glob("*.md")
+    ]
+    return counts, recent[:8], stale[:5]
+
+
+def list_queue(vault, queue_key):
+    """The pre-pagination listing: every item in the queue"""
+    index = server.vault_index(vault)
+    return server.indexed_items(index, index.newest([queue_key], index.counts()[queue_key]))
+
+
+def queue_page(vault, queue_key, **filters):
+    return server.queue_page(server.vault_index(vault), queue_key, limit=server.QUEUE_PAGE_SIZE, filters=filters)
+
+
+def full_read_summaries(vault, queue_key, limit):
+    """What each listed item cost before header-only reads"""
+    return [
+        server.read_item(path, queue_key, include_content=False)
+        for path in sorted((vault / server.QUEUE_DIRS[queue_key]).glob("*.md"))[:limit]
+    ]
+
+
+def header_summaries(vault, queue_key, limit):
+    return [
+        server.read_item_summary(path, queue_key)
+        for path in sorted((vault / server.QUEUE_DIRS[queue_key]).glob("*.md"))[:limit]
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--body-kb", type=int, default=32)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--disk-iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        vault = Path(tmp) / "vault"
+        started = time.perf_counter()
+        build_vault(vault, args.items, args.body_kb)
+        print(f"Built {args.items} items in {time.perf_counter() - started:.1f}s")
+
+        def overview():
+            return server.overview_payload(vault, services=[])
+
+        measure("overview, pre-index scan", lambda: legacy_overview(vault), args.disk_iterations)
+        measure("overview, snapshot per request", overview, args.disk_iterations)
+        measure("done queue, snapshot per request", lambda: list_queue(vault, "done"), args.disk_iterations)
+
+        def cold(read):
+            def call():
+                vault_markdown.clear_cache()
+                return read(vault, "done", 500)
+            return call
+
+        measure("500 summaries, full reads", cold(full_read_summaries), args.disk_iterations)
+        measure("500 summaries, header reads", cold(header_summaries), args.disk_iterations)
+
+        index = VaultIndex(vault, server.QUEUE_DIRS, server.read_item_summary).build()
+        server.LIVE_INDEXES[str(vault)] = index
+        try:
+            measure("overview, live index", overview, args.iterations)
+            measure("done queue, live index", lambda: list_queue(vault, "done"), args.disk_iterations)
+            measure("done page, live index", lambda: queue_page(vault, "done"), args.iterations)
+            measure(
+                "done page by owner, live index",
+                lambda: queue_page(vault, "done", owner="client77", priority="high"),
+                args.iterations,
+            )
+        finally:
+            server.LIVE_INDEXES.pop(str(vault), None)
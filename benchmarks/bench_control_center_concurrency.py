@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""/api/health latency while /api/overview is under concurrent load: inline handlers vs the IO pool.
+
+Serves a throwaway --items vault with uvicorn on a free port, keeps
+--clients threads requesting /api/overview back to back, and times
+/api/health meanwhile. The vault index runs in snapshot mode (no watchdog
+observer), so every overview rescans the vault the way it does on installs
+without watchdog. The second run swaps ``run_blocking`` for a direct call,
+which is how the handlers behaved before they moved work off the event loop.
+
+Usage: python benchmarks/bench_control_center_concurrency.py [--items N] [--clients N] [--seconds N]
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import httpx
+import uvicorn
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from bench_control_center import build_vault
+from control_center import server
+from control_center.vault_index import VaultIndex
+
+
+async def run_inline(func, /, *args, **kwargs):
+    return func(*args, **kwargs)
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def load(base_url, clients, seconds):
+    stop = threading.Event()
+    overviews = []
+
+    def hammer():
+        with httpx.Client(base_url=base_url, timeout=60) as client:
+            while not stop.is_set():
+                client.get("/api/overview").raise_for_status()
+                overviews.append(1)
+
+    workers = [threading.Thread(target=hammer) for _ in range(clients)]
+    for worker in workers:
+        worker.start()
+    time.sleep(0.5)  # let the overview load build up
+
+    samples = []
+    with httpx.Client(base_url=base_url, timeout=60) as client:
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            client.get("/api/health").raise_for_status()
+            samples.append(time.perf_counter() - started)
+            time.sleep(0.02)
+    stop.set()
+    for worker in workers:
+        worker.join()
+
+    ordered = sorted(samples)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    return statistics.median(ordered) * 1000, p99 * 1000, len(samples), len(overviews) / seconds
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=10_000)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        vault = Path(tmp) / "vault"
+        build_vault(vault, args.items)
+        os.environ["VAULT_PATH"] = str(vault)
+        VaultIndex.start = lambda self: False  # snapshot mode: overviews rescan the vault
+
+        port = free_port()
+        uvicorn_server = uvicorn.Server(uvicorn.Config(server.app, host="127.0.0.1", port=port, log_level="warning"))
+        thread = threading.Thread(target=uvicorn_server.run, daemon=True)
+        thread.start()
+        while not uvicorn_server.started:
+            time.sleep(0.05)
+
+        base_url = f"http://127.0.0.1:{port}"
+        pooled = server.run_blocking
+        for label, runner in (("IO pool", pooled), ("inline (before)", run_inline)):
+            server.run_blocking = runner
+            p50, p99, checks, rate = load(base_url, args.clients, args.seconds)
+            print(
+                f"{label:<16} health p50 {p50:8.2f} ms   p99 {p99:8.2f} ms   "
+                f"({checks} checks, {rate:.1f} overviews/s from {args.clients} clients)"
+            )
+
+        uvicorn_server.should_exit = True
+        thread.join()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Show dedup-store memory stays flat while a million unique events stream through.
+
+Usage: python benchmarks/bench_dedup_store.py [--events N] [--max-entries N] [--backend sqlite|memory|set]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from utils.dedup_store import open_dedup_store
+
+
+def run(backend: str, events: int, max_entries: int, samples: int = 10):
+    with tempfile.TemporaryDirectory() as tmp:
+        if backend == 'set':
+            store = set()  # the unbounded baseline the orchestrator used to keep
+        else:
+            store = open_dedup_store(
+                'bench', path=Path(tmp) / 'dedup.sqlite3', backend=backend, max_entries=max_entries,
+            )
+        tracemalloc.start()
+        started = time.perf_counter()
+        step = max(events // samples, 1)
+        print(f"{backend}: {events:,} events, max_entries={max_entries:,}")
+        for index in range(events):
+            key = f"EMAIL_{index:09d}.md"
+            if key not in store:
+                store.add(key)
+            if (index + 1) % step == 0:
+                current, _ = tracemalloc.get_traced_memory()
+                print(f"  {index + 1:>10,} events  {current / 1024 / 1024:8.2f} MiB  {len(store):>9,} in memory")
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  peak {peak / 1024 / 1024:.2f} MiB, {events / elapsed:,.0f} events/s")
+        if hasattr(store, 'disk_entries'):
+            print(f"  {store.disk_entries():,} rows on disk")
+        if hasattr(store, 'close'):
+            store.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--events', type=int, default=1_000_000)
+    parser.add_argument('--max-entries', type=int, default=10_000)
+    parser.add_argument('--backend', choices=['sqlite', 'memory', 'set'], default='sqlite')
+    args = parser.parse_args()
+    run(args.backend, args.events, args.max_entries)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Compare one chat completion per email against batched HUMAN/BOT classification.
+
+By default the model is simulated: each request sleeps for a round-trip
+time plus a small per-email cost, which is where the one-by-one path loses.
+Pass --live with OPENAI_API_KEY set to time real gpt-4o-mini calls instead.
+
+Usage: python benchmarks/bench_email_classifier.py [--emails N] [--batch-sizes N ...] [--rtt S] [--live]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from utils.email_classifier import BotClassifier
+
+SUBJECTS = ["Quick question about the proposal", "Your weekly newsletter", "Lunch on Friday?",
+            "Password reset requested", "Re: invoice 1042", "Order shipped"]
+
+
+class SimulatedOpenAI:
+    """Sleeps like a remote model: fixed round trip plus per-email generation time"""
+
+    def __init__(self, rtt: float, per_email: float):
+        self.rtt = rtt
+        self.per_email = per_email
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, temperature, max_tokens):
+        user = messages[1]["content"]
+        if user.startswith("Classify these emails:"):
+            emails = json.loads(user.split("\n", 1)[1])
+            time.sleep(self.rtt + self.per_email * len(emails))
+            text = json.dumps([
+                {"id": email["id"], "verdict": "BOT" if "newsletter" in email["subject"].lower() else "HUMAN"}
+                for email in emails
+            ])
+        else:
+            time.sleep(self.rtt + self.per_email)
+            text = "BOT" if "newsletter" in user.lower() else "HUMAN"
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+
+def build_emails(count: int) -> list:
+    return [
+        {
+            "id": f"msg{index}",
+            "from": f"Person {index} <person{index}@example.com>",
+            "subject": SUBJECTS[index % len(SUBJECTS)],
+            "body": "Hi, following up on our conversation last week about the rollout. " * 20,
+        }
+        for index in range(count)
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--emails', type=int, default=30)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 5, 10, 20])
+    parser.add_argument('--rtt', type=float, default=0.25, help='simulated seconds per request')
+    parser.add_argument('--per-email', type=float, default=0.01, help='simulated seconds per email in a request')
+    parser.add_argument('--live', action='store_true', help='call the real OpenAI API')
+    args = parser.parse_args()
+
+    if args.live:
+        from openai import OpenAI
+        client = OpenAI(api_key=os.environ['OPENAI_API_KEY'])
+    else:
+        client = SimulatedOpenAI(args.rtt, args.per_email)
+
+    emails = build_emails(args.emails)
+    baseline = None
+    for batch_size in args.batch_sizes:
+        classifier = BotClassifier(client, batch_size=batch_size)
+        started = time.perf_counter()
+        verdicts = classifier.classify(emails)
+        elapsed = time.perf_counter() - started
+        baseline = baseline or elapsed
+        bots = sum(1 for is_human in verdicts.values() if is_human is False)
+        print(
+            f"batch_size {batch_size:>3}: {elapsed:6.2f}s  {classifier.requests:>3} request(s)  "
+            f"{classifier.fallbacks:>2} fallback(s)  {bots} bot(s)  ({baseline / elapsed:4.1f}x vs first row)"
+        )
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Time EmailDrafter.draft_reply on a thread reply: serial calls vs concurrent summary vs merged tone check.
+
+The model is simulated: each request sleeps for a fixed round-trip time, so
+the numbers show how many round trips sit on the critical path per email.
+
+Usage: python benchmarks/bench_email_drafter.py [--emails N] [--rtt S]
+"""
+
+import argparse
+import json
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from utils.email_drafter import EmailDrafter
+
+EMAIL = """---
+type: email
+from: client@example.com
+subject: Re: Project timeline
+received: 2026-01-05T10:00:00
+priority: normal
+is_reply: true
+---
+
+## Thread History
+
+**client@example.com**: Can we ship in March?
+
+## Current Message
+
+Any update on the timeline?
+"""
+
+
+class SimulatedOpenAI:
+    def __init__(self, rtt: float):
+        self.rtt = rtt
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, temperature, max_tokens, **kwargs):
+        time.sleep(self.rtt)
+        if "response_format" in kwargs:
+            text = json.dumps({"reply": "Thanks!", "style_check": {"matches_style": True, "deviations": [], "confidence": 0.9}})
+        elif messages[0]["role"] == "system":
+            text = "Thanks!"
+        elif messages[0]["content"].startswith("Summarize"):
+            text = "- Timeline question"
+        else:
+            text = json.dumps({"matches_style": True, "deviations": [], "confidence": 0.9})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+
+def serial_draft(drafter: EmailDrafter, email_file: Path):
+    """The pre-concurrency order: draft, then summary, then tone check"""
+    email = drafter._parse_email(email_file)
+    draft, _, _ = drafter._generate_draft(email, 'general', {})
+    drafter._generate_thread_summary(email['thread_history'])
+    drafter._analyze_tone_deviation(draft, drafter._load_email_style())
+
+
+def run(label, vault: Path, client, tone_check: str, emails: int, baseline=None):
+    drafter = EmailDrafter(str(vault))
+    drafter.client, drafter.client_type = client, "openai"
+    drafter.tone_check = tone_check
+    files = []
+    for index in range(emails):
+        path = vault / f"EMAIL_{tone_check}_{index}.md"
+        path.write_text(EMAIL, encoding="utf-8")
+        files.append(path)
+    started = time.perf_counter()
+    for path in files:
+        if label == "serial":
+            serial_draft(drafter, path)
+        else:
+            drafter.draft_reply(path)
+    per_email = (time.perf_counter() - started) / emails
+    speedup = f"  ({baseline / per_email:4.1f}x vs serial)" if baseline else ""
+    print(f"{label:<20} {per_email * 1000:7.1f} ms/email{speedup}")
+    return per_email
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--emails', type=int, default=10)
+    parser.add_argument('--rtt', type=float, default=0.2, help='simulated seconds per request')
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)  # drafter warns about the missing API key
+    client = SimulatedOpenAI(args.rtt)
+    with tempfile.TemporaryDirectory() as tmp:
+        vault = Path(tmp)
+        (vault / "EmailStyle.md").write_text("Casual and short.", encoding="utf-8")
+        baseline = run("serial", vault, client, "separate", args.emails)
+        run("concurrent summary", vault, client, "separate", args.emails, baseline)
+        run("merged tone check", vault, client, "merged", args.emails, baseline)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Compare inbox routing on large thread-history emails: legacy keyword scans vs one compiled pass.
+
+The legacy checks short-circuit on substring hits (``'no'`` matches inside
+``'monitor'``), so they are cheap but wrong; the trie scan pays for whole-word
+matching on every word start. route_signals skips the quoted thread history,
+which is where the time goes on long threads.
+
+Usage: python benchmarks/bench_keyword_classifier.py [--messages N] [--rounds N]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from utils import vault_markdown
+from utils.keyword_classifier import (
+    BUSINESS_KEYWORDS,
+    INFO_KEYWORDS,
+    POST_KEYWORDS,
+    URGENT_KEYWORDS,
+    ROUTING_CLASSIFIER,
+    route_signals,
+)
+
+FILLER = (
+    "Following up on the quarterly review we discussed. The team has finished the "
+    "migration and the dashboards look stable across every region we monitor.\n"
+)
+
+
+def build_email(messages: int) -> str:
+    history = "".join(
+        f"### Message {i}: 2026-01-{i % 28 + 1:02d} from person{i}@example.com\n\n{FILLER * 4}\n---\n\n"
+        for i in range(messages)
+    )
+    return (
+        "---\ntype: email\nfrom: Client <client@example.com>\nsubject: Re: Project update\n---\n\n"
+        f"## Thread History (Oldest to Newest)\n\n{history}"
+        "## Current Message\n\nCould you send the invoice for March and post about the launch on LinkedIn?\n"
+    )
+
+
+def legacy_signals(content: str, filename: str) -> dict:
+    """The pre-classifier routing checks from _process_inbox and webhook_server."""
+    is_email = 'type: email' in content.lower() or ('from:' in content.lower() and 'type: whatsapp' not in content.lower())
+    is_tweet = 'type: tweet' in content.lower() or 'TWEET' in filename.upper() or 'SOCIAL' in filename.upper()
+    is_whatsapp = 'type: whatsapp' in content.lower() or 'WHATSAPP' in filename.upper()
+    content_lower = content.lower()
+    post_request = any(keyword in content_lower for keyword in POST_KEYWORDS)
+    invoice_request = 'invoice' in content.lower()
+    text_lower = content.lower()
+    urgency = 'NORMAL'
+    for label, keywords in (('URGENT', URGENT_KEYWORDS), ('BUSINESS', BUSINESS_KEYWORDS), ('INFO', INFO_KEYWORDS)):
+        if any(keyword in text_lower for keyword in keywords):
+            urgency = label
+            break
+    return {'is_email': is_email, 'is_tweet': is_tweet, 'is_whatsapp': is_whatsapp,
+            'post_request': post_request, 'invoice_request': invoice_request, 'urgency': urgency}
+
+
+def cold_route_signals(content: str) -> dict:
+    """route_signals including the markdown parse it would normally share with the executors."""
+    vault_markdown.clear_cache()
+    return route_signals(content, 'EMAIL_1.md')
+
+
+def timed(fn, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - started) / rounds
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--messages', type=int, nargs='+', default=[10, 100, 500])
+    parser.add_argument('--rounds', type=int, default=50)
+    args = parser.parse_args()
+
+    for messages in args.messages:
+        content = build_email(messages)
+        legacy = timed(lambda: legacy_signals(content, 'EMAIL_1.md'), args.rounds)
+        full_scan = timed(lambda: ROUTING_CLASSIFIER.scan(content), args.rounds)
+        routed = timed(lambda: cold_route_signals(content), args.rounds)
+        print(
+            f"{messages:>4} messages ({len(content) / 1024:7.1f} KiB): "
+            f"legacy {legacy * 1000:7.3f} ms  "
+            f"trie scan of whole file {full_scan * 1000:7.3f} ms  "
+            f"route_signals {routed * 1000:7.3f} ms ({legacy / routed:5.1f}x)"
+        )
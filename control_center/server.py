@@ -2,25 +2,33 @@
 
 from __future__ import annotations
 
+import asyncio
+import base64
+import contextvars
+import functools
 import json
 import os
 import re
-import socket
-import subprocess
-from contextlib import asynccontextmanager
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
 from collections import Counter
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, TypeVar
 
 import yaml
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, Field
 
+from control_center.service_sampler import ServiceSampler
+from control_center.vault_index import VaultIndex
 from utils.config_loader import load_config
+from utils.vault_markdown import VaultDocument, load_document, load_header, parse_markdown
 
 ROOT = Path(__file__).resolve().parents[1]
 STATIC_DIR = Path(__file__).resolve().parent / "static"
@@ -154,22 +162,8 @@ def ensure_vault_structure(vault: Path) -> None:
 
 def split_frontmatter(content: str) -> tuple[dict[str, Any], str]:
     """Split YAML frontmatter from markdown content."""
-    if not content.startswith("---\n"):
-        return {}, content
-
-    end = content.find("\n---\n", 4)
-    if end == -1:
-        return {}, content
-
-    raw_meta = content[4:end]
-    body = content[end + 5 :]
-    try:
-        metadata = yaml.safe_load(raw_meta) or {}
-        if not isinstance(metadata, dict):
-            metadata = {}
-    except yaml.YAMLError:
-        metadata = {}
-    return metadata, body
+    document = parse_markdown(content)
+    return document.yaml_frontmatter(), document.body
 
 
 def dump_frontmatter(metadata: dict[str, Any], body: str) -> str:
@@ -294,11 +288,20 @@ def infer_priority(metadata: dict[str, Any], body: str) -> str:
 
 def read_item(path: Path, queue_key: str, include_content: bool = True) -> dict[str, Any]:
     """Read and normalize a vault markdown item."""
-    content = path.read_text(encoding="utf-8")
-    metadata, body = split_frontmatter(content)
+    document = load_document(path)
+    payload = item_payload(path, queue_key, document)
+    if include_content:
+        payload["content"] = document.content
+    return payload
+
+
+def item_payload(path: Path, queue_key: str, document: VaultDocument) -> dict[str, Any]:
+    """Normalize a parsed vault item into the content-free payload the UI lists."""
+    metadata, body = document.yaml_frontmatter(), document.body
+    mtime = path.stat().st_mtime
     cleaned = scrub_text(body)
     title = item_title(path, metadata, body)
-    payload = {
+    return {
         "filename": path.name,
         "queue": queue_key,
         "queue_label": DISPLAY_NAMES[queue_key],
@@ -308,14 +311,122 @@ def read_item(path: Path, queue_key: str, include_content: bool = True) -> dict[
         "priority": infer_priority(metadata, body),
         "type": str(metadata.get("type", "note")),
         "status": str(metadata.get("status", queue_key)),
-        "modified_at": datetime.fromtimestamp(path.stat().st_mtime, timezone.utc).isoformat(),
-        "age": age_label(path.stat().st_mtime),
+        "modified_at": datetime.fromtimestamp(mtime, timezone.utc).isoformat(),
+        "age": age_label(mtime),
         "preview": cleaned[:220],
         "metadata": metadata,
     }
-    if include_content:
-        payload["content"] = content
-    return payload
+
+
+def read_item_summary(path: Path, queue_key: str) -> dict[str, Any]:
+    """Content-free item payload, as cached by the vault index.
+
+    Only the frontmatter and the first few KB of the body are read, which
+    is all the preview, title and keyword priority need.
+    """
+    return item_payload(path, queue_key, load_header(path))
+
+
+# Live indexes registered by ``lifespan``, keyed by vault path
+LIVE_INDEXES: dict[str, VaultIndex] = {}
+_SNAPSHOT: ContextVar[VaultIndex | None] = ContextVar("vault_snapshot", default=None)
+
+
+def vault_index(vault: Path) -> VaultIndex:
+    """The live index for ``vault``, else the enclosing ``shared_snapshot``, else a fresh snapshot."""
+    live = LIVE_INDEXES.get(str(vault))
+    if live is not None:
+        return live
+    snapshot = _SNAPSHOT.get()
+    if snapshot is not None and snapshot.vault == Path(vault):
+        return snapshot
+    return VaultIndex(vault, QUEUE_DIRS, read_item_summary).build()
+
+
+@contextmanager
+def shared_snapshot(vault: Path):
+    """Let every helper called inside reuse one scan of ``vault`` when no live index is running."""
+    token = _SNAPSHOT.set(vault_index(vault))
+    try:
+        yield
+    finally:
+        _SNAPSHOT.reset(token)
+
+
+def note_vault_change(vault: Path, *paths: Path) -> None:
+    """Apply the server's own writes to the live index without waiting for the file event."""
+    live = LIVE_INDEXES.get(str(vault))
+    if live is not None:
+        live.refresh(*paths)
+
+
+def indexed_items(index: VaultIndex, entries: list[tuple[float, str, str]]) -> list[dict[str, Any]]:
+    """Summaries for (mtime, queue_key, filename) entries with ages relative to now."""
+    items = []
+    for _, queue_key, filename in entries:
+        found = index.summary(queue_key, filename)
+        if found is not None:
+            mtime, summary = found
+            items.append({**summary, "age": age_label(mtime)})
+    return items
+
+
+def encode_cursor(mtime: float, filename: str) -> str:
+    """Opaque pagination cursor for the last item of a page."""
+    raw = json.dumps([mtime, filename]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[float, str]:
+    """Inverse of ``encode_cursor``; rejects anything it did not produce."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        mtime, filename = json.loads(raw)
+        return float(mtime), str(filename)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+
+
+def item_matches(item: dict[str, Any], filters: dict[str, str]) -> bool:
+    """Type and priority match exactly, owner by substring; all case-insensitive."""
+    for field, wanted in filters.items():
+        value = str(item.get(field, "")).lower()
+        matched = wanted in value if field == "owner" else value == wanted
+        if not matched:
+            return False
+    return True
+
+
+def queue_page(
+    index: VaultIndex,
+    queue_key: str,
+    *,
+    limit: int,
+    cursor: str | None = None,
+    filters: dict[str, str] | None = None,
+) -> tuple[list[dict[str, Any]], str | None]:
+    """One page of a queue, newest first, and the cursor for the next page (None on the last).
+
+    Unfiltered pages select ``limit + 1`` entries from the index without
+    sorting the queue. Filtered pages walk the queue newest first, parsing
+    headers only until the page is full; the index keeps each summary until
+    the file changes, so repeated filters do not re-read the vault.
+    """
+    before = decode_cursor(cursor) if cursor else None
+    filters = {field: value.strip().lower() for field, value in (filters or {}).items() if value and value.strip()}
+    candidates = index.older_than(queue_key, before, None if filters else limit + 1)
+    items: list[dict[str, Any]] = []
+    last = None
+    for mtime, _, filename in candidates:
+        if len(items) == limit:
+            return items, encode_cursor(*last)
+        found = index.summary(queue_key, filename)
+        if found is None:
+            continue
+        if item_matches(found[1], filters):
+            items.append({**found[1], "age": age_label(found[0])})
+            last = (mtime, filename)
+    return items, None
 
 
 def queue_path(vault: Path, queue_key: str) -> Path:
@@ -339,30 +450,6 @@ def find_item(vault: Path, queue_key: str, filename: str) -> Path:
     return path
 
 
-def process_running(pattern: str) -> bool:
-    """Check whether a process matching the pattern is running."""
-    try:
-        result = subprocess.run(
-            ["pgrep", "-f", pattern],
-            capture_output=True,
-            text=True,
-            timeout=1,
-            check=False,
-        )
-        return result.returncode == 0 and bool(result.stdout.strip())
-    except Exception:
-        return False
-
-
-def port_open(host: str, port: int) -> bool:
-    """Check whether a TCP port is reachable."""
-    try:
-        with socket.create_connection((host, port), timeout=0.3):
-            return True
-    except OSError:
-        return False
-
-
 def setup_status() -> list[dict[str, Any]]:
     """Return grouped setup readiness information."""
     results: list[dict[str, Any]] = []
@@ -393,21 +480,21 @@ def setup_status() -> list[dict[str, Any]]:
     return results
 
 
-def service_status() -> list[dict[str, Any]]:
-    """Return process and port visibility for core services."""
+def build_services(running: dict[str, bool], reachable: dict[str, bool]) -> list[dict[str, Any]]:
+    """Shape one process/port sample for the UI."""
     services = []
-    for name, pattern in PROCESS_PATTERNS.items():
-        host, port = PORT_CHECKS.get(name, ("127.0.0.1", 0))
+    for name in PROCESS_PATTERNS:
+        port = PORT_CHECKS.get(name, ("127.0.0.1", 0))[1]
         services.append(
             {
                 "name": name,
                 "label": name.replace("_", " ").title(),
-                "running": process_running(pattern),
-                "reachable": port_open(host, port) if port else False,
+                "running": running[name],
+                "reachable": reachable.get(name, False),
                 "port": port,
             }
         )
-    odoo_reachable = port_open(*PORT_CHECKS["odoo"])
+    odoo_reachable = reachable.get("odoo", False)
     services.append(
         {
             "name": "odoo",
@@ -420,42 +507,38 @@ def service_status() -> list[dict[str, Any]]:
     return services
 
 
+SERVICE_SAMPLER = ServiceSampler(
+    build_services,
+    PROCESS_PATTERNS,
+    PORT_CHECKS,
+    ttl=float(os.getenv("CONTROL_CENTER_SERVICE_TTL", "2")),
+)
+
+
+def service_status() -> list[dict[str, Any]]:
+    """Return process and port visibility for core services (sampled at most once per TTL)."""
+    return SERVICE_SAMPLER.services()
+
+
 def recent_activity(vault: Path, limit: int = 10) -> list[dict[str, Any]]:
     """Return the newest items across the major vault queues."""
-    items = []
-    for queue_key in QUEUE_DIRS:
-        directory = queue_path(vault, queue_key)
-        for path in directory.glob("*.md"):
-            items.append(read_item(path, queue_key, include_content=False))
-    items.sort(key=lambda item: item["modified_at"], reverse=True)
-    return items[:limit]
+    index = vault_index(vault)
+    return indexed_items(index, index.newest(QUEUE_DIRS, limit))
 
 
 def activity_metrics(vault: Path) -> dict[str, Any]:
     """Aggregate vault-derived activity metrics."""
-    done_dir = queue_path(vault, "done")
-    done_files = list(done_dir.glob("*.md"))
-    last_week = datetime.now(timezone.utc) - timedelta(days=7)
-    recent_done = [
-        path for path in done_files if datetime.fromtimestamp(path.stat().st_mtime, timezone.utc) >= last_week
-    ]
-
-    by_prefix = Counter(path.name.split("_", 1)[0] for path in recent_done)
-    pending_age = [
-        datetime.now(timezone.utc) - datetime.fromtimestamp(path.stat().st_mtime, timezone.utc)
-        for path in queue_path(vault, "pending_approval").glob("*.md")
-    ]
-    avg_pending_hours = round(
-        sum(delta.total_seconds() for delta in pending_age) / max(len(pending_age), 1) / 3600,
-        1,
-    )
-    oldest_pending_hours = max((round(delta.total_seconds() / 3600, 1) for delta in pending_age), default=0)
-    needs_action_ages = [
-        datetime.now(timezone.utc) - datetime.fromtimestamp(path.stat().st_mtime, timezone.utc)
-        for path in queue_path(vault, "needs_action").glob("*.md")
-    ]
+    index = vault_index(vault)
+    now = time.time()
+    last_week = now - timedelta(days=7).total_seconds()
+    recent_done = [name for name, mtime in index.mtimes("done") if mtime >= last_week]
+
+    by_prefix = Counter(name.split("_", 1)[0] for name in recent_done)
+    pending_age = [now - mtime for _, mtime in index.mtimes("pending_approval")]
+    avg_pending_hours = round(sum(pending_age) / max(len(pending_age), 1) / 3600, 1)
+    oldest_pending_hours = max((round(age / 3600, 1) for age in pending_age), default=0)
     oldest_needs_action_hours = max(
-        (round(delta.total_seconds() / 3600, 1) for delta in needs_action_ages),
+        (round((now - mtime) / 3600, 1) for _, mtime in index.mtimes("needs_action")),
         default=0,
     )
 
@@ -469,16 +552,18 @@ def activity_metrics(vault: Path) -> dict[str, Any]:
         "avg_pending_hours": avg_pending_hours if pending_age else 0,
         "oldest_pending_hours": oldest_pending_hours,
         "oldest_needs_action_hours": oldest_needs_action_hours,
-        "briefings": len(list((vault / "Briefings").glob("*_briefing.md"))),
+        "briefings": index.briefing_count(),
     }
 
 
 def queue_counts(vault: Path) -> dict[str, int]:
     """Count queue items by stage."""
-    counts = {}
-    for queue_key in QUEUE_DIRS:
-        counts[queue_key] = len(list(queue_path(vault, queue_key).glob("*.md")))
-    return counts
+    return vault_index(vault).counts()
+
+
+def backlog_size(counts: dict[str, int]) -> int:
+    """Items still waiting on someone: intake, approvals, execution and failures."""
+    return counts["needs_action"] + counts["pending_approval"] + counts["approved"] + counts["failed"]
 
 
 def recommended_actions(
@@ -572,6 +657,7 @@ def assistant_brief(
     recommendations: list[str] | None = None,
 ) -> dict[str, Any]:
     """Build a concise assistant-style operational brief from local state."""
+    index = vault_index(vault)
     if counts is None:
         counts = queue_counts(vault)
     if metrics is None:
@@ -600,13 +686,11 @@ def assistant_brief(
         if not service["running"] and not service["reachable"]
     ]
 
-    stale_items = []
-    for queue_key in ("pending_approval", "needs_action", "approved", "failed"):
-        for path in queue_path(vault, queue_key).glob("*.md"):
-            item = read_item(path, queue_key, include_content=False)
-            item["age_hours"] = hours_since(path.stat().st_mtime)
-            stale_items.append(item)
-    stale_items.sort(key=lambda item: item["age_hours"], reverse=True)
+    stale_entries = index.oldest(("pending_approval", "needs_action", "approved", "failed"), 5)
+    stale_items = [
+        {**item, "age_hours": hours_since(mtime)}
+        for (mtime, _, _), item in zip(stale_entries, indexed_items(index, stale_entries))
+    ]
 
     mood = "stable"
     if blockers or service_alerts or counts["pending_approval"] >= 3 or counts["failed"]:
@@ -655,8 +739,9 @@ def update_item_status(path: Path, target_key: str) -> None:
 
 def generate_briefing_markdown(vault: Path) -> Path:
     """Generate a compact weekly briefing from local vault activity."""
-    metrics = activity_metrics(vault)
-    counts = queue_counts(vault)
+    with shared_snapshot(vault):
+        metrics = activity_metrics(vault)
+        counts = queue_counts(vault)
     lines = [
         "# Monday Morning CEO Briefing",
         "",
@@ -684,7 +769,7 @@ def generate_briefing_markdown(vault: Path) -> Path:
         "## Attention Now",
         "",
     ]
-    for action in recommended_actions(vault):
+    for action in recommended_actions(vault, counts=counts):
         lines.append(f"- {action}")
     lines.extend(
         [
@@ -712,9 +797,10 @@ def generate_briefing_markdown(vault: Path) -> Path:
 
 def write_dashboard_markdown(vault: Path) -> Path:
     """Write a richer markdown dashboard for Obsidian users."""
-    counts = queue_counts(vault)
-    metrics = activity_metrics(vault)
-    recent = recent_activity(vault, limit=6)
+    with shared_snapshot(vault):
+        counts = queue_counts(vault)
+        metrics = activity_metrics(vault)
+        recent = recent_activity(vault, limit=6)
     setup = setup_status()
 
     lines = [
@@ -767,7 +853,7 @@ def write_dashboard_markdown(vault: Path) -> Path:
             "",
         ]
     )
-    for action in recommended_actions(vault):
+    for action in recommended_actions(vault, counts=counts, setup=setup):
         lines.append(f"- {action}")
 
     lines.extend(
@@ -782,121 +868,201 @@ def write_dashboard_markdown(vault: Path) -> Path:
     return dashboard
 
 
-def overview_payload(vault: Path) -> dict[str, Any]:
+def overview_payload(vault: Path, *, services: list[dict[str, Any]] | None = None) -> dict[str, Any]:
     """Build the complete control center overview payload."""
-    counts = queue_counts(vault)
-    metrics = activity_metrics(vault)
-    setup = setup_status()
-    services = service_status()
-    recommendations = recommended_actions(vault, counts=counts, setup=setup)
-    backlog = (
-        counts["needs_action"]
-        + counts["pending_approval"]
-        + counts["approved"]
-        + counts["failed"]
-    )
-    queues = [
-        {
-            "key": queue_key,
-            "label": DISPLAY_NAMES[queue_key],
-            "count": count,
+    with shared_snapshot(vault):
+        counts = queue_counts(vault)
+        metrics = activity_metrics(vault)
+        setup = setup_status()
+        if services is None:
+            services = service_status()
+        recommendations = recommended_actions(vault, counts=counts, setup=setup)
+        backlog = backlog_size(counts)
+        queues = [
+            {
+                "key": queue_key,
+                "label": DISPLAY_NAMES[queue_key],
+                "count": count,
+            }
+            for queue_key, count in counts.items()
+        ]
+        return {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "vault_path": str(vault),
+            "headline": {
+                "backlog": backlog,
+                "approvals": counts["pending_approval"],
+                "completed": metrics["done_last_7_days"],
+                "briefings": metrics["briefings"],
+            },
+            "queues": queues,
+            "metrics": metrics,
+            "setup": setup,
+            "services": services,
+            "recent_activity": recent_activity(vault, limit=8),
+            "recommended_actions": recommendations,
+            "assistant_brief": assistant_brief(
+                vault,
+                counts=counts,
+                metrics=metrics,
+                services=services,
+                setup=setup,
+                recommendations=recommendations,
+            ),
         }
-        for queue_key, count in counts.items()
-    ]
+
+
+QUEUE_PAGE_SIZE = int(os.getenv("CONTROL_CENTER_QUEUE_PAGE_SIZE", "50"))
+QUEUE_PAGE_MAX = 200
+T = TypeVar("T")
+IO_WORKERS = int(os.getenv("CONTROL_CENTER_IO_WORKERS", "8"))
+IO_POOL = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="control-center-io")
+SSE_KEEPALIVE_SECONDS = float(os.getenv("CONTROL_CENTER_SSE_KEEPALIVE", "15"))
+SSE_QUEUE_LIMIT = 256
+
+
+async def run_blocking(func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Run blocking vault, file or process work on ``IO_POOL`` without stalling the event loop.
+
+    The pool is bounded, so a burst of expensive requests queues up instead
+    of spawning threads; context variables (``shared_snapshot``) carry over.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(IO_POOL, functools.partial(context.run, func, *args, **kwargs))
+
+
+def sse_message(event: str, data: Any) -> str:
+    """Format one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def vault_event_payload(vault: Path, batch: dict[str, Any]) -> dict[str, Any]:
+    """Turn a vault index change batch into the diff the UI applies.
+
+    Added, updated and moved items carry their list summary so the browser
+    never has to re-fetch a queue; counts and headline numbers are included
+    whole because they are tiny.
+    """
+    index = vault_index(vault)
+    changes = []
+    for change in batch["changes"]:
+        if change["kind"] in ("added", "updated", "moved"):
+            found = index.summary(change["queue"], change["filename"])
+            if found is None:  # already gone again; a later batch will say so
+                continue
+            mtime, summary = found
+            change = {**change, "item": {**summary, "age": age_label(mtime)}}
+        changes.append(change)
+    counts = batch["counts"]
+    metrics = activity_metrics(vault)
     return {
+        "version": batch["version"],
         "generated_at": datetime.now(timezone.utc).isoformat(),
-        "vault_path": str(vault),
+        "changes": changes,
+        "queues": [
+            {"key": queue_key, "label": DISPLAY_NAMES[queue_key], "count": count}
+            for queue_key, count in counts.items()
+        ],
         "headline": {
-            "backlog": backlog,
+            "backlog": backlog_size(counts),
             "approvals": counts["pending_approval"],
             "completed": metrics["done_last_7_days"],
-            "briefings": metrics["briefings"],
+            "briefings": batch["briefings"],
         },
-        "queues": queues,
-        "metrics": metrics,
-        "setup": setup,
-        "services": services,
-        "recent_activity": recent_activity(vault, limit=8),
-        "recommended_actions": recommendations,
-        "assistant_brief": assistant_brief(
-            vault,
-            counts=counts,
-            metrics=metrics,
-            services=services,
-            setup=setup,
-            recommendations=recommendations,
-        ),
     }
 
 
-@asynccontextmanager
-async def lifespan(_: FastAPI):
-    """Ensure the vault exists and refresh the markdown dashboard on boot."""
-    vault = get_vault_path()
-    ensure_vault_structure(vault)
-    write_dashboard_markdown(vault)
-    yield
-
-
-app = FastAPI(title="DigitalFTE Control Center", version="1.0.0", lifespan=lifespan)
-app.add_middleware(GZipMiddleware, minimum_size=500)
-app.mount("/assets", StaticFiles(directory=STATIC_DIR), name="assets")
+async def vault_event_stream(vault: Path, index: VaultIndex, *, keepalive: float = SSE_KEEPALIVE_SECONDS):
+    """Yield SSE messages for every change to ``index`` until the client goes away.
 
+    Index listeners run on the watchdog thread, so batches are handed to the
+    event loop with ``call_soon_threadsafe``. A client that falls more than
+    ``SSE_QUEUE_LIMIT`` batches behind gets a single ``resync`` instead. While
+    the vault is idle the stream only re-checks the (TTL-cached) service
+    sample, sending ``services`` when it changed and a comment otherwise.
+    """
+    loop = asyncio.get_running_loop()
+    pending: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue(maxsize=SSE_QUEUE_LIMIT)
 
-@app.get("/", response_class=HTMLResponse)
-async def index() -> HTMLResponse:
-    """Serve the control center UI."""
-    html = (STATIC_DIR / "index.html").read_text(encoding="utf-8")
-    return HTMLResponse(html)
+    def offer(batch: dict[str, Any]) -> None:
+        try:
+            pending.put_nowait(batch)
+        except asyncio.QueueFull:
+            while not pending.empty():
+                pending.get_nowait()
+            pending.put_nowait(None)
 
+    def forward(batch: dict[str, Any]) -> None:
+        try:
+            loop.call_soon_threadsafe(offer, batch)
+        except RuntimeError:  # loop closed while the stream was shutting down
+            pass
 
-@app.get("/api/overview")
-async def api_overview() -> dict[str, Any]:
-    """Return a single payload for the home screen."""
-    vault = get_vault_path()
+    unsubscribe = index.subscribe(forward)
+    try:
+        services = await run_blocking(service_status)
+        yield sse_message("ready", {"version": index.version})
+        while True:
+            try:
+                batch = await asyncio.wait_for(pending.get(), keepalive)
+            except asyncio.TimeoutError:
+                current = await run_blocking(service_status)
+                if current != services:
+                    services = current
+                    yield sse_message("services", services)
+                else:
+                    yield ": keepalive\n\n"
+                continue
+            if batch is None:
+                yield sse_message("resync", {"version": index.version})
+            else:
+                yield sse_message("vault", await run_blocking(vault_event_payload, vault, batch))
+    finally:
+        unsubscribe()
+
+
+def load_overview(vault: Path) -> dict[str, Any]:
+    """Overview payload for a vault that may not have been created yet."""
     ensure_vault_structure(vault)
     return overview_payload(vault)
 
 
-@app.get("/api/queues/{queue_key}")
-async def api_queue(queue_key: str) -> dict[str, Any]:
-    """Return all items for a queue."""
-    vault = get_vault_path()
-    directory = queue_path(vault, queue_key)
-    items = [
-        read_item(path, queue_key, include_content=False)
-        for path in sorted(directory.glob("*.md"), key=lambda item: item.stat().st_mtime, reverse=True)
-    ]
+def list_queue(
+    vault: Path,
+    queue_key: str,
+    *,
+    limit: int = QUEUE_PAGE_SIZE,
+    cursor: str | None = None,
+    filters: dict[str, str | None] | None = None,
+) -> dict[str, Any]:
+    """One page of a queue in the shape ``/api/queues`` returns."""
+    queue_path(vault, queue_key)
+    index = vault_index(vault)
+    items, next_cursor = queue_page(index, queue_key, limit=limit, cursor=cursor, filters=filters)
     return {
         "queue": queue_key,
         "label": DISPLAY_NAMES[queue_key],
+        "total": index.counts()[queue_key],
         "items": items,
+        "next_cursor": next_cursor,
     }
 
 
-@app.get("/api/items/{queue_key}/{filename}")
-async def api_item(queue_key: str, filename: str) -> dict[str, Any]:
-    """Return a single queue item."""
-    vault = get_vault_path()
-    path = find_item(vault, queue_key, filename)
-    return read_item(path, queue_key)
-
-
-@app.post("/api/items/{queue_key}/{filename}/move")
-async def api_move(queue_key: str, filename: str, request: MoveRequest) -> dict[str, Any]:
-    """Move a queue item between vault stages."""
-    vault = get_vault_path()
+def move_item(vault: Path, queue_key: str, filename: str, target: str) -> dict[str, Any]:
+    """Move a queue item to another stage and record its new status."""
     source = find_item(vault, queue_key, filename)
-    target_key = request.target.lower().strip()
-    target_dir_name = QUEUE_DESTINATIONS.get(target_key, request.target)
+    target_key = target.lower().strip()
+    target_dir_name = QUEUE_DESTINATIONS.get(target_key, target)
     target_dir = vault / target_dir_name
     if target_dir_name not in QUEUE_DIRS.values():
-        raise HTTPException(status_code=400, detail=f"Unknown target '{request.target}'")
+        raise HTTPException(status_code=400, detail=f"Unknown target '{target}'")
 
     target_dir.mkdir(parents=True, exist_ok=True)
     destination = target_dir / source.name
     source.rename(destination)
     update_item_status(destination, target_key)
+    note_vault_change(vault, source, destination)
     write_dashboard_markdown(vault)
     return {
         "ok": True,
@@ -906,10 +1072,8 @@ async def api_move(queue_key: str, filename: str, request: MoveRequest) -> dict[
     }
 
 
-@app.post("/api/actions/capture")
-async def api_capture(request: CaptureRequest) -> dict[str, Any]:
-    """Create a new operator task directly in the vault."""
-    vault = get_vault_path()
+def capture_item(vault: Path, request: CaptureRequest) -> dict[str, Any]:
+    """Write a new operator task into Needs_Action."""
     ensure_vault_structure(vault)
 
     now = datetime.now()
@@ -940,29 +1104,127 @@ async def api_capture(request: CaptureRequest) -> dict[str, Any]:
         ]
     )
     target.write_text(dump_frontmatter(metadata, body), encoding="utf-8")
+    note_vault_change(vault, target)
     write_dashboard_markdown(vault)
     return {"ok": True, "filename": filename}
 
 
-@app.post("/api/actions/briefing")
-async def api_briefing() -> dict[str, Any]:
-    """Generate a new briefing markdown file."""
-    vault = get_vault_path()
+def create_briefing(vault: Path) -> dict[str, Any]:
+    """Write today's briefing and refresh the dashboard."""
     ensure_vault_structure(vault)
     briefing = generate_briefing_markdown(vault)
+    note_vault_change(vault, briefing)
     write_dashboard_markdown(vault)
     return {"ok": True, "path": path_for_display(briefing)}
 
 
-@app.post("/api/actions/dashboard")
-async def api_dashboard_refresh() -> dict[str, Any]:
-    """Refresh the markdown dashboard snapshot."""
-    vault = get_vault_path()
+def refresh_dashboard(vault: Path) -> dict[str, Any]:
+    """Rewrite the markdown dashboard snapshot."""
     ensure_vault_structure(vault)
     dashboard = write_dashboard_markdown(vault)
     return {"ok": True, "path": path_for_display(dashboard)}
 
 
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    """Ensure the vault exists, index it, and refresh the markdown dashboard on boot."""
+    vault = get_vault_path()
+    ensure_vault_structure(vault)
+    index = VaultIndex(vault, QUEUE_DIRS, read_item_summary).build()
+    if index.start():
+        LIVE_INDEXES[str(vault)] = index
+    write_dashboard_markdown(vault)
+    try:
+        yield
+    finally:
+        LIVE_INDEXES.pop(str(vault), None)
+        index.stop()
+
+
+app = FastAPI(title="DigitalFTE Control Center", version="1.0.0", lifespan=lifespan)
+app.add_middleware(GZipMiddleware, minimum_size=500)
+app.mount("/assets", StaticFiles(directory=STATIC_DIR), name="assets")
+
+# Every handler below is async and hands its vault, file and process work to
+# ``run_blocking``, so the event loop only parses requests and writes
+# responses. A slow overview then delays other vault work (bounded by the
+# pool) but never /api/health or the SSE streams.
+
+
+@app.get("/", response_class=HTMLResponse)
+async def index() -> HTMLResponse:
+    """Serve the control center UI."""
+    html = await run_blocking((STATIC_DIR / "index.html").read_text, encoding="utf-8")
+    return HTMLResponse(html)
+
+
+@app.get("/api/overview")
+async def api_overview() -> dict[str, Any]:
+    """Return a single payload for the home screen."""
+    return await run_blocking(load_overview, get_vault_path())
+
+
+@app.get("/api/events")
+async def api_events() -> StreamingResponse:
+    """Stream vault diffs to the UI as Server-Sent Events."""
+    vault = get_vault_path()
+    index = LIVE_INDEXES.get(str(vault))
+    if index is None:
+        raise HTTPException(status_code=503, detail="Live updates are unavailable; poll /api/overview instead")
+    return StreamingResponse(
+        vault_event_stream(vault, index),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/api/queues/{queue_key}")
+async def api_queue(
+    queue_key: str,
+    limit: int = Query(QUEUE_PAGE_SIZE, ge=1, le=QUEUE_PAGE_MAX),
+    cursor: str | None = None,
+    item_type: str | None = Query(None, alias="type"),
+    priority: str | None = None,
+    owner: str | None = None,
+) -> dict[str, Any]:
+    """Return one page of a queue, newest first; pass ``next_cursor`` back for the next page."""
+    filters = {"type": item_type, "priority": priority, "owner": owner}
+    return await run_blocking(
+        list_queue, get_vault_path(), queue_key, limit=limit, cursor=cursor, filters=filters
+    )
+
+
+@app.get("/api/items/{queue_key}/{filename}")
+async def api_item(queue_key: str, filename: str) -> dict[str, Any]:
+    """Return a single queue item."""
+    vault = get_vault_path()
+    return await run_blocking(lambda: read_item(find_item(vault, queue_key, filename), queue_key))
+
+
+@app.post("/api/items/{queue_key}/{filename}/move")
+async def api_move(queue_key: str, filename: str, request: MoveRequest) -> dict[str, Any]:
+    """Move a queue item between vault stages."""
+    return await run_blocking(move_item, get_vault_path(), queue_key, filename, request.target)
+
+
+@app.post("/api/actions/capture")
+async def api_capture(request: CaptureRequest) -> dict[str, Any]:
+    """Create a new operator task directly in the vault."""
+    return await run_blocking(capture_item, get_vault_path(), request)
+
+
+@app.post("/api/actions/briefing")
+async def api_briefing() -> dict[str, Any]:
+    """Generate a new briefing markdown file."""
+    return await run_blocking(create_briefing, get_vault_path())
+
+
+@app.post("/api/actions/dashboard")
+async def api_dashboard_refresh() -> dict[str, Any]:
+    """Refresh the markdown dashboard snapshot."""
+    return await run_blocking(refresh_dashboard, get_vault_path())
+
+
 @app.get("/api/health")
 async def api_health() -> dict[str, Any]:
     """Simple health endpoint."""
@@ -0,0 +1,110 @@
+"""Shared, TTL-cached process and port sampling for the control center."""
+
+from __future__ import annotations
+
+import copy
+import os
+import socket
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable
+
+PROC_ROOT = Path("/proc")
+
+
+def running_patterns(patterns: dict[str, str], proc_root: Path = PROC_ROOT) -> dict[str, bool]:
+    """Which ``pgrep -f``-style patterns match a running command line, from one pass over /proc.
+
+    Falls back to a single ``ps`` call where /proc is unavailable (macOS).
+    """
+    found = {name: False for name in patterns}
+    for cmdline in _command_lines(proc_root):
+        for name, pattern in patterns.items():
+            if not found[name] and pattern in cmdline:
+                found[name] = True
+        if all(found.values()):
+            break
+    return found
+
+
+def _command_lines(proc_root: Path):
+    if not proc_root.is_dir():
+        try:
+            result = subprocess.run(
+                ["ps", "-axo", "command="], capture_output=True, text=True, timeout=1, check=False
+            )
+        except Exception:
+            return
+        yield from result.stdout.splitlines()
+        return
+
+    with os.scandir(proc_root) as entries:
+        for entry in entries:
+            if not entry.name.isdigit():
+                continue
+            try:
+                raw = Path(entry.path, "cmdline").read_bytes()
+            except OSError:  # process exited or is not ours to read
+                continue
+            if raw:
+                yield raw.replace(b"\0", b" ").decode("utf-8", "replace")
+
+
+def port_open(host: str, port: int, timeout: float = 0.3) -> bool:
+    """Check whether a TCP port is reachable."""
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+class ServiceSampler:
+    """One process/port sample shared by every caller for ``ttl`` seconds.
+
+    ``services()`` returns the cached sample while it is fresh. When it is
+    stale, the first caller re-samples and concurrent callers wait for that
+    result instead of probing again. Port probes run in parallel, so a
+    sample costs one /proc pass plus the slowest probe.
+    """
+
+    def __init__(
+        self,
+        build: Callable[[dict[str, bool], dict[str, bool]], list[dict[str, Any]]],
+        patterns: dict[str, str],
+        ports: dict[str, tuple[str, int]],
+        ttl: float = 2.0,
+        probe_timeout: float = 0.3,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.build = build
+        self.patterns = dict(patterns)
+        self.ports = {name: target for name, target in ports.items() if target[1]}
+        self.ttl = ttl
+        self.probe_timeout = probe_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max(len(self.ports), 1), thread_name_prefix="port-probe")
+        self._sample: list[dict[str, Any]] | None = None
+        self._sampled_at = 0.0
+        self.samples = 0
+
+    def services(self) -> list[dict[str, Any]]:
+        with self._lock:
+            if self._sample is None or self._clock() - self._sampled_at >= self.ttl:
+                self._sample = self._take_sample()
+                self._sampled_at = self._clock()
+                self.samples += 1
+            return copy.deepcopy(self._sample)
+
+    def _take_sample(self) -> list[dict[str, Any]]:
+        probes = {
+            name: self._pool.submit(port_open, host, port, self.probe_timeout)
+            for name, (host, port) in self.ports.items()
+        }
+        running = running_patterns(self.patterns)
+        reachable = {name: future.result() for name, future in probes.items()}
+        return self.build(running, reachable)
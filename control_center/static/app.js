@@ -1,11 +1,19 @@
+const RECENT_LIMIT = 8;
+const RECONCILE_DELAY_MS = 5000;
+
 const state = {
   overview: null,
   activeQueue: "needs_action",
   selected: null,
   queueItems: [],
+  queueCursor: null,
+  queueTotal: 0,
   autoRefresh: true,
   refreshing: false,
   actionBusy: false,
+  stream: null,
+  live: false,
+  reconcileTimer: null,
 };
 
 const nodes = {
@@ -116,9 +124,8 @@ function renderLiveStatus() {
   if (!state.overview) {
     return;
   }
-  nodes.systemLive.textContent = `Last sync ${formatIsoTime(state.overview.generated_at)} • auto-refresh ${
-    state.autoRefresh ? "enabled" : "paused"
-  }`;
+  const mode = !state.autoRefresh ? "auto-refresh paused" : state.live ? "live updates" : "auto-refresh enabled";
+  nodes.systemLive.textContent = `Last sync ${formatIsoTime(state.overview.generated_at)} • ${mode}`;
   nodes.autoRefreshButton.textContent = `Auto-refresh: ${state.autoRefresh ? "on" : "off"}`;
   nodes.autoRefreshButton.setAttribute("aria-pressed", String(state.autoRefresh));
 }
@@ -297,8 +304,13 @@ function filteredQueueItems() {
 function renderQueueList() {
   const focusedFile = document.activeElement?.dataset?.file;
   const items = filteredQueueItems();
-  nodes.queueStatus.textContent = `${items.length} queue item${items.length === 1 ? "" : "s"} shown.`;
-  nodes.queueList.innerHTML = items.length
+  nodes.queueStatus.textContent = `${items.length} of ${state.queueTotal} queue item${
+    state.queueTotal === 1 ? "" : "s"
+  } shown.`;
+  const loadMore = state.queueCursor
+    ? `<button type="button" class="button button-ghost" data-load-more>Load older items</button>`
+    : "";
+  nodes.queueList.innerHTML = (items.length
     ? items
         .map(
           (item) => `
@@ -319,7 +331,11 @@ function renderQueueList() {
           `
         )
         .join("")
-    : `<div class="empty-state"><strong>No items match this filter.</strong><p class="item-preview">Try a different queue or clear the search box.</p></div>`;
+    : `<div class="empty-state"><strong>No items match this filter.</strong><p class="item-preview">Try a different queue or clear the search box.</p></div>`) + loadMore;
+
+  nodes.queueList
+    .querySelector("[data-load-more]")
+    ?.addEventListener("click", () => runSafely(loadMoreQueue));
 
   nodes.queueList.querySelectorAll("[data-file]").forEach((itemNode) => {
     itemNode.addEventListener("click", () =>
@@ -422,15 +438,12 @@ async function loadOverview() {
   renderAssistantBrief();
 }
 
-async function loadQueue() {
-  const payload = await api(`/api/queues/${state.activeQueue}`);
-  state.queueItems = payload.items;
-
+async function syncSelection() {
   const selectedFilename = state.selected?.filename;
   const stillVisible = selectedFilename
-    ? payload.items.find((item) => item.filename === selectedFilename)
+    ? state.queueItems.find((item) => item.filename === selectedFilename)
     : null;
-  const nextItem = stillVisible || payload.items[0] || null;
+  const nextItem = stillVisible || state.queueItems[0] || null;
 
   const selectedIsCurrent =
     nextItem &&
@@ -442,6 +455,14 @@ async function loadQueue() {
       ? state.selected
       : await api(`/api/items/${state.activeQueue}/${encodeURIComponent(nextItem.filename)}`)
     : null;
+}
+
+async function loadQueue() {
+  const payload = await api(`/api/queues/${state.activeQueue}`);
+  state.queueItems = payload.items;
+  state.queueCursor = payload.next_cursor;
+  state.queueTotal = payload.total;
+  await syncSelection();
 
   renderQueueTabs();
   renderQueueList();
@@ -464,6 +485,120 @@ async function refreshAll({ showMessage = false } = {}) {
   }
 }
 
+async function loadMoreQueue() {
+  if (!state.queueCursor) {
+    return;
+  }
+  const payload = await api(
+    `/api/queues/${state.activeQueue}?cursor=${encodeURIComponent(state.queueCursor)}`
+  );
+  const known = new Set(state.queueItems.map((item) => item.filename));
+  state.queueItems.push(...payload.items.filter((item) => !known.has(item.filename)));
+  state.queueCursor = payload.next_cursor;
+  state.queueTotal = payload.total;
+  renderQueueList();
+}
+
+function insertByRecency(items, item) {
+  const position = items.findIndex((entry) => entry.modified_at < item.modified_at);
+  items.splice(position === -1 ? items.length : position, 0, item);
+}
+
+function applyItemChange(change) {
+  if (change.kind === "briefings") {
+    return;
+  }
+  const leftQueue = change.kind === "moved" ? change.from : change.queue;
+  const isChanged = (item) =>
+    item.filename === change.filename && (item.queue === change.queue || item.queue === leftQueue);
+
+  state.queueItems = state.queueItems.filter((item) => !isChanged(item));
+  state.overview.recent_activity = state.overview.recent_activity.filter((item) => !isChanged(item));
+  if (change.item) {
+    const oldestLoaded = state.queueItems[state.queueItems.length - 1];
+    // Older than everything loaded while more pages remain: it belongs to a later page
+    const onLoadedPages =
+      !state.queueCursor || !oldestLoaded || change.item.modified_at >= oldestLoaded.modified_at;
+    if (change.queue === state.activeQueue && onLoadedPages) {
+      insertByRecency(state.queueItems, change.item);
+    }
+    insertByRecency(state.overview.recent_activity, change.item);
+  }
+}
+
+function scheduleReconcile() {
+  // Brief, recommendations and stale radar are derived from the whole vault;
+  // fetch them once a burst of changes has settled rather than per event.
+  window.clearTimeout(state.reconcileTimer);
+  state.reconcileTimer = window.setTimeout(() => runSafely(loadOverview), RECONCILE_DELAY_MS);
+}
+
+async function applyVaultEvent(event) {
+  if (!state.overview) {
+    return;
+  }
+  state.overview.generated_at = event.generated_at;
+  state.overview.queues = event.queues;
+  state.queueTotal =
+    event.queues.find((queue) => queue.key === state.activeQueue)?.count ?? state.queueTotal;
+  Object.assign(state.overview.headline, event.headline);
+  event.changes.forEach(applyItemChange);
+  state.overview.recent_activity = state.overview.recent_activity.slice(0, RECENT_LIMIT);
+
+  renderLiveStatus();
+  renderHeroMetrics();
+  renderQueueBars();
+  renderRecentFeed();
+  renderQueueTabs();
+  await syncSelection();
+  renderQueueList();
+  renderPreview();
+  scheduleReconcile();
+}
+
+function connectLiveUpdates() {
+  if (!window.EventSource || state.stream) {
+    return;
+  }
+  const stream = new EventSource("/api/events");
+  let connectedBefore = false;
+  state.stream = stream;
+
+  stream.addEventListener("ready", () => {
+    state.live = true;
+    renderLiveStatus();
+    if (connectedBefore) {
+      // Changes made while the connection was down were never streamed
+      runSafely(refreshAll);
+    }
+    connectedBefore = true;
+  });
+  stream.addEventListener("vault", (message) =>
+    runSafely(() => applyVaultEvent(JSON.parse(message.data)))
+  );
+  stream.addEventListener("services", (message) => {
+    if (state.overview) {
+      state.overview.services = JSON.parse(message.data);
+      renderServices();
+    }
+  });
+  stream.addEventListener("resync", () => runSafely(refreshAll));
+  stream.addEventListener("error", () => {
+    state.live = false;
+    if (stream.readyState === EventSource.CLOSED) {
+      // The server refused the stream (no live index); polling takes over
+      state.stream = null;
+    }
+    renderLiveStatus();
+  });
+}
+
+function disconnectLiveUpdates() {
+  state.stream?.close();
+  state.stream = null;
+  state.live = false;
+}
+
 async function moveSelected(target) {
   if (!state.selected) {
     showToast("Select an item first.");
@@ -525,6 +660,12 @@ async function boot() {
   nodes.autoRefreshButton.dataset.busySafe = "true";
   nodes.autoRefreshButton.addEventListener("click", () => {
     state.autoRefresh = !state.autoRefresh;
+    if (state.autoRefresh) {
+      connectLiveUpdates();
+      runSafely(refreshAll);
+    } else {
+      disconnectLiveUpdates();
+    }
     renderLiveStatus();
     showToast(`Auto-refresh ${state.autoRefresh ? "enabled" : "paused"}.`);
   });
@@ -563,8 +704,11 @@ async function boot() {
   nodes.queueFilter.addEventListener("input", renderQueueList);
   nodes.captureForm.addEventListener("submit", (event) => runSafely(() => submitCapture(event)));
 
+  connectLiveUpdates();
+
+  // Fallback for browsers or servers without live updates
   window.setInterval(async () => {
-    if (!state.autoRefresh || document.hidden) {
+    if (!state.autoRefresh || state.live || document.hidden) {
       return;
     }
     try {
@@ -0,0 +1,260 @@
+"""In-memory index of vault queue items for the control center."""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+BRIEFINGS_DIR = "Briefings"
+
+
+class VaultIndex:
+    """Queue membership and mtimes for every vault item, kept current by filesystem events.
+
+    ``build`` scans each queue directory once (one ``stat`` per file).
+    Item summaries come from ``reader(path, queue_key)`` and are parsed
+    lazily, on first use, then reused until an event for that file arrives.
+    Without ``start`` the index is a one-off snapshot; with it, a watchdog
+    observer feeds ``refresh`` so counts, metrics and listings are served
+    from memory. Listeners registered with ``subscribe`` receive one change
+    batch per ``refresh`` call that altered the index.
+    """
+
+    def __init__(self, vault: Path, queue_dirs: dict[str, str], reader: Callable[[Path, str], dict[str, Any]]):
+        self.vault = Path(vault)
+        self.queue_dirs = dict(queue_dirs)
+        self.reader = reader
+        self._queue_by_dir = {self.vault / folder: key for key, folder in self.queue_dirs.items()}
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, list]] = {key: {} for key in self.queue_dirs}  # name -> [mtime, summary]
+        self._briefings: set[str] = set()
+        self._observer = None
+        self._listeners: list[Callable[[dict[str, Any]], None]] = []
+        self.version = 0
+
+    # Building and watching
+
+    def build(self) -> "VaultIndex":
+        entries = {key: self._scan(self.vault / folder) for key, folder in self.queue_dirs.items()}
+        briefings = {
+            name for name in self._scan(self.vault / BRIEFINGS_DIR) if name.endswith("_briefing.md")
+        }
+        with self._lock:
+            self._entries = entries
+            self._briefings = briefings
+            self.version += 1
+        return self
+
+    @staticmethod
+    def _scan(directory: Path) -> dict[str, list]:
+        found = {}
+        try:
+            with os.scandir(directory) as listing:
+                for entry in listing:
+                    if entry.name.endswith(".md") and entry.is_file():
+                        found[entry.name] = [entry.stat().st_mtime, None]
+        except FileNotFoundError:
+            pass
+        return found
+
+    def start(self) -> bool:
+        """Watch the queue and briefing folders; returns False if watchdog is unavailable"""
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError as exc:
+            logger.warning(f"watchdog unavailable, vault index will not track changes: {exc}")
+            return False
+
+        index = self
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.event_type in ("opened", "closed", "closed_no_write"):
+                    return
+                raws = (event.src_path, getattr(event, "dest_path", ""))
+                index.refresh(*(Path(os.fsdecode(raw)) for raw in raws if raw))
+
+        observer = Observer()
+        for directory in [*self._queue_by_dir, self.vault / BRIEFINGS_DIR]:
+            directory.mkdir(parents=True, exist_ok=True)
+            observer.schedule(Handler(), str(directory), recursive=False)
+        observer.daemon = True
+        observer.start()
+        self._observer = observer
+        return True
+
+    def stop(self) -> None:
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=2)
+            self._observer = None
+
+    def subscribe(self, listener: Callable[[dict[str, Any]], None]) -> Callable[[], None]:
+        """Call ``listener(batch)`` after every change; returns a function that unsubscribes.
+
+        A batch is ``{"version", "changes", "counts", "briefings"}`` where each
+        change is ``{"kind": "added" | "updated" | "removed", "queue", "filename"}``,
+        ``{"kind": "moved", "from", "queue", "filename"}`` when one call saw a
+        file leave one queue and arrive in another, or ``{"kind": "briefings"}``.
+        Listeners run on the thread that called ``refresh``.
+        """
+        with self._lock:
+            self._listeners.append(listener)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+
+        return unsubscribe
+
+    def refresh(self, *paths: Path) -> list[dict[str, Any]]:
+        """Re-stat files after an event (or after the server wrote them itself) and notify listeners"""
+        stats = [(Path(path), self._stat(Path(path))) for path in paths if Path(path).name.endswith(".md")]
+        with self._lock:
+            changes = [change for path, mtime in stats if (change := self._apply(path, mtime))]
+            if not changes:
+                return []
+            changes = self._pair_moves(changes)
+            batch = {
+                "version": self.version,
+                "changes": changes,
+                "counts": {key: len(entries) for key, entries in self._entries.items()},
+                "briefings": len(self._briefings),
+            }
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(batch)
+            except Exception as exc:
+                logger.warning(f"Vault index listener failed: {exc}")
+        return changes
+
+    @staticmethod
+    def _stat(path: Path) -> float | None:
+        try:
+            return path.stat().st_mtime if path.is_file() else None
+        except OSError:
+            return None
+
+    def _apply(self, path: Path, mtime: float | None) -> dict[str, Any] | None:
+        """Update one entry (lock held) and describe what changed, if anything"""
+        if path.parent == self.vault / BRIEFINGS_DIR:
+            if not path.name.endswith("_briefing.md"):
+                return None
+            before = len(self._briefings)
+            if mtime is None:
+                self._briefings.discard(path.name)
+            else:
+                self._briefings.add(path.name)
+            if len(self._briefings) == before:
+                return None
+            self.version += 1
+            return {"kind": "briefings"}
+
+        queue_key = self._queue_by_dir.get(path.parent)
+        if queue_key is None:
+            return None
+        entries = self._entries[queue_key]
+        current = entries.get(path.name)
+        change = {"queue": queue_key, "filename": path.name}
+        if mtime is None:
+            if entries.pop(path.name, None) is None:
+                return None
+            self.version += 1
+            return {"kind": "removed", **change}
+        if current is None or current[0] != mtime or current[1] is not None:
+            entries[path.name] = [mtime, None]
+            self.version += 1
+            if current is None:
+                return {"kind": "added", **change}
+            if current[0] != mtime:
+                return {"kind": "updated", **change}
+        # Same mtime: the cached summary was dropped in case the write fell
+        # inside the filesystem's timestamp resolution, but nothing to announce
+        return None
+
+    @staticmethod
+    def _pair_moves(changes: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        removed = {change["filename"]: change for change in changes if change["kind"] == "removed"}
+        paired = []
+        for change in changes:
+            source = removed.get(change.get("filename")) if change["kind"] == "added" else None
+            if source is not None and source["queue"] != change["queue"]:
+                paired.append(
+                    {"kind": "moved", "from": source["queue"], "queue": change["queue"], "filename": change["filename"]}
+                )
+                removed.pop(change["filename"])
+            else:
+                paired.append(change)
+        return [change for change in paired if change["kind"] != "removed" or change["filename"] in removed]
+
+    # Reads
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            return {key: len(entries) for key, entries in self._entries.items()}
+
+    def mtimes(self, queue_key: str) -> list[tuple[str, float]]:
+        """[(filename, mtime)] for one queue"""
+        with self._lock:
+            return [(name, entry[0]) for name, entry in self._entries[queue_key].items()]
+
+    def briefing_count(self) -> int:
+        with self._lock:
+            return len(self._briefings)
+
+    def newest(self, queue_keys: Iterable[str], limit: int) -> list[tuple[float, str, str]]:
+        """[(mtime, queue_key, filename)] of the ``limit`` most recently modified items"""
+        return heapq.nlargest(limit, self._candidates(queue_keys))
+
+    def oldest(self, queue_keys: Iterable[str], limit: int) -> list[tuple[float, str, str]]:
+        return heapq.nsmallest(limit, self._candidates(queue_keys))
+
+    def older_than(
+        self, queue_key: str, before: tuple[float, str] | None = None, limit: int | None = None
+    ) -> list[tuple[float, str, str]]:
+        """[(mtime, queue_key, filename)] newest first, strictly older than ``before`` = (mtime, filename).
+
+        With ``limit`` only that many entries are selected; without it the
+        whole remainder of the queue is sorted (for filtered scans).
+        """
+        candidates = self._candidates([queue_key])
+        if before is not None:
+            candidates = [entry for entry in candidates if (entry[0], entry[2]) < before]
+        if limit is not None:
+            return heapq.nlargest(limit, candidates)
+        return sorted(candidates, reverse=True)
+
+    def _candidates(self, queue_keys):
+        with self._lock:
+            return [
+                (entry[0], queue_key, name)
+                for queue_key in queue_keys
+                for name, entry in self._entries[queue_key].items()
+            ]
+
+    def summary(self, queue_key: str, filename: str) -> tuple[float, dict[str, Any]] | None:
+        """(mtime, reader summary) for one item, parsing it only if it changed since last time"""
+        with self._lock:
+            entry = self._entries[queue_key].get(filename)
+            if entry is None:
+                return None
+            mtime, summary = entry
+        if summary is None:
+            try:
+                summary = self.reader(self.vault / self.queue_dirs[queue_key] / filename, queue_key)
+            except OSError:
+                return None
+            with self._lock:
+                # An event may have replaced the entry while we were reading
+                if self._entries[queue_key].get(filename) is entry:
+                    entry[1] = summary
+        return mtime, summary
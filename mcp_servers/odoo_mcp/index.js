@@ -22,7 +22,6 @@ const ODOO_PASSWORD = process.env.ODOO_PASSWORD || 'admin';
 // Odoo JSON-RPC endpoint
 const ENDPOINT = `${ODOO_URL}/jsonrpc`;
 
-let sessionId = null;
 let userId = null;
 
 // ============================================================================
@@ -110,6 +109,36 @@ const tools = [
       required: ['amount', 'description', 'account', 'transaction_type']
     }
   },
+  {
+    name: 'create_invoices',
+    description: 'Create several customer invoices with one partner lookup and one account.move create',
+    inputSchema: {
+      type: 'object',
+      properties: {
+        invoices: {
+          type: 'array',
+          description: 'create_invoice inputs, each with an optional unique `ref`; results are returned in the same order',
+          items: { type: 'object' }
+        }
+      },
+      required: ['invoices']
+    }
+  },
+  {
+    name: 'log_transactions',
+    description: 'Log several journal entries with one account.move create',
+    inputSchema: {
+      type: 'object',
+      properties: {
+        transactions: {
+          type: 'array',
+          description: 'log_transaction inputs, each with an optional unique `ref`; results are returned in the same order',
+          items: { type: 'object' }
+        }
+      },
+      required: ['transactions']
+    }
+  },
   {
     name: 'get_accounts',
     description: 'Fetch list of accounts (chart of accounts) from Odoo',
@@ -223,7 +252,8 @@ async function call(service, method, args, kwargs = {}) {
 
 async function authenticate() {
   try {
-    if (sessionId && userId) return;
+    // Long-lived adapters (see utils/odoo_adapter.py) log in once per process
+    if (userId) return;
 
     // Odoo authentication via JSON-RPC
     const result = await call('common', 'login', [ODOO_DB, ODOO_USERNAME, ODOO_PASSWORD]);
@@ -244,11 +274,82 @@ async function authenticate() {
 // TOOL IMPLEMENTATIONS
 // ============================================================================
 
+// Moves already created for these references. The orchestrator passes the
+// approved file's name as `ref`, so a create retried after an ambiguous failure
+// (a timeout or a reply lost after Odoo committed) returns the existing record
+// instead of creating it twice.
+async function existingMoves(refs) {
+  const wanted = [...new Set(refs.filter(Boolean))];
+  const existing = new Map();
+  if (wanted.length === 0) {
+    return existing;
+  }
+  const moves = await call('object', 'execute_kw', [
+    ODOO_DB, userId, ODOO_PASSWORD, 'account.move', 'search_read',
+    [[['ref', 'in', wanted]]], { fields: ['id', 'ref', 'partner_id'], order: 'id' }
+  ]);
+  for (const move of moves) {
+    if (!existing.has(move.ref)) {
+      existing.set(move.ref, move);
+    }
+  }
+  return existing;
+}
+
+function moveId(field) {
+  // many2one fields come back as [id, display_name]
+  return Array.isArray(field) ? field[0] : field;
+}
+
+function invoiceValues(input, partnerId) {
+  const { amount, description, due_date, invoice_line_items, ref } = input;
+
+  // Prepare invoice lines
+  const invoiceLines = [];
+  if (invoice_line_items && invoice_line_items.length > 0) {
+    for (const item of invoice_line_items) {
+      invoiceLines.push([0, 0, {
+        name: item.name,
+        quantity: item.quantity || 1,
+        price_unit: item.price_unit || (amount / invoice_line_items.length)
+      }]);
+    }
+  } else {
+    // Single line item
+    invoiceLines.push([0, 0, {
+      name: description,
+      quantity: 1,
+      price_unit: amount
+    }]);
+  }
+
+  return {
+    move_type: 'out_invoice',
+    partner_id: partnerId,
+    invoice_line_ids: invoiceLines,
+    invoice_date: new Date().toISOString().split('T')[0],
+    invoice_date_due: due_date || new Date(Date.now() + 30 * 24 * 60 * 60 * 1000).toISOString().split('T')[0],
+    state: 'draft',
+    ...(ref ? { ref } : {})
+  };
+}
+
 async function createInvoice(input) {
   await authenticate();
 
   try {
-    const { contact_name, amount, description, due_date, invoice_line_items } = input;
+    const { contact_name, amount, ref } = input;
+
+    const prior = (await existingMoves([ref])).get(ref);
+    if (prior) {
+      return {
+        status: 'created',
+        invoice_id: prior.id,
+        partner_id: moveId(prior.partner_id),
+        amount: amount,
+        message: `Invoice ${prior.id} already exists for ${ref}`
+      };
+    }
 
     // Find or create partner
     let partnerId;
@@ -267,34 +368,8 @@ async function createInvoice(input) {
       ]);
     }
 
-    // Prepare invoice lines
-    const invoiceLines = [];
-    if (invoice_line_items && invoice_line_items.length > 0) {
-      for (const item of invoice_line_items) {
-        invoiceLines.push([0, 0, {
-          name: item.name,
-          quantity: item.quantity || 1,
-          price_unit: item.price_unit || (amount / invoice_line_items.length)
-        }]);
-      }
-    } else {
-      // Single line item
-      invoiceLines.push([0, 0, {
-        name: description,
-        quantity: 1,
-        price_unit: amount
-      }]);
-    }
-
     // Create invoice
-    const invoiceData = {
-      move_type: 'out_invoice',
-      partner_id: partnerId,
-      invoice_line_ids: invoiceLines,
-      invoice_date: new Date().toISOString().split('T')[0],
-      invoice_date_due: due_date || new Date(Date.now() + 30 * 24 * 60 * 60 * 1000).toISOString().split('T')[0],
-      state: 'draft'
-    };
+    const invoiceData = invoiceValues(input, partnerId);
 
     const invoiceId = await call('object', 'execute_kw', [
       ODOO_DB, userId, ODOO_PASSWORD, 'account.move', 'create',
@@ -374,34 +449,42 @@ async function createBill(input) {
   }
 }
 
+function entryValues(input) {
+  const { amount, description, date, ref } = input;
+  return {
+    move_type: 'entry',
+    journal_id: 1, // General journal (ID=1 in most Odoo instances)
+    line_ids: [[0, 0, {
+      name: description,
+      account_id: 1, // Placeholder - should search actual account
+      debit: amount > 0 ? amount : 0,
+      credit: amount < 0 ? Math.abs(amount) : 0
+    }]],
+    date: date || new Date().toISOString().split('T')[0],
+    state: 'draft',
+    ...(ref ? { ref } : {})
+  };
+}
+
 async function logTransaction(input) {
   await authenticate();
 
   try {
-    const { amount, description, account, transaction_type, date, bank_account_code } = input;
+    const { amount, description, account, ref } = input;
 
-    // Map transaction type to account type
-    const accountType = {
-      'BANK': 'asset',
-      'EXPENSE': 'expense',
-      'REVENUE': 'revenue',
-      'PAYABLE': 'liability',
-      'RECEIVABLE': 'asset'
-    }[transaction_type] || 'other';
+    const prior = (await existingMoves([ref])).get(ref);
+    if (prior) {
+      return {
+        status: 'logged',
+        transaction_id: prior.id,
+        amount: amount,
+        account: account,
+        message: `Transaction ${prior.id} already logged for ${ref}`
+      };
+    }
 
     // Create journal entry
-    const entryData = {
-      move_type: 'entry',
-      journal_id: 1, // General journal (ID=1 in most Odoo instances)
-      line_ids: [[0, 0, {
-        name: description,
-        account_id: 1, // Placeholder - should search actual account
-        debit: amount > 0 ? amount : 0,
-        credit: amount < 0 ? Math.abs(amount) : 0
-      }]],
-      date: date || new Date().toISOString().split('T')[0],
-      state: 'draft'
-    };
+    const entryData = entryValues(input);
 
     const entryId = await call('object', 'execute_kw', [
       ODOO_DB, userId, ODOO_PASSWORD, 'account.move', 'create',
@@ -424,6 +507,139 @@ async function logTransaction(input) {
   }
 }
 
+// ----------------------------------------------------------------------------
+// Batch tools: Odoo's /jsonrpc endpoint takes one call per HTTP request, so a
+// batch is one multi-record create (Odoo's create accepts a list of values).
+// create is atomic, so if any record is rejected nothing was written and the
+// items are retried one by one to pin the failure on the offending item. Items
+// whose `ref` already has a move (an earlier call that timed out after Odoo
+// committed) are returned as they are, in the batch and in the retry.
+// ----------------------------------------------------------------------------
+
+async function findOrCreatePartners(names) {
+  const unique = [...new Set(names)];
+  const partnerIds = new Map();
+
+  const partners = await call('object', 'execute_kw', [
+    ODOO_DB, userId, ODOO_PASSWORD, 'res.partner', 'search_read',
+    [[['name', 'in', unique]]], { fields: ['id', 'name'], order: 'id' }
+  ]);
+  for (const partner of partners) {
+    if (!partnerIds.has(partner.name)) {
+      partnerIds.set(partner.name, partner.id);
+    }
+  }
+
+  const missing = unique.filter(name => !partnerIds.has(name));
+  if (missing.length > 0) {
+    const created = await call('object', 'execute_kw', [
+      ODOO_DB, userId, ODOO_PASSWORD, 'res.partner', 'create',
+      [missing.map(name => ({ name, is_company: true }))]
+    ]);
+    missing.forEach((name, index) => partnerIds.set(name, created[index]));
+  }
+  return partnerIds;
+}
+
+async function createInvoices(input) {
+  await authenticate();
+
+  const invoices = (input && input.invoices) || [];
+  if (invoices.length === 0) {
+    return { status: 'ok', results: [] };
+  }
+
+  try {
+    const existing = await existingMoves(invoices.map(invoice => invoice.ref));
+    const fresh = invoices.filter(invoice => !existing.has(invoice.ref));
+    const partnerIds = fresh.length > 0
+      ? await findOrCreatePartners(fresh.map(invoice => invoice.contact_name))
+      : new Map();
+    const invoiceIds = fresh.length > 0
+      ? await call('object', 'execute_kw', [
+        ODOO_DB, userId, ODOO_PASSWORD, 'account.move', 'create',
+        [fresh.map(invoice => invoiceValues(invoice, partnerIds.get(invoice.contact_name)))]
+      ])
+      : [];
+    const created = new Map(fresh.map((invoice, index) => [invoice, invoiceIds[index]]));
+
+    return {
+      status: 'ok',
+      results: invoices.map(invoice => {
+        const prior = existing.get(invoice.ref);
+        if (prior) {
+          return {
+            status: 'created',
+            invoice_id: prior.id,
+            partner_id: moveId(prior.partner_id),
+            amount: invoice.amount,
+            message: `Invoice ${prior.id} already exists for ${invoice.ref}`
+          };
+        }
+        return {
+          status: 'created',
+          invoice_id: created.get(invoice),
+          partner_id: partnerIds.get(invoice.contact_name),
+          amount: invoice.amount,
+          message: `Invoice ${created.get(invoice)} created for ${invoice.contact_name}`
+        };
+      })
+    };
+  } catch (error) {
+    console.error(`Batch invoice create failed, retrying one by one: ${error.message}`);
+    const results = [];
+    for (const invoice of invoices) {
+      results.push(await createInvoice(invoice));
+    }
+    return { status: 'ok', results };
+  }
+}
+
+async function logTransactions(input) {
+  await authenticate();
+
+  const transactions = (input && input.transactions) || [];
+  if (transactions.length === 0) {
+    return { status: 'ok', results: [] };
+  }
+
+  try {
+    const existing = await existingMoves(transactions.map(transaction => transaction.ref));
+    const fresh = transactions.filter(transaction => !existing.has(transaction.ref));
+    const entryIds = fresh.length > 0
+      ? await call('object', 'execute_kw', [
+        ODOO_DB, userId, ODOO_PASSWORD, 'account.move', 'create',
+        [fresh.map(entryValues)]
+      ])
+      : [];
+    const created = new Map(fresh.map((transaction, index) => [transaction, entryIds[index]]));
+
+    return {
+      status: 'ok',
+      results: transactions.map(transaction => {
+        const prior = existing.get(transaction.ref);
+        const entryId = prior ? prior.id : created.get(transaction);
+        return {
+          status: 'logged',
+          transaction_id: entryId,
+          amount: transaction.amount,
+          account: transaction.account,
+          message: prior
+            ? `Transaction ${entryId} already logged for ${transaction.ref}`
+            : `Transaction ${entryId} logged for ${transaction.description}`
+        };
+      })
+    };
+  } catch (error) {
+    console.error(`Batch transaction log failed, retrying one by one: ${error.message}`);
+    const results = [];
+    for (const transaction of transactions) {
+      results.push(await logTransaction(transaction));
+    }
+    return { status: 'ok', results };
+  }
+}
+
 async function getAccounts(input) {
   await authenticate();
 
@@ -581,6 +797,10 @@ async function processTool(toolName, input) {
       return await createBill(input);
     case 'log_transaction':
       return await logTransaction(input);
+    case 'create_invoices':
+      return await createInvoices(input);
+    case 'log_transactions':
+      return await logTransactions(input);
     case 'get_accounts':
       return await getAccounts(input);
     case 'get_invoices':
@@ -589,6 +809,8 @@ async function processTool(toolName, input) {
       return await getBalance(input);
     case 'get_profit_loss':
       return await getProfitLoss(input);
+    case 'ping':
+      return { status: 'ok', authenticated: Boolean(userId) };
     default:
       return {
         status: 'error',
@@ -602,16 +824,20 @@ async function processTool(toolName, input) {
 // ============================================================================
 
 async function handleStdioRequest(line) {
+  // Echo the caller's request id so pooled callers can match responses
+  let id;
   try {
     const request = JSON.parse(line);
     const { tool, input } = request;
+    id = request.id;
 
     const result = await processTool(tool, input);
-    console.log(JSON.stringify(result));
+    console.log(JSON.stringify(id === undefined ? result : { ...result, id }));
   } catch (error) {
     console.log(JSON.stringify({
       status: 'error',
-      error: error.message
+      error: error.message,
+      ...(id === undefined ? {} : { id })
     }));
   }
 }
@@ -7,6 +7,9 @@ from pathlib import Path
 import uvicorn
 
 ROOT = Path(__file__).resolve().parents[1]
+SCRIPTS_DIR = Path(__file__).resolve().parent
+# scripts/watchdog.py would otherwise shadow the watchdog package used by the vault index
+sys.path[:] = [path for path in sys.path if not path or Path(path).resolve() != SCRIPTS_DIR]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
@@ -1,9 +1,15 @@
+import asyncio
+import json
+import os
+import threading
+import time
 from pathlib import Path
 
 import yaml
 from fastapi.testclient import TestClient
 
 from control_center import server
+from control_center.vault_index import VaultIndex
 
 
 def _read_frontmatter(path: Path) -> tuple[dict, str]:
@@ -175,3 +181,176 @@ def test_assistant_brief_surfaces_hotspots_and_stale_items(monkeypatch, tmp_path
     assert any("execution" in hotspot.lower() for hotspot in brief["hotspots"])
     assert brief["stale_items"][0]["title"] in {"Waiting on founder", "Ready to send"}
     assert "recommended_actions" in brief
+
+
+def _wait_for(condition, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return condition()
+
+
+def test_live_index_tracks_external_changes(monkeypatch, tmp_path):
+    vault = tmp_path / "vault"
+    monkeypatch.setenv("VAULT_PATH", str(vault))
+    server.ensure_vault_structure(vault)
+    (vault / "Needs_Action" / "EMAIL_001.md").write_text("---\ntitle: First\n---\n\nBody", encoding="utf-8")
+
+    with TestClient(server.app) as client:
+        index = server.LIVE_INDEXES[str(vault)]
+        assert client.get("/api/overview").json()["queues"][0]["count"] == 1
+
+        (vault / "Needs_Action" / "EMAIL_002.md").write_text("---\ntitle: Second\n---\n\nBody", encoding="utf-8")
+        (vault / "Needs_Action" / "EMAIL_001.md").rename(vault / "Done" / "EMAIL_001.md")
+        assert _wait_for(lambda: index.counts()["done"] == 1 and index.counts()["needs_action"] == 1)
+
+        queue = client.get("/api/queues/needs_action").json()
+        assert [item["title"] for item in queue["items"]] == ["Second"]
+
+    assert str(vault) not in server.LIVE_INDEXES
+
+
+def test_index_parses_each_item_once_until_it_changes(monkeypatch, tmp_path):
+    vault = tmp_path / "vault"
+    server.ensure_vault_structure(vault)
+    item = vault / "Pending_Approval" / "EMAIL_001.md"
+    item.write_text("---\ntitle: Draft\n---\n\nBody", encoding="utf-8")
+    reads = []
+
+    def reader(path, queue_key):
+        reads.append(path.name)
+        return server.read_item_summary(path, queue_key)
+
+    index = VaultIndex(vault, server.QUEUE_DIRS, reader).build()
+    monkeypatch.setitem(server.LIVE_INDEXES, str(vault), index)
+    for _ in range(3):
+        server.assistant_brief(vault, services=[], setup=[], recommendations=[])
+        server.recent_activity(vault)
+    assert reads == ["EMAIL_001.md"]
+
+    item.write_text("---\ntitle: Draft v2\n---\n\nBody", encoding="utf-8")
+    index.refresh(item)
+    assert server.recent_activity(vault)[0]["title"] == "Draft v2"
+    assert reads == ["EMAIL_001.md", "EMAIL_001.md"]
+
+
+def test_index_reports_server_moves_as_one_change(tmp_path):
+    vault = tmp_path / "vault"
+    server.ensure_vault_structure(vault)
+    source = vault / "Pending_Approval" / "EMAIL_001.md"
+    source.write_text("---\ntitle: Draft\n---\n\nBody", encoding="utf-8")
+    index = VaultIndex(vault, server.QUEUE_DIRS, server.read_item_summary).build()
+    batches = []
+    unsubscribe = index.subscribe(batches.append)
+
+    destination = vault / "Approved" / source.name
+    source.rename(destination)
+    index.refresh(source, destination)
+    index.refresh(destination)  # the watchdog echo of our own write changes nothing
+
+    assert len(batches) == 1
+    assert batches[0]["changes"] == [
+        {"kind": "moved", "from": "pending_approval", "queue": "approved", "filename": "EMAIL_001.md"}
+    ]
+    assert batches[0]["counts"]["approved"] == 1 and batches[0]["counts"]["pending_approval"] == 0
+
+    unsubscribe()
+    destination.unlink()
+    index.refresh(destination)
+    assert len(batches) == 1
+
+
+def test_event_stream_sends_item_diffs(monkeypatch, tmp_path):
+    vault = tmp_path / "vault"
+    server.ensure_vault_structure(vault)
+    index = VaultIndex(vault, server.QUEUE_DIRS, server.read_item_summary).build()
+    monkeypatch.setitem(server.LIVE_INDEXES, str(vault), index)
+    monkeypatch.setattr(server, "service_status", lambda: [])
+
+    async def first_diff():
+        stream = server.vault_event_stream(vault, index, keepalive=5)
+        try:
+            assert (await anext(stream)).startswith("event: ready\n")
+            item = vault / "Needs_Action" / "EMAIL_001.md"
+            item.write_text("---\ntitle: New lead\npriority: high\n---\n\nBody", encoding="utf-8")
+            # Listeners fire on the watchdog thread in production
+            threading.Thread(target=index.refresh, args=(item,)).start()
+            return await asyncio.wait_for(anext(stream), 5)
+        finally:
+            await stream.aclose()
+
+    message = asyncio.run(first_diff())
+    event, data = message.strip().split("\n")
+    payload = json.loads(data.removeprefix("data: "))
+
+    assert event == "event: vault"
+    assert payload["changes"][0]["kind"] == "added"
+    assert payload["changes"][0]["item"]["title"] == "New lead"
+    assert payload["headline"]["backlog"] == 1
+    assert {queue["key"]: queue["count"] for queue in payload["queues"]}["needs_action"] == 1
+
+
+def test_api_queue_pages_with_cursor_and_filters(monkeypatch, tmp_path):
+    vault = tmp_path / "vault"
+    monkeypatch.setenv("VAULT_PATH", str(vault))
+    server.ensure_vault_structure(vault)
+    for number in range(5):
+        item = vault / "Done" / f"EMAIL_{number}.md"
+        owner = "ana@example.com" if number % 2 else "bo@example.com"
+        item.write_text(
+            f"---\ntype: email\nfrom: {owner}\npriority: {'high' if number < 2 else 'low'}\n---\n\nBody {number}",
+            encoding="utf-8",
+        )
+        os.utime(item, (1_700_000_000 + number, 1_700_000_000 + number))
+
+    with TestClient(server.app) as client:
+        first = client.get("/api/queues/done", params={"limit": 2}).json()
+        second = client.get("/api/queues/done", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+        last = client.get("/api/queues/done", params={"limit": 2, "cursor": second["next_cursor"]}).json()
+        filtered = client.get("/api/queues/done", params={"owner": "ANA", "priority": "low"}).json()
+        bad = client.get("/api/queues/done", params={"cursor": "not-a-cursor"})
+
+    assert first["total"] == 5
+    assert [item["filename"] for item in first["items"]] == ["EMAIL_4.md", "EMAIL_3.md"]
+    assert [item["filename"] for item in second["items"]] == ["EMAIL_2.md", "EMAIL_1.md"]
+    assert [item["filename"] for item in last["items"]] == ["EMAIL_0.md"]
+    assert last["next_cursor"] is None
+    assert [item["filename"] for item in filtered["items"]] == ["EMAIL_3.md"]
+    assert bad.status_code == 400
+
+
+def test_health_stays_fast_while_overviews_are_computed(monkeypatch, tmp_path):
+    monkeypatch.setenv("VAULT_PATH", str(tmp_path / "vault"))
+    started = threading.Semaphore(0)
+
+    def slow_overview(vault):
+        started.release()
+        time.sleep(0.5)  # stands in for a cold scan of a large vault
+        return {"vault_path": str(vault)}
+
+    monkeypatch.setattr(server, "overview_payload", slow_overview)
+
+    with TestClient(server.app) as client:
+        results = []
+        overviews = [
+            threading.Thread(target=lambda: results.append(client.get("/api/overview").status_code))
+            for _ in range(6)
+        ]
+        for thread in overviews:
+            thread.start()
+        for _ in overviews:
+            assert started.acquire(timeout=2)
+
+        latencies = []
+        for _ in range(10):
+            began = time.perf_counter()
+            assert client.get("/api/health").status_code == 200
+            latencies.append(time.perf_counter() - began)
+        for thread in overviews:
+            thread.join()
+
+    assert results == [200] * 6
+    # Inline on the event loop, each health check would wait out a 0.5 s overview
+    assert max(latencies) < 0.2
@@ -0,0 +1,60 @@
+from utils.dedup_store import DedupStore, SqliteDedupStore, open_dedup_store
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_memory_store_evicts_least_recently_used_and_expires():
+    clock = FakeClock()
+    store = DedupStore(max_entries=2, ttl_seconds=10, clock=clock)
+    store.add("EMAIL_1.md")
+    store.add("EMAIL_2.md")
+    assert "EMAIL_1.md" in store  # touch so EMAIL_2 becomes least recent
+    store.add("EMAIL_3.md")
+
+    assert len(store) == 2
+    assert "EMAIL_2.md" not in store
+    assert store.evictions == 1
+
+    clock.now += 11
+    assert "EMAIL_1.md" not in store
+
+
+def test_sqlite_store_survives_restart_and_memory_eviction(tmp_path):
+    path = tmp_path / ".dedup_state.sqlite3"
+    store = SqliteDedupStore(path, "executed", max_entries=1)
+    store.add("EMAIL_DRAFT_1.md")
+    store.add(("WHATSAPP_1.md", "wamid.1"))
+    # Evicted from the in-memory LRU but still found on disk
+    assert "EMAIL_DRAFT_1.md" in store
+    store.discard("EMAIL_DRAFT_1.md")
+    store.close()
+
+    reopened = SqliteDedupStore(path, "executed", max_entries=1)
+    assert ("WHATSAPP_1.md", "wamid.1") in reopened
+    assert "EMAIL_DRAFT_1.md" not in reopened
+    assert "WHATSAPP_1.md" not in SqliteDedupStore(path, "processed")
+    reopened.close()
+
+
+def test_sqlite_store_prunes_disk_to_its_cap(tmp_path, monkeypatch):
+    monkeypatch.setattr(SqliteDedupStore, "PRUNE_EVERY", 10)
+    store = SqliteDedupStore(tmp_path / "dedup.sqlite3", "processed", max_entries=5, max_disk_entries=20)
+    for index in range(100):
+        store.add(f"EMAIL_{index}.md")
+
+    assert store.disk_entries() <= 20
+    assert len(store) == 5
+    store.close()
+
+
+def test_open_dedup_store_memory_backend_ignores_path(tmp_path):
+    store = open_dedup_store("processed", path=tmp_path / "dedup.sqlite3", backend="memory")
+    store.add("EMAIL_1.md")
+    assert "EMAIL_1.md" in store
+    assert not (tmp_path / "dedup.sqlite3").exists()
@@ -0,0 +1,98 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from utils.email_classifier import BotClassifier, parse_batch_verdicts
+
+
+class FakeOpenAI:
+    """Answers batch prompts with a JSON array and single prompts with HUMAN/BOT"""
+
+    def __init__(self, batch_reply=None):
+        self.calls = []
+        self.max_tokens = []
+        self.batch_reply = batch_reply
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, temperature, max_tokens):
+        user = messages[1]["content"]
+        self.calls.append(user)
+        self.max_tokens.append(max_tokens)
+        if user.startswith("Classify these emails:"):
+            emails = json.loads(user.split("\n", 1)[1])
+            text = self.batch_reply(emails) if self.batch_reply else json.dumps([
+                {"id": email["id"], "verdict": "BOT" if "newsletter" in email["subject"] else "HUMAN"}
+                for email in emails
+            ])
+        else:
+            text = "BOT" if "newsletter" in user else "HUMAN"
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+
+def emails(count):
+    return [
+        {"id": f"m{index}", "from": f"p{index}@example.com",
+         "subject": "newsletter" if index % 3 == 0 else "lunch?", "body": "hi " * 2000}
+        for index in range(count)
+    ]
+
+
+def test_batches_emails_per_request():
+    client = FakeOpenAI()
+    classifier = BotClassifier(client, batch_size=4)
+
+    verdicts = classifier.classify(emails(10))
+
+    assert verdicts == {f"m{index}": index % 3 != 0 for index in range(10)}
+    # 4 + 4 in batches, the trailing single email uses the one-by-one prompt
+    assert classifier.requests == 3
+    assert len(client.calls) == 3
+
+
+def test_batch_token_budget_fits_a_verdict_per_email():
+    client = FakeOpenAI()
+    classifier = BotClassifier(client, batch_size=10)
+
+    classifier.classify(emails(10))
+
+    # A Gmail-id verdict object costs ~20 tokens; a tighter budget truncates the array
+    assert len(client.max_tokens) == 1
+    assert client.max_tokens[0] >= 32 * 10
+
+
+def test_unparseable_batch_falls_back_to_single_calls():
+    client = FakeOpenAI(batch_reply=lambda _emails: "HUMAN, HUMAN, BOT")
+    classifier = BotClassifier(client, batch_size=3)
+
+    verdicts = classifier.classify(emails(3))
+
+    assert verdicts == {"m0": False, "m1": True, "m2": True}
+    assert classifier.requests == 4
+    assert classifier.fallbacks == 3
+
+
+def test_partial_batch_answer_only_retries_missing_ids():
+    client = FakeOpenAI(batch_reply=lambda batch: json.dumps([{"id": batch[1]["id"], "verdict": "bot"}]))
+    classifier = BotClassifier(client, batch_size=3)
+
+    verdicts = classifier.classify(emails(3))
+
+    assert verdicts["m1"] is False
+    assert classifier.requests == 3  # one batch + two single calls
+
+
+def test_failed_single_call_returns_no_verdict():
+    def create(**_request):
+        raise ConnectionError("API down")
+
+    classifier = BotClassifier(SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create))))
+
+    assert classifier.classify(emails(1)) == {"m0": None}
+
+
+def test_parse_batch_verdicts_tolerates_prose_and_rejects_garbage():
+    text = 'Here you go:\n[{"id": "a", "verdict": "HUMAN"}, {"id": "zzz", "verdict": "BOT"}, "x"]'
+    assert parse_batch_verdicts(text, ["a", "b"]) == {"a": True}
+    with pytest.raises(ValueError):
+        parse_batch_verdicts("HUMAN", ["a"])
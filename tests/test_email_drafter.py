@@ -0,0 +1,145 @@
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from utils import vault_documents
+from utils.email_drafter import EmailDrafter, parse_self_assessed_draft
+
+REPLY_EMAIL = """---
+type: email
+from: client@example.com
+subject: Re: Project timeline
+received: 2026-01-05T10:00:00
+priority: high
+gmail_message_id: abc123
+thread_id: t1
+is_reply: true
+---
+
+## Thread History
+
+**client@example.com**: Can we ship in March?
+
+## Current Message
+
+Any update on the timeline?
+"""
+
+
+class FakeOpenAI:
+    """Routes draft, summary and tone prompts; the draft call waits until the summary has started"""
+
+    def __init__(self, draft_text="Thanks, I'll confirm with Hamza.\n\nBest regards,\n\nHamza Paracha"):
+        self.draft_text = draft_text
+        self.calls = []
+        self.summary_started = threading.Event()
+        self.overlapped = False
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, temperature, max_tokens, **kwargs):
+        user = messages[-1]["content"]
+        if messages[0]["role"] == "system":
+            kind = "draft"
+            self.overlapped = self.summary_started.wait(timeout=2)
+            if "response_format" in kwargs:
+                text = json.dumps({"reply": self.draft_text, "style_check": {
+                    "matches_style": False, "deviations": ["Too formal"], "confidence": 0.4}})
+            else:
+                text = self.draft_text
+        elif user.startswith("Summarize"):
+            kind = "summary"
+            self.summary_started.set()
+            text = "- Client asked about a March ship date"
+        else:
+            kind = "tone"
+            text = json.dumps({"matches_style": True, "deviations": [], "confidence": 0.95})
+        self.calls.append(kind)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+
+def make_drafter(tmp_path, monkeypatch, client, tone_check="separate", style=True):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setenv("EMAIL_TONE_CHECK", tone_check)
+    if style:
+        (tmp_path / "EmailStyle.md").write_text("Casual, short sentences. Sign off with Cheers.", encoding="utf-8")
+    drafter = EmailDrafter(str(tmp_path))
+    drafter.client = client
+    drafter.client_type = "openai"
+    email_file = tmp_path / "EMAIL_1.md"
+    email_file.write_text(REPLY_EMAIL, encoding="utf-8")
+    return drafter, email_file
+
+
+def test_summary_runs_concurrently_with_draft(tmp_path, monkeypatch):
+    client = FakeOpenAI()
+    drafter, email_file = make_drafter(tmp_path, monkeypatch, client)
+
+    draft_path = drafter.draft_reply(email_file)
+
+    assert client.overlapped
+    assert sorted(client.calls) == ["draft", "summary", "tone"]
+    content = draft_path.read_text(encoding="utf-8")
+    assert "Client asked about a March ship date" in content
+    assert "Style Check Warnings" not in content
+
+
+def test_close_shuts_down_the_summary_pool(tmp_path, monkeypatch):
+    drafter, _ = make_drafter(tmp_path, monkeypatch, FakeOpenAI())
+
+    drafter.close()
+
+    with pytest.raises(RuntimeError):
+        drafter.summary_pool.submit(lambda: None)
+
+
+def test_merged_tone_check_skips_the_separate_call(tmp_path, monkeypatch):
+    client = FakeOpenAI()
+    drafter, email_file = make_drafter(tmp_path, monkeypatch, client, tone_check="merged")
+
+    content = drafter.draft_reply(email_file).read_text(encoding="utf-8")
+
+    assert sorted(client.calls) == ["draft", "summary"]
+    assert "Style Check Warnings" in content
+    assert "- Too formal" in content
+    assert "I'll confirm with Hamza." in content
+    assert '"reply"' not in content
+
+
+def test_merged_mode_without_style_guide_drafts_plain_text(tmp_path, monkeypatch):
+    client = FakeOpenAI()
+    drafter, email_file = make_drafter(tmp_path, monkeypatch, client, tone_check="merged", style=False)
+
+    content = drafter.draft_reply(email_file).read_text(encoding="utf-8")
+
+    assert sorted(client.calls) == ["draft", "summary"]
+    assert "Style Check Warnings" not in content
+
+
+def test_parse_self_assessed_draft_normalizes_and_rejects_garbage():
+    reply, tone = parse_self_assessed_draft(json.dumps(
+        {"reply": "Hi", "style_check": {"matches_style": False, "deviations": "tone", "confidence": "2"}}))
+    assert reply == "Hi"
+    assert tone == {"matches_style": False, "deviations": ["tone"], "confidence": 1.0}
+
+    _, tone = parse_self_assessed_draft('{"reply": "Hi"}')
+    assert tone["matches_style"] is True
+
+    for text in ("Hi there", '["Hi"]', '{"reply": ""}'):
+        with pytest.raises(ValueError):
+            parse_self_assessed_draft(text)
+
+
+def test_handbook_and_style_are_not_reread_per_draft(tmp_path, monkeypatch):
+    client = FakeOpenAI()
+    drafter, email_file = make_drafter(tmp_path, monkeypatch, client)
+    (tmp_path / "Company_Handbook.md").write_text("**Known Contacts**:\n- client@example.com\n", encoding="utf-8")
+    drafter.draft_reply(email_file)
+    reads = vault_documents.stats()["reads"]
+
+    second = tmp_path / "EMAIL_2.md"
+    second.write_text(REPLY_EMAIL, encoding="utf-8")
+    drafter.draft_reply(second)
+
+    assert vault_documents.stats()["reads"] == reads
@@ -0,0 +1,85 @@
+import os
+
+from utils import vault_documents
+from utils.email_prefilter import BOT, HUMAN, EmailPrefilter
+
+HANDBOOK = """# Company Handbook
+
+**Known Contacts (Auto-Approve Replies)**:
+- boss@company.com
+- Clients@Company.com
+
+**Response Rules by Email Type**:
+- **Inquiry**: Professional tone
+"""
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_known_contacts_share_the_parsed_handbook(tmp_path):
+    handbook = tmp_path / "Company_Handbook.md"
+    handbook.write_text(HANDBOOK, encoding="utf-8")
+    prefilter = EmailPrefilter(handbook)
+
+    assert prefilter.known_contacts() == {"boss@company.com", "clients@company.com"}
+    assert prefilter.known_contacts() is vault_documents.handbook_rules(handbook)["known_contacts_lower"]
+    assert EmailPrefilter(tmp_path / "missing.md").known_contacts() == frozenset()
+
+
+def test_headers_settle_obvious_cases_without_the_model(tmp_path):
+    handbook = tmp_path / "Company_Handbook.md"
+    handbook.write_text(HANDBOOK, encoding="utf-8")
+    prefilter = EmailPrefilter(handbook)
+
+    cases = [
+        ({"from": "Boss <boss@company.com>", "list-unsubscribe": "<mailto:x>"}, (HUMAN, "known_contact")),
+        ({"from": "shop@example.com", "auto-submitted": "auto-generated"}, (BOT, "auto_submitted")),
+        ({"from": "news@example.com", "precedence": "Bulk"}, (BOT, "bulk_precedence")),
+        ({"from": "deals@example.com", "list-unsubscribe": "<https://example.com/u>"}, (BOT, "mailing_list")),
+        ({"from": "GitHub <no-reply@github.com>"}, (BOT, "noreply_sender")),
+        ({"from": "boss@company.com", "auto-submitted": "auto-replied"}, (BOT, "auto_submitted")),
+        ({"from": "Jane <jane@example.com>", "auto-submitted": "no"}, (None, "ambiguous")),
+        ({"from": "Sam <sam@example.com>", "list-id": "<team.groups.example.com>"}, (None, "ambiguous")),
+    ]
+    for headers, expected in cases:
+        assert prefilter.classify(headers) == expected
+
+    stats = prefilter.stats()
+    assert stats["checked"] == 8
+    assert stats["decided_locally"] == 6
+    assert stats["by_reason"]["ambiguous"] == 2
+
+
+def test_llm_verdict_is_cached_per_sender_until_ttl(tmp_path):
+    clock = FakeClock()
+    prefilter = EmailPrefilter(tmp_path / "none.md", verdict_ttl=60, clock=clock)
+    headers = {"from": "Jane <Jane@Example.com>"}
+
+    assert prefilter.classify(headers) == (None, "ambiguous")
+    prefilter.record_llm(headers, HUMAN, 0.8)
+    assert prefilter.classify({"from": "jane@example.com"}) == (HUMAN, "sender_cache")
+
+    stats = prefilter.stats()
+    assert stats["llm_calls"] == 1
+    assert stats["est_saved_s"] == 0.8
+
+    clock.now = 61
+    assert prefilter.classify(headers) == (None, "ambiguous")
+
+
+def test_known_contacts_reload_when_handbook_changes(tmp_path):
+    handbook = tmp_path / "Company_Handbook.md"
+    handbook.write_text(HANDBOOK, encoding="utf-8")
+    prefilter = EmailPrefilter(handbook)
+    assert prefilter.classify({"from": "new@company.com"})[0] is None
+
+    handbook.write_text(HANDBOOK.replace("- boss@company.com", "- new@company.com"), encoding="utf-8")
+    stat = handbook.stat()
+    os.utime(handbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert prefilter.classify({"from": "new@company.com"}) == (HUMAN, "known_contact")
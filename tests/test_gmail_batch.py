@@ -0,0 +1,301 @@
+import base64
+import json
+import logging
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import pytest
+
+from agents.gmail_watcher import GmailWatcher
+from utils.email_classifier import BotClassifier
+from utils.email_prefilter import EmailPrefilter
+from utils.gmail_batch import GET_BATCH_SIZE, GmailBatchClient
+
+
+class FakeRequest:
+    def __init__(self, service, kind, **kwargs):
+        self.service = service
+        self.kind = kind
+        self.kwargs = kwargs
+
+    def execute(self):
+        self.service.http_calls.append((self.kind, self.kwargs))
+        return self.service.respond(self.kind, self.kwargs)
+
+
+class FakeBatch:
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        self.service.http_calls.append(("batch", {"size": len(self.requests)}))
+        for request_id, request in self.requests:
+            try:
+                response, error = self.service.respond(request.kind, request.kwargs), None
+            except Exception as e:
+                response, error = None, e
+            self.callback(request_id, response, error)
+
+
+class FakeGmailService:
+    """Just enough of googleapiclient's Gmail resource to count HTTP requests"""
+
+    def __init__(self, missing=(), emails=None, history_pages=(), list_pages=None):
+        self.http_calls = []
+        self.missing = set(missing)
+        self.emails = emails or {}
+        self.history_pages = list(history_pages)
+        self.list_pages = list_pages or [{"messages": [{"id": "m1"}, {"id": "m2"}]}]
+
+    def users(self):
+        return self
+
+    def messages(self):
+        return self
+
+    def threads(self):
+        return self
+
+    def history(self):
+        return SimpleNamespace(list=lambda **kwargs: FakeRequest(self, "history", **kwargs))
+
+    def getProfile(self, **kwargs):
+        return FakeRequest(self, "profile", **kwargs)
+
+    def list(self, **kwargs):
+        return FakeRequest(self, "list", **kwargs)
+
+    def get(self, **kwargs):
+        return FakeRequest(self, "get", **kwargs)
+
+    def batchModify(self, **kwargs):
+        return FakeRequest(self, "batchModify", **kwargs)
+
+    def new_batch_http_request(self, callback):
+        return FakeBatch(self, callback)
+
+    def respond(self, kind, kwargs):
+        if kind == "get" and kwargs["id"].startswith("thread"):
+            return {"id": kwargs["id"], "historyId": "90", "messages": [
+                email(f"{kwargs['id']}-{index}", kwargs["id"]) for index in range(2)
+            ]}
+        if kind == "get":
+            if kwargs["id"] in self.emails:
+                return self.emails[kwargs["id"]]
+            if kwargs["id"] in self.missing:
+                raise LookupError(f"{kwargs['id']} not found")
+            return {"id": kwargs["id"], "threadId": f"t-{kwargs['id']}"}
+        if kind == "list":
+            return self.list_pages[int(kwargs.get("pageToken", 0))]
+        if kind == "history":
+            page = self.history_pages[int(kwargs.get("pageToken", 0))]
+            if isinstance(page, Exception):
+                raise page
+            return page
+        if kind == "profile":
+            return {"historyId": "500"}
+        return {}
+
+
+def email(message_id, thread_id, history_id="80"):
+    body = base64.urlsafe_b64encode(b"Hello there").decode()
+    return {
+        "id": message_id,
+        "threadId": thread_id,
+        "historyId": history_id,
+        "snippet": "Hello",
+        "payload": {"headers": [{"name": "From", "value": "a@example.com"}], "body": {"data": body}},
+    }
+
+
+def test_get_messages_groups_fetches_into_batches_of_100():
+    service = FakeGmailService(missing={"m7"})
+    client = GmailBatchClient(service)
+    ids = [f"m{index}" for index in range(GET_BATCH_SIZE + 5)]
+
+    messages, errors = client.get_messages(ids + ["m1"])
+
+    assert [call for call in service.http_calls if call[0] == "batch"] == [
+        ("batch", {"size": GET_BATCH_SIZE}),
+        ("batch", {"size": 5}),
+    ]
+    assert client.round_trips == 2
+    assert len(messages) == len(ids) - 1
+    assert isinstance(errors["m7"], LookupError)
+
+
+def test_single_fetch_skips_batch_envelope():
+    service = FakeGmailService()
+    messages, errors = GmailBatchClient(service).get_messages(["m1"])
+    assert messages["m1"]["id"] == "m1" and not errors
+    assert [call[0] for call in service.http_calls] == ["get"]
+
+
+def test_mark_read_uses_one_batch_modify():
+    service = FakeGmailService()
+    client = GmailBatchClient(service)
+
+    assert client.mark_read(["a", "b", "a", "c"])
+
+    assert service.http_calls == [
+        ("batchModify", {"userId": "me", "body": {"ids": ["a", "b", "c"], "removeLabelIds": ["UNREAD"]}}),
+    ]
+
+
+def test_batch_transport_failure_marks_every_id_unfetched():
+    service = FakeGmailService()
+    client = GmailBatchClient(service)
+
+    def broken_batch(callback):
+        batch = FakeBatch(service, callback)
+        batch.execute = lambda: (_ for _ in ()).throw(ConnectionError("offline"))
+        return batch
+
+    service.new_batch_http_request = broken_batch
+    messages, errors = client.get_messages(["a", "b"])
+    assert messages == {}
+    assert set(errors) == {"a", "b"}
+    with pytest.raises(ConnectionError):
+        raise errors["a"]
+
+
+def make_watcher(tmp_path, service, sync_mode="unread", history_id=None):
+    watcher = object.__new__(GmailWatcher)
+    watcher.vault_path = tmp_path
+    watcher.logger = logging.getLogger("GmailWatcher")
+    watcher.sync_mode = sync_mode
+    watcher.full_sync_limit = 200
+    watcher.sync_state_file = tmp_path / ".gmail_sync_state.json"
+    watcher.history_id = history_id
+    watcher.pending_history_id = None
+    watcher.retry_ids = {}
+    watcher.needs_action = tmp_path / "Needs_Action"
+    watcher.processed_ids = set()
+    watcher.ai_client = None
+    watcher.classifier = None
+    watcher.service = service
+    watcher.batch = GmailBatchClient(service)
+    watcher.message_cache = {}
+    watcher.thread_history = {}
+    watcher.thread_cache = OrderedDict()
+    watcher.cache_hits = {"messages": 0, "threads": 0}
+    watcher.prefilter = EmailPrefilter(tmp_path / "Company_Handbook.md")
+    watcher.prefilter_logged = 0
+    return watcher
+
+
+def test_poll_downloads_each_message_and_thread_once(tmp_path, caplog):
+    service = FakeGmailService(emails={"m1": email("m1", "thread-a"), "m2": email("m2", "thread-a")})
+    watcher = make_watcher(tmp_path, service)
+
+    with caplog.at_level("INFO"):
+        for item in watcher.check_for_updates():
+            assert watcher.create_action_file(item).exists()
+        watcher.end_cycle()
+
+    kinds = [kind for kind, _ in service.http_calls]
+    # list + one batch for both messages + one thread fetch shared by both files
+    assert kinds.count("list") == 1
+    assert kinds.count("batch") == 1
+    assert [call for call in service.http_calls if call[0] == "get"] == [
+        ("get", {"userId": "me", "id": "thread-a", "format": "full"}),
+    ]
+    assert "3 API call(s)" in caplog.text
+    assert "cache hits 2 message(s) / 1 thread(s)" in caplog.text
+    assert watcher.message_cache == {}
+
+
+def added(message_id, *labels):
+    return {"message": {"id": message_id, "threadId": f"t-{message_id}", "labelIds": list(labels)}}
+
+
+def test_history_sync_pages_through_deltas_and_persists_history_id(tmp_path):
+    service = FakeGmailService(history_pages=[
+        {"history": [{"messagesAdded": [added("h1", "UNREAD", "IMPORTANT", "INBOX"), added("h2", "UNREAD")]}],
+         "nextPageToken": "1", "historyId": "610"},
+        {"history": [{"labelsAdded": [added("h3", "UNREAD", "IMPORTANT")]}], "historyId": "620"},
+    ])
+    watcher = make_watcher(tmp_path, service, sync_mode="history", history_id="600")
+
+    candidates = watcher.check_for_updates()
+    assert [m["id"] for m in candidates] == ["h1", "h3"]
+    assert [kwargs.get("pageToken") for kind, kwargs in service.http_calls if kind == "history"] == [None, "1"]
+    # Not committed until the poll's files have been handled
+    assert not watcher.sync_state_file.exists()
+
+    watcher.end_cycle()
+    assert json.loads(watcher.sync_state_file.read_text()) == {"history_id": "620"}
+    assert watcher._load_history_id() == "620"
+
+
+def test_expired_history_id_falls_back_to_bounded_full_resync(tmp_path):
+    expired = RuntimeError("historyId too old")
+    expired.resp = SimpleNamespace(status=404)
+    service = FakeGmailService(
+        history_pages=[expired],
+        list_pages=[{"messages": [{"id": "m1"}], "nextPageToken": "1"}, {"messages": [{"id": "m2"}]}],
+    )
+    watcher = make_watcher(tmp_path, service, sync_mode="history", history_id="1")
+
+    assert [m["id"] for m in watcher.check_for_updates()] == ["m1", "m2"]
+    watcher.end_cycle()
+
+    assert [kind for kind, _ in service.http_calls][:3] == ["history", "profile", "list"]
+    assert watcher.history_id == "500"
+
+
+def test_failed_action_file_is_fetched_again_after_history_moves_on(tmp_path):
+    service = FakeGmailService(history_pages=[
+        {"history": [{"messagesAdded": [added("h1", "UNREAD", "IMPORTANT"), added("h2", "UNREAD", "IMPORTANT")]}],
+         "historyId": "620"},
+    ], emails={"h1": email("h1", "thread-1"), "h2": email("h2", "thread-2")})
+    watcher = make_watcher(tmp_path, service, sync_mode="history", history_id="600")
+    (tmp_path / "Logs").mkdir()
+    blocker = tmp_path / "Needs_Action" / "EMAIL_h2.md"
+    blocker.mkdir(parents=True)  # writing the action file for h2 fails
+
+    watcher.poll_once()
+
+    assert (tmp_path / "Needs_Action" / "EMAIL_h1.md").is_file()
+    assert json.loads(watcher.sync_state_file.read_text()) == {"history_id": "620", "retry_ids": {"h2": 1}}
+
+    # A restart keeps the retry; the next delta no longer mentions h2
+    blocker.rmdir()
+    service.history_pages = [{"history": [], "historyId": "630"}]
+    restarted = make_watcher(tmp_path, service, sync_mode="history", history_id=watcher._load_history_id())
+    restarted.retry_ids = restarted._load_sync_state()["retry_ids"]
+
+    restarted.poll_once()
+
+    assert (tmp_path / "Needs_Action" / "EMAIL_h2.md").is_file()
+    assert json.loads(restarted.sync_state_file.read_text()) == {"history_id": "630"}
+
+
+def test_poll_that_raises_does_not_advance_history(tmp_path):
+    service = FakeGmailService(history_pages=[
+        {"history": [{"messagesAdded": [added("h1", "UNREAD", "IMPORTANT")]}], "historyId": "620"},
+    ], emails={"h1": email("h1", "thread-1")})
+    watcher = make_watcher(tmp_path, service, sync_mode="history", history_id="600")
+    (tmp_path / "Logs").mkdir()
+    watcher.create_action_file = lambda item: (_ for _ in ()).throw(RuntimeError("vault unmounted"))
+
+    watcher.poll_once()
+
+    assert not watcher.sync_state_file.exists()
+    assert watcher.history_id == "600"
+
+
+def test_classifier_outage_includes_email_without_caching_the_sender(tmp_path):
+    down = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(
+        create=lambda **_request: (_ for _ in ()).throw(ConnectionError("API down")))))
+    watcher = make_watcher(tmp_path, FakeGmailService())
+    watcher.classifier = BotClassifier(down)
+
+    assert watcher._classify_messages([email("m1", "thread-a")]) == {"m1": True}
+    assert watcher.prefilter.classify({"from": "a@example.com"}) == (None, "ambiguous")
+    assert watcher.prefilter.stats()["llm_calls"] == 0
@@ -0,0 +1,82 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from agents.linkedin_watcher import LinkedInAPI
+from utils import http_client
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = set()
+
+    def _reply(self):
+        KeepAliveHandler.connections.add(self.client_address)
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        body = b'{"sub": "abc123", "id": "post-1"}'
+        self.send_response(201)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _reply
+    do_POST = _reply
+
+    def log_message(self, *_args):
+        pass
+
+
+@pytest.fixture
+def server():
+    KeepAliveHandler.connections = set()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+    http_client.close_sessions()
+
+
+def test_named_session_reuses_one_connection(server):
+    session = http_client.get_session("twilio")
+    assert http_client.get_session("twilio") is session
+
+    for _ in range(5):
+        assert session.post(f"{server}/Messages.json", data={"Body": "hi"}).status_code == 201
+
+    assert len(KeepAliveHandler.connections) == 1
+
+
+def test_adapter_applies_default_timeout(monkeypatch):
+    monkeypatch.setenv("HTTP_CONNECT_TIMEOUT", "2")
+    monkeypatch.setenv("HTTP_READ_TIMEOUT", "7")
+    seen = {}
+
+    def fake_send(self, request, **kwargs):
+        seen["timeout"] = kwargs["timeout"]
+        raise RuntimeError("stop")
+
+    monkeypatch.setattr(http_client.HTTPAdapter, "send", fake_send)
+    session = http_client.configure(http_client.requests.Session())
+    with pytest.raises(RuntimeError):
+        session.get("https://api.example.com/")
+    assert seen["timeout"] == (2.0, 7.0)
+
+
+def test_linkedin_fetches_profile_once_across_posts(server, monkeypatch):
+    api = LinkedInAPI("token")
+    api.base_url = server
+    requests_seen = []
+    real_get = api.session.get
+    monkeypatch.setattr(api.session, "get", lambda url, **kw: requests_seen.append(url) or real_get(server, **kw))
+
+    api.post_text("first")
+    api.post_with_link("second", "https://example.com")
+
+    assert len(requests_seen) == 1
+    assert api.profile_id == "abc123"
+    assert len(KeepAliveHandler.connections) == 1
@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+from tests.test_orchestrator_pipeline import make_handler
+from utils.invoice_draft_index import InvoiceDraftIndex
+
+
+def write_draft(folder, name, source_file, message_id=""):
+    path = folder / name
+    path.write_text(
+        f"---\ntype: invoice_draft\nsource_file: {source_file}\nmessage_id: {message_id}\n---\n\n## Invoice Draft\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+def test_index_reconciles_with_drafts_on_disk_after_restart(tmp_path):
+    pending = tmp_path / "Pending_Approval"
+    pending.mkdir()
+    db_path = tmp_path / ".dedup_state.sqlite3"
+    index = InvoiceDraftIndex(pending, db_path)
+    write_draft(pending, "INVOICE_DRAFT_1.md", "WHATSAPP_1.md", "wamid.1")
+    index.add("INVOICE_DRAFT_1.md", "WHATSAPP_1.md", "wamid.1")
+    index.close()
+
+    # While stopped: one draft approved away, another written by hand
+    (pending / "INVOICE_DRAFT_1.md").unlink()
+    write_draft(pending, "INVOICE_DRAFT_2.md", "EMAIL_2.md", "msg-2")
+
+    reopened = InvoiceDraftIndex(pending, db_path)
+    assert reopened.find("WHATSAPP_1.md", "wamid.1") is None
+    assert reopened.find("EMAIL_9.md", "msg-2") == "INVOICE_DRAFT_2.md"
+    assert reopened.find("EMAIL_2.md") == "INVOICE_DRAFT_2.md"
+    assert len(reopened) == 1
+    reopened.close()
+
+
+def test_handler_creates_one_invoice_draft_and_forgets_it_when_moved(tmp_path):
+    handler = make_handler(tmp_path, _log_action=lambda *args, **kwargs: None)
+    source = handler.needs_action / "WHATSAPP_1.md"
+    content = "---\ntype: whatsapp\nmessage_id: wamid.1\n---\n\nPlease send an invoice for $120"
+    source.write_text(content, encoding="utf-8")
+
+    handler._maybe_create_invoice_draft(source, content, "whatsapp")
+    handler.invoice_drafts_created.clear()  # force the index check rather than the in-run set
+    handler._maybe_create_invoice_draft(source, content, "whatsapp")
+    drafts = list(handler.pending.glob("INVOICE_DRAFT_*.md"))
+    assert len(drafts) == 1
+
+    approved = handler.approved / drafts[0].name
+    drafts[0].rename(approved)
+    handler.on_moved(SimpleNamespace(is_directory=False, src_path=str(drafts[0]), dest_path=str(approved)))
+    assert not handler._invoice_draft_exists("WHATSAPP_1.md", "wamid.1")
+
+
+def test_draft_written_at_runtime_by_another_process_is_indexed(tmp_path):
+    handler = make_handler(tmp_path, _log_action=lambda *args, **kwargs: None)
+    assert not handler._invoice_draft_exists("EMAIL_7.md", "msg-7")  # index loaded before the draft exists
+
+    # Created empty, then filled in: the modified event picks up the keys
+    draft = handler.pending / "INVOICE_DRAFT_7.md"
+    draft.write_text("", encoding="utf-8")
+    handler.on_created(SimpleNamespace(is_directory=False, src_path=str(draft)))
+    write_draft(handler.pending, draft.name, "EMAIL_7.md", "msg-7")
+    handler.on_modified(SimpleNamespace(is_directory=False, src_path=str(draft)))
+
+    assert handler._invoice_draft_exists("EMAIL_7.md")
+    assert handler._invoice_draft_exists("EMAIL_8.md", "msg-7")
@@ -0,0 +1,74 @@
+from utils.keyword_classifier import KeywordClassifier, classify_urgency, route_signals
+
+
+def test_classifier_matches_whole_words_across_groups_in_one_scan():
+    classifier = KeywordClassifier({"post": ["post about", "linkedin"], "invoice": ["invoice", "invoices"]})
+
+    hits = classifier.scan("Can you POST\n about the launch on LinkedIn? Invoices attached.")
+
+    assert hits == {"post": {"post about", "linkedin"}, "invoice": {"invoices"}}
+    assert classifier.scan("reinvoiced the outpost") == {}
+
+
+def test_classify_urgency_keeps_priority_order_without_substring_hits():
+    assert classify_urgency("Server is down, please help") == "URGENT"
+    assert classify_urgency("What is your rate for a proposal?") == "BUSINESS"
+    assert classify_urgency("ok thanks") == "INFO"
+    # 'no' inside 'know', 'down' inside 'download', 'rate' inside 'separate'
+    assert classify_urgency("I know the download is in a separate folder") == "NORMAL"
+
+
+def test_plural_keywords_still_match():
+    assert classify_urgency("Please send the invoices and payment rates") == "BUSINESS"
+    for word in ("rates", "payments", "fees", "costs", "quotes", "invoices"):
+        assert classify_urgency(f"About the {word}") == "BUSINESS", word
+    assert classify_urgency("We have problems with the site") == "URGENT"
+    assert route_signals("---\ntype: email\n---\n\n## Current Message\nThe invoices are late")["invoice_request"]
+
+
+def test_route_signals_reads_type_and_ignores_quoted_history_and_sender():
+    content = """---
+type: email
+from: LinkedIn <notifications@linkedin.com>
+---
+
+## Thread History (Oldest to Newest)
+
+### Message 1: Mon from client@example.com
+
+Please send the invoice, it's urgent.
+
+## Current Message
+Thanks, could you post about the launch?
+
+## Actions
+- [ ] Reply
+"""
+    signals = route_signals(content, "EMAIL_123.md")
+
+    assert signals["type"] == "email"
+    assert signals["post_request"] is True
+    assert signals["invoice_request"] is False
+    assert signals["urgency"] == "INFO"
+    assert route_signals("---\ntype: whatsapp\nfrom: +1555\n---\n", "WHATSAPP_1.md")["type"] == "whatsapp"
+
+
+def test_route_signals_ignores_sender_block_in_body():
+    content = """---
+type: email
+from: LinkedIn <someone@linkedin.com>
+---
+
+## From
+LinkedIn <someone@linkedin.com>
+
+## Subject
+Lunch next week
+
+## Current Message
+Are you free on Tuesday?
+"""
+    signals = route_signals(content, "EMAIL_456.md")
+
+    assert signals["post_request"] is False
+    assert signals["keywords"] == {}
@@ -0,0 +1,104 @@
+from types import SimpleNamespace
+
+from utils.llm_cache import CachedChatClient, LLMResponseCache, cache_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingOpenAI:
+    def __init__(self, content="Drafted reply", finish_reason="stop"):
+        self.content = content
+        self.finish_reason = finish_reason
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **request):
+        self.calls += 1
+        return SimpleNamespace(choices=[
+            SimpleNamespace(message=SimpleNamespace(content=self.content), finish_reason=self.finish_reason)
+        ])
+
+
+def request(user="Reply to: lunch?", temperature=0.7):
+    return {
+        "model": "gpt-4o-mini",
+        "messages": [{"role": "system", "content": "You draft emails"}, {"role": "user", "content": user}],
+        "temperature": temperature,
+        "max_tokens": 300,
+    }
+
+
+def test_repeat_requests_are_served_from_disk(tmp_path):
+    openai = CountingOpenAI()
+    client = CachedChatClient(openai, LLMResponseCache(tmp_path / "cache.sqlite3"))
+
+    first = client.chat.completions.create(**request())
+    second = client.chat.completions.create(**request())
+    client.chat.completions.create(**request(temperature=0.3))
+
+    assert openai.calls == 2
+    assert second.choices[0].message.content == first.choices[0].message.content
+    assert second.choices[0].finish_reason == "stop"
+    stats = client.cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+
+    # Survives a restart
+    reopened = CachedChatClient(openai, LLMResponseCache(tmp_path / "cache.sqlite3"))
+    reopened.chat.completions.create(**request())
+    assert openai.calls == 2
+
+
+def test_ttl_bypass_and_empty_answers(tmp_path):
+    clock = FakeClock()
+    cache = LLMResponseCache(tmp_path / "cache.sqlite3", ttl_seconds=60, clock=clock)
+    key = cache_key(**request())
+    cache.put(key, "cached", latency=1.5)
+
+    assert cache.get(key) == "cached"
+    assert cache.stats()["saved_s"] == 1.5
+    cache.bypass = True
+    assert cache.get(key) is None
+    cache.bypass = False
+    clock.now += 61
+    assert cache.get(key) is None
+
+    openai = CountingOpenAI(content="")
+    client = CachedChatClient(openai, cache)
+    client.chat.completions.create(**request())
+    client.chat.completions.create(**request())
+    assert openai.calls == 2
+
+
+def test_least_recently_used_rows_are_evicted(tmp_path):
+    clock = FakeClock()
+    cache = LLMResponseCache(tmp_path / "cache.sqlite3", max_entries=2, clock=clock)
+    cache.PRUNE_EVERY = 1
+    for name in ("a", "b"):
+        clock.now += 1
+        cache.put(name, name, latency=0.1)
+    clock.now += 1
+    cache.get("a")
+    clock.now += 1
+    cache.put("c", "c", latency=0.1)
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == "a"
+
+
+def test_truncated_answers_are_not_cached(tmp_path):
+    openai = CountingOpenAI(content='{"twitter": "cut off', finish_reason="length")
+    client = CachedChatClient(openai, LLMResponseCache(tmp_path / "cache.sqlite3"))
+
+    client.chat.completions.create(**request())
+    again = client.chat.completions.create(**request())
+
+    assert openai.calls == 2
+    assert again.choices[0].finish_reason == "length"
+    assert len(client.cache) == 0
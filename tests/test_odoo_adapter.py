@@ -0,0 +1,65 @@
+import sys
+import textwrap
+
+import pytest
+
+from utils.odoo_adapter import OdooAdapterPool
+
+# Stand-in for `node index.js --legacy-stdio`: logs in once, echoes ids, can crash or stall
+FAKE_ADAPTER = textwrap.dedent(
+    """
+    import json, sys, time
+    logins = 0
+    for line in sys.stdin:
+        request = json.loads(line)
+        tool = request["tool"]
+        if tool == "crash":
+            sys.exit(3)
+        if tool == "stall":
+            time.sleep(5)
+        if tool == "ping":
+            result = {"status": "ok"}
+        else:
+            if logins == 0:
+                logins += 1
+                print("logged in", file=sys.stderr, flush=True)
+            result = {"status": "created", "invoice_id": request["input"]["n"], "logins": logins}
+        result["id"] = request["id"]
+        print(json.dumps(result), flush=True)
+    """
+)
+
+
+@pytest.fixture
+def pool():
+    adapter_pool = OdooAdapterPool([sys.executable, "-c", FAKE_ADAPTER], size=1, timeout=2)
+    yield adapter_pool
+    adapter_pool.close()
+
+
+def test_pool_reuses_one_process_and_login_for_many_requests(pool):
+    responses = [pool.request("create_invoice", {"n": n}) for n in range(100)]
+
+    assert [response["invoice_id"] for response in responses] == list(range(100))
+    assert {response["logins"] for response in responses} == {1}
+    assert pool.restarts == 0
+    assert pool.check_health() == {"checked": 1, "healthy": 1, "restarts": 0}
+
+
+def test_pool_restarts_crashed_adapter_on_next_request(pool):
+    assert pool.request("create_invoice", {"n": 1})["invoice_id"] == 1
+    with pytest.raises(RuntimeError, match="Odoo adapter failed"):
+        pool.request("crash", {})
+
+    assert pool.request("create_invoice", {"n": 2})["invoice_id"] == 2
+    assert pool.restarts == 1
+
+
+def test_pool_kills_stalled_adapter_after_timeout(pool):
+    pool.timeout = 0.3
+    with pytest.raises(RuntimeError, match="timed out"):
+        pool.request("stall", {})
+
+    pool.timeout = 2
+    assert pool.request("create_invoice", {"n": 3})["invoice_id"] == 3
+    assert pool.restarts == 1
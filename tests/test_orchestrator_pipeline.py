@@ -0,0 +1,396 @@
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from agents.orchestrator import VaultHandler
+from utils.action_scheduler import ActionScheduler, urgency_class
+from utils.invoice_draft_index import InvoiceDraftIndex
+
+
+def make_handler(tmp_path, **overrides):
+    """Build a VaultHandler without Gmail/OpenAI side effects."""
+    handler = object.__new__(VaultHandler)
+    handler.vault = tmp_path
+    handler.inbox = tmp_path / "Inbox"
+    handler.needs_action = tmp_path / "Needs_Action"
+    handler.approved = tmp_path / "Approved"
+    handler.pending = tmp_path / "Pending_Approval"
+    handler.done = tmp_path / "Done"
+    handler.failed = tmp_path / "Failed"
+    for folder in (handler.needs_action, handler.approved, handler.pending, handler.done):
+        folder.mkdir(parents=True, exist_ok=True)
+    (tmp_path / "Logs").mkdir(exist_ok=True)
+
+    handler.gmail_service = None
+    handler.gmail_watcher = None
+    handler.email_drafter = None
+    handler.tweet_drafter = None
+    handler.whatsapp_drafter = None
+    handler.social_drafter = None
+    handler.whatsapp_api = None
+    handler.linkedin_api = None
+
+    handler.event_queue = defaultdict(list)
+    handler.processed_hashes = set()
+    handler.executed_files = set()
+    handler.executing_files = set()
+    handler.invoice_drafts_created = set()
+    handler.invoice_index = InvoiceDraftIndex(handler.pending, tmp_path / ".dedup_state.sqlite3")
+    handler.recently_processed_files = {}
+    handler.dedup_window = 5.0
+    handler.batch_timeout = 2.0
+    handler.batch_deadlines = {}
+    handler.dedup_lock = threading.Lock()
+    handler.queue_lock = threading.Lock()
+    handler.batch_ready = threading.Condition(handler.queue_lock)
+    handler.draft_pool = ThreadPoolExecutor(max_workers=8)
+    handler.channel_slots = {
+        channel: threading.BoundedSemaphore(limit)
+        for channel, limit in VaultHandler.CHANNEL_CONCURRENCY.items()
+    }
+    handler.gmail_lock = threading.Lock()
+    handler.pending_read_marks = []
+    handler.last_batch_stats = {}
+    handler.action_scheduler = ActionScheduler()
+    handler.drain_lock = threading.Lock()
+    handler.odoo_adapter = None
+    handler.odoo_pool_lock = threading.Lock()
+    handler.odoo_batch_size = VaultHandler.ODOO_BATCH_SIZE
+    for name, value in overrides.items():
+        setattr(handler, name, value)
+    return handler
+
+
+class SlowWhatsAppDrafter:
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+        self.drafted = []
+
+    def draft_reply(self, filepath):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+            self.drafted.append(filepath.name)
+        return filepath
+
+
+def test_inbox_batch_drafts_concurrently_within_channel_limit(tmp_path):
+    drafter = SlowWhatsAppDrafter()
+    handler = make_handler(tmp_path, whatsapp_drafter=drafter)
+    files = []
+    for index in range(8):
+        path = handler.needs_action / f"WHATSAPP_{index:03d}.md"
+        path.write_text("---\ntype: whatsapp\n---\n\n## Message\n\nHi", encoding="utf-8")
+        files.append(path)
+        handler._enqueue("inbox", path)
+
+    handler._process_batch("inbox")
+
+    stats = handler.last_batch_stats["inbox"]
+    assert sorted(drafter.drafted) == sorted(path.name for path in files)
+    assert drafter.peak == VaultHandler.CHANNEL_CONCURRENCY["whatsapp"]
+    assert stats["items"] == 8
+    assert set(stats["item_latency_s"]) == {path.name for path in files}
+    # Two waves of four concurrent drafts, not eight sequential ones.
+    assert stats["wall_clock_s"] < 8 * drafter.delay
+    assert not handler.event_queue["inbox"]
+
+
+class RecordingGmailWatcher:
+    def __init__(self):
+        self.calls = []
+
+    def mark_many_as_read(self, message_ids):
+        self.calls.append(sorted(message_ids))
+        return True
+
+
+def test_inbox_batch_marks_drafted_emails_read_in_one_call(tmp_path):
+    gmail = RecordingGmailWatcher()
+    drafter = SimpleNamespace(draft_reply=lambda path: path)
+    handler = make_handler(tmp_path, email_drafter=drafter, gmail_watcher=gmail)
+    for index in range(3):
+        path = handler.needs_action / f"EMAIL_{index}.md"
+        path.write_text(
+            f"---\ntype: email\ngmail_message_id: msg{index}\nfrom: a@example.com\n---\n\n## Current Message\n\nHi",
+            encoding="utf-8",
+        )
+        handler._enqueue("inbox", path)
+
+    handler._process_batch("inbox")
+
+    assert gmail.calls == [["msg0", "msg1", "msg2"]]
+    assert handler.pending_read_marks == []
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_scheduler_runs_urgent_first_and_ages_normal_items():
+    clock = FakeClock()
+    scheduler = ActionScheduler(aging_seconds=10, clock=clock)
+    scheduler.push("EMAIL_1.md", "email-1", "NORMAL")
+    clock.now = 5
+    scheduler.push("WHATSAPP_1.md", "whatsapp-1", "URGENT")
+    assert scheduler.pop()[0] == "whatsapp-1"
+
+    # After waiting longer than two aging intervals, NORMAL work beats fresh URGENT work.
+    clock.now = 25
+    scheduler.push("WHATSAPP_2.md", "whatsapp-2", "URGENT")
+    item, label, waited = scheduler.pop()
+    assert (item, label, waited) == ("email-1", "NORMAL", 25)
+
+    stats = scheduler.wait_stats()
+    assert stats["URGENT"]["count"] == 1
+    assert stats["NORMAL"]["max_wait_s"] == 25
+
+
+def test_pop_matching_takes_only_items_as_urgent_as_the_head():
+    scheduler = ActionScheduler()
+    scheduler.push("INVOICE_1.md", "invoice-1", "NORMAL")
+    scheduler.push("INVOICE_2.md", "invoice-2", "BUSINESS")
+    scheduler.push("INVOICE_3.md", "invoice-3", "URGENT")
+
+    taken = scheduler.pop_matching(lambda item: True, 5, label="BUSINESS")
+
+    assert [(item, label) for item, label, _ in taken] == [("invoice-3", "URGENT"), ("invoice-2", "BUSINESS")]
+    assert "INVOICE_1.md" in scheduler
+    assert [item for item, _, _ in scheduler.pop_matching(lambda item: True, 5)] == ["invoice-1"]
+
+
+def test_urgency_class_promotes_payments_and_high_priority():
+    assert urgency_class("PAYMENT_001.md") == "URGENT"
+    assert urgency_class("WHATSAPP_DRAFT_1.md", "NORMAL", "HIGH") == "URGENT"
+    assert urgency_class("EMAIL_DRAFT_1.md", "bogus") == "NORMAL"
+
+
+def test_approved_batch_executes_by_urgency(tmp_path, monkeypatch):
+    handler = make_handler(tmp_path)
+    executed = []
+    monkeypatch.setattr(handler, "_execute_action", lambda path: executed.append(path.name))
+
+    files = {
+        "EMAIL_DRAFT_001.md": "---\ntype: email_draft\n---\n",
+        "EMAIL_DRAFT_002.md": "---\ntype: email_draft\n---\n",
+        "WHATSAPP_DRAFT_001.md": "---\ntype: whatsapp_draft\nurgency: URGENT\n---\n",
+        "PAYMENT_001.md": "---\namount: 50\n---\n",
+    }
+    for name, content in files.items():
+        path = handler.approved / name
+        path.write_text(content, encoding="utf-8")
+        handler._enqueue("approved", path)
+
+    handler._process_batch("approved")
+
+    assert set(executed[:2]) == {"WHATSAPP_DRAFT_001.md", "PAYMENT_001.md"}
+    assert executed[2:] == ["EMAIL_DRAFT_001.md", "EMAIL_DRAFT_002.md"]
+    assert handler.action_scheduler.wait_stats()["URGENT"]["count"] == 2
+
+
+class FakeOdooPool:
+    def __init__(self):
+        self.calls = []
+
+    def request(self, tool, tool_input):
+        self.calls.append((tool, tool_input))
+        if tool == "create_invoices":
+            return {"status": "ok", "results": [
+                {"status": "error", "error": "Failed to create invoice", "detail": "bad partner"}
+                if item["contact_name"] == "Bad Co"
+                else {"status": "created", "invoice_id": 100 + index}
+                for index, item in enumerate(tool_input["invoices"])
+            ]}
+        return {"status": "ok", "results": [
+            {"status": "logged", "transaction_id": 200 + index}
+            for index, _ in enumerate(tool_input["transactions"])
+        ]}
+
+
+def test_approved_finance_actions_share_one_odoo_call_per_kind(tmp_path, monkeypatch):
+    monkeypatch.setenv("ODOO_USERNAME", "admin")
+    monkeypatch.setenv("ODOO_PASSWORD", "secret")
+    pool = FakeOdooPool()
+    handler = make_handler(tmp_path, odoo_adapter=pool)
+    executed = []
+    monkeypatch.setattr(handler, "_execute_email", lambda path, _content: executed.append(path.name))
+
+    files = {
+        "INVOICE_001.md": "---\ncontact_name: Acme\namount: 150\n---\n",
+        "INVOICE_002.md": "---\ncontact_name: Bad Co\namount: 75\n---\n",
+        "INVOICE_003.md": "---\namount: 20\n---\n",
+        "PAYMENT_001.md": "---\namount: 50\ndescription: Deposit\n---\n",
+        "PAYMENT_002.md": "---\namount: 25\n---\n",
+        "EMAIL_DRAFT_001.md": "---\ntype: email_draft\n---\n",
+    }
+    for name, content in files.items():
+        path = handler.approved / name
+        path.write_text(content, encoding="utf-8")
+        handler._enqueue("approved", path)
+
+    handler._process_batch("approved")
+
+    # URGENT payments go first in their own call; NORMAL invoices aren't pulled along
+    assert [tool for tool, _ in pool.calls] == ["log_transactions", "create_invoices"]
+    assert len(pool.calls[0][1]["transactions"]) == 2
+    assert [item["contact_name"] for item in pool.calls[1][1]["invoices"]] == ["Acme", "Bad Co"]
+    # Each record carries its file name so Odoo can skip ones an earlier, timed-out call created
+    assert [item["ref"] for item in pool.calls[1][1]["invoices"]] == ["INVOICE_001.md", "INVOICE_002.md"]
+    assert sorted(item["ref"] for item in pool.calls[0][1]["transactions"]) == ["PAYMENT_001.md", "PAYMENT_002.md"]
+    assert sorted(path.name for path in handler.done.iterdir()) == [
+        "EMAIL_DRAFT_001.md", "INVOICE_001.md", "PAYMENT_001.md", "PAYMENT_002.md",
+    ]
+    # Items Odoo rejected or that never reached it fail on their own and can be retried
+    assert sorted(path.name for path in handler.failed.iterdir()) == ["INVOICE_002.md", "INVOICE_003.md"]
+    assert "INVOICE_002.md" not in handler.executed_files
+    assert executed == ["EMAIL_DRAFT_001.md"]
+    transactions = (tmp_path / "Logs" / "odoo_transactions.jsonl").read_text(encoding="utf-8").splitlines()
+    assert len(transactions) == 2
+
+
+def test_finance_batch_failure_fails_every_file_in_the_call(tmp_path, monkeypatch):
+    monkeypatch.delenv("ODOO_USERNAME", raising=False)
+    handler = make_handler(tmp_path)
+    paths = []
+    for index in range(2):
+        path = handler.approved / f"INVOICE_00{index}.md"
+        path.write_text("---\ncontact_name: Acme\namount: 10\n---\n", encoding="utf-8")
+        paths.append(path)
+
+    handler._execute_finance_batch(paths)
+
+    assert sorted(path.name for path in handler.failed.iterdir()) == ["INVOICE_000.md", "INVOICE_001.md"]
+    assert not any(handler.approved.iterdir())
+
+
+def test_flusher_wakes_at_batch_deadline(tmp_path):
+    handler = make_handler(tmp_path, batch_timeout=0.05)
+    assert handler._wait_for_ready_batches(0.01) == []
+
+    started = time.monotonic()
+    handler._enqueue("inbox", handler.needs_action / "EMAIL_001.md")
+    ready = handler._wait_for_ready_batches(5)
+    elapsed = time.monotonic() - started
+
+    assert ready == ["inbox"]
+    assert 0.04 <= elapsed < 1
+
+
+def test_flusher_wakes_immediately_when_batch_is_full(tmp_path):
+    handler = make_handler(tmp_path, batch_timeout=60)
+
+    def fill_queue():
+        for index in range(VaultHandler.BATCH_SIZE):
+            handler._enqueue("approved", handler.approved / f"EMAIL_{index}.md")
+
+    threading.Timer(0.02, fill_queue).start()
+    started = time.monotonic()
+    ready = handler._wait_for_ready_batches(5)
+
+    assert ready == ["approved"]
+    assert time.monotonic() - started < 1
+
+
+def test_urgent_file_arriving_mid_drain_runs_before_waiting_normal_items(tmp_path, monkeypatch):
+    handler = make_handler(tmp_path, batch_timeout=60)
+    urgent = handler.approved / "WHATSAPP_DRAFT_URGENT.md"
+    executed = []
+
+    def watchdog_events():
+        # Created empty, urgency only lands once the writer finishes and closes the file
+        urgent.write_text("", encoding="utf-8")
+        handler.on_created(SimpleNamespace(is_directory=False, src_path=str(urgent)))
+        assert "WHATSAPP_DRAFT_URGENT.md" not in handler.action_scheduler
+        urgent.write_text("---\ntype: whatsapp_draft\nurgency: URGENT\n---\n", encoding="utf-8")
+        handler.on_closed(SimpleNamespace(is_directory=False, src_path=str(urgent)))
+
+    def execute(path):
+        executed.append(path.name)
+        if len(executed) == 1:
+            # The watchdog thread sees a new URGENT approval while the drain is busy
+            watchdog = threading.Thread(target=watchdog_events)
+            watchdog.start()
+            watchdog.join()
+
+    monkeypatch.setattr(handler, "_execute_action", execute)
+    for index in range(3):
+        path = handler.approved / f"EMAIL_DRAFT_00{index}.md"
+        path.write_text("---\ntype: email_draft\n---\n", encoding="utf-8")
+        handler._schedule_action(path)
+
+    handler._drain_actions()
+
+    assert executed == [
+        "EMAIL_DRAFT_000.md", "WHATSAPP_DRAFT_URGENT.md", "EMAIL_DRAFT_001.md", "EMAIL_DRAFT_002.md",
+    ]
+    # The flusher is still woken for the file
+    assert handler.event_queue["approved"] == [urgent]
+
+
+def test_inbox_item_without_a_draft_is_released_for_retry(tmp_path):
+    drafts = {"WHATSAPP_OK.md": True, "WHATSAPP_NONE.md": None}
+
+    def draft_reply(path):
+        if path.name == "WHATSAPP_BOOM.md":
+            raise RuntimeError("LLM timeout")
+        return path if drafts[path.name] else None
+
+    handler = make_handler(tmp_path, whatsapp_drafter=SimpleNamespace(draft_reply=draft_reply))
+    for name in ("WHATSAPP_OK.md", "WHATSAPP_NONE.md", "WHATSAPP_BOOM.md"):
+        path = handler.needs_action / name
+        path.write_text("---\ntype: whatsapp\n---\n\n## Message\n\nHi", encoding="utf-8")
+        handler.on_created(SimpleNamespace(is_directory=False, src_path=str(path)))
+
+    handler._process_batch("inbox")
+
+    assert handler.processed_hashes == {"WHATSAPP_OK.md"}
+
+
+def test_action_is_recorded_as_executed_only_once_it_finishes(tmp_path, monkeypatch):
+    handler = make_handler(tmp_path)
+    action = handler.approved / "EMAIL_DRAFT_001.md"
+    action.write_text("---\ntype: email_draft\n---\n", encoding="utf-8")
+    during = []
+
+    def send(path, content):
+        during.append((path.name in handler.executed_files, path.name in handler.executing_files))
+        # A second drain (or the periodic scan) can't start it again meanwhile
+        handler._execute_action(path)
+
+    monkeypatch.setattr(handler, "_execute_email", send)
+    handler._execute_action(action)
+
+    # A crash mid-send leaves nothing persisted, so the file is retried on boot
+    assert during == [(False, True)]
+    assert handler.executed_files == {"EMAIL_DRAFT_001.md"}
+    assert handler.executing_files == set()
+    assert (handler.done / action.name).exists()
+
+
+def test_inbox_items_skipped_on_purpose_keep_their_dedup_key(tmp_path):
+    drafter = SimpleNamespace(draft_reply=lambda path: None, processed_ids={"WHATSAPP_SEEN.md"})
+    handler = make_handler(tmp_path, whatsapp_drafter=drafter)
+    for name, content in (
+        ("WHATSAPP_SEEN.md", "---\ntype: whatsapp\n---\n\n## Message\n\nHi"),
+        ("NOTE_001.md", "---\ntype: note\n---\n\nNothing to draft"),
+    ):
+        path = handler.needs_action / name
+        path.write_text(content, encoding="utf-8")
+        handler.on_created(SimpleNamespace(is_directory=False, src_path=str(path)))
+
+    handler._process_batch("inbox")
+
+    # Already drafted before and unknown types are skips, not failures: a restart must not rescan them
+    assert handler.processed_hashes == {"WHATSAPP_SEEN.md", "NOTE_001.md"}
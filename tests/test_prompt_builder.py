@@ -0,0 +1,55 @@
+from utils.prompt_builder import clean_message, count_tokens, fit_thread, split_thread, truncate_tokens
+
+SIGNATURE = "Jane Doe\nHead of Ops, Example Corp\n+1 555 0100"
+
+
+def thread(*bodies):
+    return "".join(
+        f"### Message {index}: Mon, {index} Jan 2026 from jane@example.com\n\n{body}\n\n---\n\n"
+        for index, body in enumerate(bodies, 1)
+    )
+
+
+def test_clean_message_drops_quotes_attribution_and_signature():
+    text = (
+        "Sounds good, Thursday works.\n\n"
+        "On Mon, 5 Jan 2026 at 10:00, Hamza <h@example.com> wrote:\n"
+        "> Can we meet Thursday?\n"
+        ">> Earlier stuff\n"
+        "-- \n" + SIGNATURE
+    )
+    assert clean_message(text) == "Sounds good, Thursday works."
+    assert clean_message("> only quoted") == "> only quoted"
+    assert clean_message("Reply\n-----Original Message-----\nFrom: x") == "Reply"
+
+
+def test_fit_thread_dedupes_repeated_paragraphs():
+    history = thread(
+        f"Can we ship in March?\n\n{SIGNATURE}",
+        f"Also, what about the budget?\n\nCan we ship in March?\n\n{SIGNATURE}",
+    )
+    fitted = fit_thread(history, budget=10_000)
+
+    assert fitted.count("Can we ship in March?") == 1
+    assert fitted.count("Head of Ops") == 1
+    assert [heading for heading, _ in split_thread(fitted)] == [
+        "Mon, 1 Jan 2026 from jane@example.com", "Mon, 2 Jan 2026 from jane@example.com"]
+
+
+def test_fit_thread_keeps_newest_messages_within_budget():
+    bodies = [f"Message number {index}. " + "filler words here " * 50 for index in range(10)]
+    history = thread(*bodies)
+    fitted = fit_thread(history, budget=400)
+
+    assert count_tokens(fitted) <= 420
+    assert "Message number 9." in fitted
+    assert "Message number 0." not in fitted
+    assert fitted.startswith("[")  # omitted-messages note
+
+
+def test_truncate_tokens_keeps_the_start():
+    text = "word " * 1000
+    cut = truncate_tokens(text, 50)
+    assert count_tokens(cut) <= 55
+    assert cut.endswith("[...truncated]")
+    assert truncate_tokens("short", 50) == "short"
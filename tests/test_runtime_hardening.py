@@ -193,6 +193,7 @@ def test_failed_action_moves_out_of_approved(tmp_path, monkeypatch):
     handler.approved.mkdir()
     handler.done.mkdir()
     handler.executed_files = set()
+    handler.executing_files = set()
     handler.dedup_lock = threading.Lock()
     monkeypatch.setattr(handler, "_execute_email", lambda *_args: (_ for _ in ()).throw(RuntimeError("send failed")))
     monkeypatch.setattr(handler, "_log_action", lambda *_args, **_kwargs: None)
@@ -210,28 +211,17 @@ def test_failed_action_moves_out_of_approved(tmp_path, monkeypatch):
 def test_odoo_adapter_rejects_errors_and_accepts_confirmed_response(tmp_path, monkeypatch):
     handler = object.__new__(VaultHandler)
     handler.vault = tmp_path
+    handler.odoo_pool_lock = threading.Lock()
     monkeypatch.setenv("ODOO_USERNAME", "admin")
     monkeypatch.setenv("ODOO_PASSWORD", "secret")
 
-    monkeypatch.setattr(
-        subprocess,
-        "run",
-        lambda *_args, **_kwargs: SimpleNamespace(
-            returncode=0,
-            stdout='{"status":"error","detail":"rejected"}\n',
-            stderr="",
-        ),
+    handler.odoo_adapter = SimpleNamespace(
+        request=lambda *_args: {"status": "error", "detail": "rejected", "id": "1"},
     )
     with pytest.raises(RuntimeError, match="rejected"):
         handler._call_odoo_adapter("create_invoice", {})
 
-    monkeypatch.setattr(
-        subprocess,
-        "run",
-        lambda *_args, **_kwargs: SimpleNamespace(
-            returncode=0,
-            stdout='{"status":"created","invoice_id":42}\n',
-            stderr="",
-        ),
+    handler.odoo_adapter = SimpleNamespace(
+        request=lambda *_args: {"status": "created", "invoice_id": 42, "id": "2"},
     )
     assert handler._call_odoo_adapter("create_invoice", {})["invoice_id"] == 42
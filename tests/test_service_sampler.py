@@ -0,0 +1,71 @@
+import socket
+import threading
+
+from control_center import server
+from control_center.service_sampler import ServiceSampler, running_patterns
+
+
+def fake_proc(tmp_path, commands):
+    proc = tmp_path / "proc"
+    for pid, command in commands.items():
+        (proc / str(pid)).mkdir(parents=True)
+        (proc / str(pid) / "cmdline").write_bytes(b"\0".join(part.encode() for part in command.split()) + b"\0")
+    (proc / "self").mkdir()  # non-numeric entries are skipped
+    return proc
+
+
+def test_running_patterns_matches_all_patterns_in_one_pass(tmp_path):
+    proc = fake_proc(tmp_path, {
+        10: "python scripts/orchestrator.py --vault ./vault",
+        11: "python -m uvicorn control_center.server:app",
+    })
+
+    running = running_patterns(server.PROCESS_PATTERNS, proc_root=proc)
+
+    assert running == {"control_center": False, "orchestrator": True, "gmail_watcher": False, "webhook": False}
+
+
+def test_build_services_shapes_sample_for_the_ui():
+    running = {name: name == "orchestrator" for name in server.PROCESS_PATTERNS}
+    services = server.build_services(running, {"odoo": True})
+
+    assert [service["name"] for service in services][-1] == "odoo"
+    assert services[-1]["running"] is True
+    orchestrator = next(service for service in services if service["name"] == "orchestrator")
+    assert orchestrator["running"] is True and orchestrator["reachable"] is False
+
+
+def test_concurrent_callers_share_one_sample_until_ttl():
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    port = listener.getsockname()[1]
+    now = [0.0]
+    sampler = ServiceSampler(
+        lambda running, reachable: [{"running": running, "reachable": reachable}],
+        {"orchestrator": "no-such-command-line-xyz"},
+        {"orchestrator": ("127.0.0.1", port), "odoo": ("127.0.0.1", 9)},
+        ttl=2.0,
+        clock=lambda: now[0],
+    )
+    try:
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(sampler.services())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sampler.samples == 1
+        assert len(results) == 8
+        assert results[0] == [{"running": {"orchestrator": False},
+                               "reachable": {"orchestrator": True, "odoo": False}}]
+
+        results[0][0]["running"]["orchestrator"] = True  # callers get copies
+        assert sampler.services()[0]["running"]["orchestrator"] is False
+
+        now[0] = 2.5
+        sampler.services()
+        assert sampler.samples == 2
+    finally:
+        listener.close()
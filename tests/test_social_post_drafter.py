@@ -0,0 +1,96 @@
+import json
+import threading
+from types import SimpleNamespace
+
+from utils.social_post_drafter import PLATFORM_LIMITS, SocialPostDrafter, enforce_length
+
+
+class FakeOpenAI:
+    """Per-platform prompts wait on a barrier, so they only finish if all three run at once"""
+
+    def __init__(self, combined_reply=None, finish_reason="stop"):
+        self.combined_reply = combined_reply
+        self.finish_reason = finish_reason
+        self.calls = []
+        self.barrier = threading.Barrier(3, timeout=2)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, temperature, max_tokens, **kwargs):
+        user = messages[1]["content"]
+        finish_reason = "stop"
+        if "response_format" in kwargs:
+            self.calls.append("all")
+            text = self.combined_reply
+            finish_reason = self.finish_reason
+        else:
+            platform = next(name for name in ("tweet", "Facebook", "LinkedIn") if name in user.split("\n")[0])
+            self.calls.append(platform)
+            self.barrier.wait()
+            text = f"{platform} post about automation"
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text), finish_reason=finish_reason)])
+
+
+def make_drafter(tmp_path, monkeypatch, client, mode):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setenv("SOCIAL_POST_MODE", mode)
+    drafter = SocialPostDrafter(str(tmp_path))
+    drafter.client = client
+    return drafter
+
+
+def test_platform_posts_are_generated_concurrently(tmp_path, monkeypatch):
+    client = FakeOpenAI()
+    drafter = make_drafter(tmp_path, monkeypatch, client, "concurrent")
+
+    results = drafter.draft_posts("AI automation")
+
+    assert sorted(results) == ["facebook", "linkedin", "twitter"]
+    assert sorted(client.calls) == ["Facebook", "LinkedIn", "tweet"]
+    assert "tweet post about automation" in results["twitter"].read_text(encoding="utf-8")
+
+
+def test_single_call_mode_enforces_limits_locally(tmp_path, monkeypatch):
+    client = FakeOpenAI(combined_reply=json.dumps({
+        "twitter": "word " * 100, "facebook": "Hello Facebook", "linkedin": "Hello LinkedIn"}))
+    drafter = make_drafter(tmp_path, monkeypatch, client, "single")
+
+    results = drafter.draft_posts("AI automation")
+
+    assert client.calls == ["all"]
+    assert sorted(results) == ["facebook", "linkedin", "twitter"]
+    tweet = results["twitter"].read_text(encoding="utf-8").split("## Proposed Post\n\n")[1].split("\n\n---")[0]
+    assert len(tweet) <= PLATFORM_LIMITS["twitter"]
+    assert tweet.endswith("...")
+
+
+def test_single_call_falls_back_for_missing_platforms(tmp_path, monkeypatch):
+    client = FakeOpenAI(combined_reply="not json")
+    drafter = make_drafter(tmp_path, monkeypatch, client, "single")
+
+    results = drafter.draft_posts("AI automation")
+
+    assert client.calls[0] == "all"
+    assert sorted(client.calls[1:]) == ["Facebook", "LinkedIn", "tweet"]
+    assert len(results) == 3
+
+
+def test_single_call_cut_off_at_max_tokens_drafts_per_platform(tmp_path, monkeypatch):
+    # Still valid JSON, but the LinkedIn post stops mid-sentence
+    client = FakeOpenAI(combined_reply=json.dumps({
+        "twitter": "Tweet", "facebook": "Facebook post", "linkedin": "LinkedIn post that stops"}),
+        finish_reason="length")
+    drafter = make_drafter(tmp_path, monkeypatch, client, "single")
+
+    results = drafter.draft_posts("AI automation")
+
+    assert client.calls[0] == "all"
+    assert sorted(client.calls[1:]) == ["Facebook", "LinkedIn", "tweet"]
+    assert "LinkedIn post about automation" in results["linkedin"].read_text(encoding="utf-8")
+
+
+def test_enforce_length_cuts_at_word_boundary():
+    text = "automation " * 40
+    cut = enforce_length("twitter", text)
+    assert len(cut) <= 280
+    assert cut.endswith("automation...")
+    assert enforce_length("twitter", "short") == "short"
@@ -0,0 +1,46 @@
+import os
+
+from utils import vault_documents
+
+HANDBOOK = """# Company Handbook
+
+**Known Contacts (Auto-Approve Replies)**:
+- Boss@Company.com
+- client@example.com
+
+**Response Rules by Email Type**:
+- **Inquiry**: Professional tone
+"""
+
+
+def bump_mtime(path):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_handbook_is_parsed_once_until_it_changes(tmp_path):
+    handbook = tmp_path / "Company_Handbook.md"
+    handbook.write_text(HANDBOOK, encoding="utf-8")
+    before = vault_documents.stats()
+
+    rules = vault_documents.handbook_rules(handbook)
+    assert rules["known_contacts"] == ("Boss@Company.com", "client@example.com")
+    assert rules["known_contacts_lower"] == {"boss@company.com", "client@example.com"}
+    assert vault_documents.handbook_rules(handbook) is rules
+
+    after = vault_documents.stats()
+    assert after["reads"] - before["reads"] == 1
+    assert after["hits"] - before["hits"] == 1
+
+    handbook.write_text(HANDBOOK.replace("client@example.com", "new@example.com"), encoding="utf-8")
+    bump_mtime(handbook)
+    assert "new@example.com" in vault_documents.handbook_rules(handbook)["known_contacts_lower"]
+
+
+def test_missing_files_yield_defaults_and_appear_later(tmp_path):
+    style = tmp_path / "EmailStyle.md"
+    assert vault_documents.read_cached_text(style) == ""
+    assert vault_documents.handbook_rules(tmp_path / "Company_Handbook.md") == {}
+
+    style.write_text("Casual.", encoding="utf-8")
+    assert vault_documents.read_cached_text(style) == "Casual."
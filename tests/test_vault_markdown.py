@@ -0,0 +1,102 @@
+import os
+
+from utils import vault_markdown
+from utils.vault_markdown import load_document, load_header, parse_markdown
+
+EMAIL_DRAFT = """---
+type: email_draft
+original_from: Jane Doe <jane@example.com>
+original_subject: Invoice question
+gmail_message_id: 18c2f
+attachments:
+  - /tmp/invoice.pdf
+  - /tmp/terms.pdf
+ai_generated: true
+---
+
+## Thread History (Oldest to Newest)
+
+### Message 1: Mon from jane@example.com
+
+Earlier note
+
+---
+
+## Proposed Response
+
+Hi Jane,
+
+Attached is the invoice.
+
+---
+
+## Attachments
+
+```yaml
+attachments:
+  - /not/frontmatter.pdf
+```
+"""
+
+
+def test_parse_markdown_reads_frontmatter_lists_and_sections_in_one_pass():
+    document = parse_markdown(EMAIL_DRAFT)
+
+    assert document.get("original_from") == "Jane Doe <jane@example.com>"
+    assert document.get("ai_generated") == "true"
+    assert document.attachments == ["/tmp/invoice.pdf", "/tmp/terms.pdf"]
+    # Sub-headings stay inside the section; trailing --- rules are dropped
+    assert document.section("Thread History") == "### Message 1: Mon from jane@example.com\n\nEarlier note"
+    assert document.section("Proposed Response", "Your Reply") == "Hi Jane,\n\nAttached is the invoice."
+    assert document.section("Missing", default=None) is None
+    assert document.body.startswith("\n## Thread History")
+    assert document.yaml_frontmatter()["ai_generated"] is True
+
+
+def test_parse_markdown_without_frontmatter_keeps_whole_body():
+    document = parse_markdown("## Message\n\nHello\n")
+    assert document.frontmatter == {}
+    assert document.body == "## Message\n\nHello\n"
+    assert document.section("Message") == "Hello"
+
+
+def test_load_document_reuses_parse_until_file_changes(tmp_path, monkeypatch):
+    path = tmp_path / "WHATSAPP_1.md"
+    path.write_text("---\nfrom: +1555\n---\n\n## Message\n\nHi\n", encoding="utf-8")
+    parses = []
+    real_parse = vault_markdown._parse
+    monkeypatch.setattr(vault_markdown, "_parse", lambda content: parses.append(content) or real_parse(content))
+
+    first = load_document(path)
+    assert load_document(path) is first
+    assert len(parses) == 1
+
+    path.write_text("---\nfrom: +1666\n---\n\n## Message\n\nHello again\n", encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert load_document(path).get("from") == "+1666"
+    assert len(parses) == 2
+
+
+def test_load_header_reads_frontmatter_and_only_the_start_of_the_body(tmp_path):
+    path = tmp_path / "EMAIL_1.md"
+    long_value = "x" * 300
+    path.write_text(
+        f"---\nsubject: Invoice\nnotes: {long_value}\n---\n\n## Original Email\n\n" + "é body " * 5000,
+        encoding="utf-8",
+    )
+
+    header = load_header(path, body_bytes=64)
+
+    # The frontmatter is always complete even when it is longer than the body budget
+    assert header.yaml_frontmatter() == {"subject": "Invoice", "notes": long_value}
+    assert header.truncated is True
+    assert header.section("Original Email").startswith("é body")
+    assert len(header.body.encode("utf-8")) <= 64
+    assert load_header(path, body_bytes=64) is header
+
+    assert len(load_header(path).body.encode("utf-8")) > 4000
+    short = tmp_path / "NOTE.md"
+    short.write_text("No frontmatter at all", encoding="utf-8")
+    assert load_header(short).truncated is False
+    assert load_header(short).body == "No frontmatter at all"
@@ -0,0 +1,126 @@
+"""Action Scheduler - Urgency-ordered queue with aging for approved actions"""
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+
+# Lower rank runs first
+URGENCY_RANK = {
+    'URGENT': 0,
+    'BUSINESS': 1,
+    'NORMAL': 2,
+    'INFO': 3,
+}
+
+HIGH_PRIORITIES = {'HIGH', 'URGENT', 'CRITICAL'}
+
+
+def urgency_class(filename: str, urgency: str = 'NORMAL', priority: str = 'NORMAL') -> str:
+    """Map an approved file's frontmatter to its scheduling class"""
+    label = (urgency or 'NORMAL').strip().upper()
+    if label not in URGENCY_RANK:
+        label = 'NORMAL'
+    # Payments and explicitly high-priority items jump the queue like URGENT messages
+    if 'PAYMENT' in filename.upper() or (priority or '').strip().upper() in HIGH_PRIORITIES:
+        label = 'URGENT'
+    return label
+
+
+class ActionScheduler:
+    """Thread-safe priority queue of approved actions.
+
+    Items are ordered by ``enqueued_at + rank * aging_seconds``: every
+    ``aging_seconds`` spent waiting is worth one urgency class, so a NORMAL
+    item is never overtaken by URGENT work that arrived more than
+    ``2 * aging_seconds`` after it.
+    """
+
+    def __init__(self, aging_seconds: float = 60.0, clock=time.monotonic):
+        self.aging_seconds = aging_seconds
+        self._clock = clock
+        self._heap = []
+        self._queued = set()
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        # Totals plus a bounded window of recent waits for percentiles
+        self._wait_totals = {label: [0, 0.0, 0.0] for label in URGENCY_RANK}
+        self._recent_waits = {label: deque(maxlen=1000) for label in URGENCY_RANK}
+
+    def push(self, key: str, item, label: str = 'NORMAL') -> bool:
+        """Queue an item once; returns False if the key is already waiting"""
+        rank = URGENCY_RANK.get(label, URGENCY_RANK['NORMAL'])
+        with self._lock:
+            if key in self._queued:
+                return False
+            enqueued_at = self._clock()
+            deadline = enqueued_at + rank * self.aging_seconds
+            heapq.heappush(self._heap, (deadline, next(self._counter), key, item, label, enqueued_at))
+            self._queued.add(key)
+            return True
+
+    def pop(self):
+        """Return (item, label, waited_seconds) for the next action, or None if empty"""
+        with self._lock:
+            if not self._heap:
+                return None
+            _, _, key, item, label, enqueued_at = heapq.heappop(self._heap)
+            self._queued.discard(key)
+            return item, label, self._record_wait(label, enqueued_at)
+
+    def pop_matching(self, predicate, limit: int, label: str = None) -> list:
+        """Remove up to ``limit`` queued items accepted by ``predicate``, in run order.
+
+        Used to pull same-kind actions forward so they can share one round-trip.
+        With ``label``, only items of that urgency class or a more urgent one
+        are taken, so an URGENT head never drags NORMAL work ahead of its turn.
+        """
+        max_rank = URGENCY_RANK.get(label, len(URGENCY_RANK)) if label else len(URGENCY_RANK)
+        with self._lock:
+            taken = []
+            for entry in sorted(self._heap):
+                if len(taken) >= limit:
+                    break
+                if URGENCY_RANK.get(entry[4], URGENCY_RANK['NORMAL']) <= max_rank and predicate(entry[3]):
+                    taken.append(entry)
+            if not taken:
+                return []
+            taken_ids = {entry[1] for entry in taken}
+            self._heap = [entry for entry in self._heap if entry[1] not in taken_ids]
+            heapq.heapify(self._heap)
+            popped = []
+            for _, _, key, item, label, enqueued_at in taken:
+                self._queued.discard(key)
+                popped.append((item, label, self._record_wait(label, enqueued_at)))
+            return popped
+
+    def _record_wait(self, label, enqueued_at) -> float:
+        waited = self._clock() - enqueued_at
+        totals = self._wait_totals.setdefault(label, [0, 0.0, 0.0])
+        totals[0] += 1
+        totals[1] += waited
+        totals[2] = max(totals[2], waited)
+        self._recent_waits.setdefault(label, deque(maxlen=1000)).append(waited)
+        return waited
+
+    def __len__(self):
+        with self._lock:
+            return len(self._heap)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._queued
+
+    def wait_stats(self) -> dict:
+        """Queue-wait time per urgency class since startup"""
+        with self._lock:
+            stats = {}
+            for label, (count, total, longest) in self._wait_totals.items():
+                recent = sorted(self._recent_waits[label])
+                stats[label] = {
+                    'count': count,
+                    'avg_wait_s': round(total / count, 3) if count else 0.0,
+                    'p50_wait_s': round(recent[len(recent) // 2], 3) if recent else 0.0,
+                    'max_wait_s': round(longest, 3),
+                }
+            return stats
@@ -0,0 +1,189 @@
+"""Dedup Store - Bounded, optionally persistent "seen" sets for the orchestrator"""
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+
+def _normalize(key) -> str:
+    """Tuple keys like (source_file, message_id) are stored as one string"""
+    if isinstance(key, tuple):
+        return '\x1f'.join(str(part) for part in key)
+    return str(key)
+
+
+class DedupStore:
+    """Set-like store with TTL expiry and LRU eviction.
+
+    Membership checks are O(1) dict lookups and memory never exceeds
+    ``max_entries`` keys. This base class is memory-only; subclasses add a
+    backing store so entries survive restarts.
+    """
+
+    def __init__(self, max_entries: int = 100_000, ttl_seconds: float = 7 * 24 * 3600,
+                 clock=time.time):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> expires_at, oldest first
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def __contains__(self, key) -> bool:
+        key = _normalize(key)
+        with self._lock:
+            expires_at = self._entries.get(key)
+            if expires_at is None:
+                expires_at = self._load(key)
+                if expires_at is None:
+                    return False
+                self._remember(key, expires_at)
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return False
+            self._entries.move_to_end(key)
+            return True
+
+    def add(self, key):
+        key = _normalize(key)
+        expires_at = self._clock() + self.ttl_seconds
+        with self._lock:
+            self._remember(key, expires_at)
+            self._save([(key, expires_at)])
+
+    def update(self, keys):
+        expires_at = self._clock() + self.ttl_seconds
+        rows = [(_normalize(key), expires_at) for key in keys]
+        with self._lock:
+            for key, _ in rows:
+                self._remember(key, expires_at)
+            self._save(rows)
+
+    def discard(self, key):
+        key = _normalize(key)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._delete(key)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _remember(self, key, expires_at):
+        self._entries[key] = expires_at
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    # Backing-store hooks (no-ops for the memory-only store)
+    def _load(self, key):
+        return None
+
+    def _save(self, rows):
+        pass
+
+    def _delete(self, key):
+        pass
+
+    def close(self):
+        pass
+
+
+class SqliteDedupStore(DedupStore):
+    """DedupStore that writes through to a local SQLite file.
+
+    The in-memory LRU is a cache over the table; misses fall back to a
+    primary-key lookup so entries evicted from memory (or written before a
+    restart) are still honoured until their TTL. Expired rows are pruned and
+    the table is capped at ``max_disk_entries`` per namespace.
+    """
+
+    PRUNE_EVERY = 1000  # writes between expiry/size sweeps
+
+    def __init__(self, path: Path, namespace: str, max_entries: int = 100_000,
+                 ttl_seconds: float = 7 * 24 * 3600, max_disk_entries: int = None,
+                 clock=time.time):
+        super().__init__(max_entries=max_entries, ttl_seconds=ttl_seconds, clock=clock)
+        self.path = Path(path)
+        self.namespace = namespace
+        self.max_disk_entries = max_disk_entries or max_entries * 10
+        self._conn = None  # opened on first use so constructing a handler touches no files
+        self._writes = 0
+
+    @property
+    def _db(self):
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS seen ('
+                ' namespace TEXT NOT NULL, key TEXT NOT NULL, expires_at REAL NOT NULL,'
+                ' PRIMARY KEY (namespace, key)) WITHOUT ROWID'
+            )
+            self._conn.execute('CREATE INDEX IF NOT EXISTS seen_expiry ON seen (namespace, expires_at)')
+            self._conn.commit()
+        return self._conn
+
+    def _load(self, key):
+        if self._conn is None and not self.path.exists():
+            return None
+        row = self._db.execute(
+            'SELECT expires_at FROM seen WHERE namespace = ? AND key = ?',
+            (self.namespace, key),
+        ).fetchone()
+        return row[0] if row else None
+
+    def _save(self, rows):
+        self._db.executemany(
+            'INSERT OR REPLACE INTO seen (namespace, key, expires_at) VALUES (?, ?, ?)',
+            [(self.namespace, key, expires_at) for key, expires_at in rows],
+        )
+        self._db.commit()
+        self._writes += len(rows)
+        if self._writes >= self.PRUNE_EVERY:
+            self._writes = 0
+            self._prune()
+
+    def _delete(self, key):
+        self._db.execute('DELETE FROM seen WHERE namespace = ? AND key = ?', (self.namespace, key))
+        self._db.commit()
+
+    def _prune(self):
+        self._db.execute(
+            'DELETE FROM seen WHERE namespace = ? AND expires_at <= ?',
+            (self.namespace, self._clock()),
+        )
+        # Every row shares one TTL, so the earliest expiry is also the least recently added
+        self._db.execute(
+            'DELETE FROM seen WHERE namespace = ? AND key IN ('
+            ' SELECT key FROM seen WHERE namespace = ?'
+            ' ORDER BY expires_at DESC LIMIT -1 OFFSET ?)',
+            (self.namespace, self.namespace, self.max_disk_entries),
+        )
+        self._db.commit()
+
+    def disk_entries(self) -> int:
+        with self._lock:
+            return self._db.execute(
+                'SELECT COUNT(*) FROM seen WHERE namespace = ?', (self.namespace,)
+            ).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def open_dedup_store(namespace: str, path: Path = None, backend: str = 'sqlite',
+                     max_entries: int = 100_000, ttl_seconds: float = 7 * 24 * 3600) -> DedupStore:
+    """Build the configured store; ``backend='memory'`` keeps nothing across restarts"""
+    if backend == 'memory' or path is None:
+        return DedupStore(max_entries=max_entries, ttl_seconds=ttl_seconds)
+    if backend != 'sqlite':
+        raise ValueError(f"Unknown dedup backend: {backend}")
+    return SqliteDedupStore(path, namespace, max_entries=max_entries, ttl_seconds=ttl_seconds)
@@ -0,0 +1,147 @@
+"""Email Classifier - HUMAN/BOT verdicts from the LLM, many emails per request"""
+import json
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+MODEL = "gpt-4o-mini"
+BODY_CHARS = 2000  # Per-email body sent for a single check
+BATCH_BODY_CHARS = 600  # Per-email body inside a batch; headers carry most of the signal
+BATCH_TOKENS_PER_EMAIL = 32  # {"id": "<16-hex Gmail id>", "verdict": "HUMAN"} is ~20 tokens; headroom avoids truncation
+
+SYSTEM_PROMPT = """You are an email filter that determines if an email is from a REAL PERSON or an AUTOMATED SYSTEM.
+
+Return only "HUMAN" or "BOT".
+
+Return BOT for:
+- No-reply addresses (noreply@, donotreply@, automated@, etc)
+- System notifications (password reset, verification, alerts)
+- Transactional emails (receipts, confirmations, invoices, shipping)
+- Automated responses (out of office, auto-reply, undeliverable)
+- Marketing/bulk emails (newsletters, promotional, surveys)
+- Explicitly says "do not reply"
+
+Return HUMAN for:
+- Emails from real people (even if brief like "Hi" or "Yes")
+- Questions or requests
+- Conversations from colleagues/friends/contacts
+- Anything that seems personally addressed to you
+- When in doubt, assume HUMAN (don't be aggressive)"""
+
+BATCH_INSTRUCTIONS = """
+
+You will receive several emails, each tagged with an "id".
+Respond with only a JSON array containing one object per email, in any order:
+[{"id": "<id>", "verdict": "HUMAN"}, {"id": "<id>", "verdict": "BOT"}]"""
+
+JSON_ARRAY = re.compile(r'\[.*\]', re.DOTALL)
+
+
+def parse_batch_verdicts(text: str, ids) -> dict:
+    """{id: is_human} for every id the model answered unambiguously; raises ValueError if unparseable"""
+    match = JSON_ARRAY.search(text or '')
+    if not match:
+        raise ValueError("no JSON array in classifier response")
+    items = json.loads(match.group(0))
+    if not isinstance(items, list):
+        raise ValueError("classifier response is not a JSON array")
+    wanted = set(ids)
+    verdicts = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        email_id = str(item.get('id', ''))
+        verdict = str(item.get('verdict', '')).strip().upper()
+        if email_id in wanted and verdict in ('HUMAN', 'BOT'):
+            verdicts[email_id] = verdict == 'HUMAN'
+    return verdicts
+
+
+class BotClassifier:
+    """Ask the model whether emails come from people, ``batch_size`` emails per request.
+
+    Emails are dicts with ``id``, ``from``, ``subject`` and ``body``. A batch
+    whose reply cannot be parsed, or that leaves some ids unanswered, falls
+    back to one request per remaining email. An email the model still
+    cannot judge (the request itself failed) gets ``None`` rather than a
+    verdict, so callers can include it without remembering it as HUMAN.
+    """
+
+    def __init__(self, client, batch_size: int = 10, model: str = MODEL):
+        self.client = client
+        self.batch_size = max(1, batch_size)
+        self.model = model
+        self.requests = 0
+        self.fallbacks = 0
+
+    def classify(self, emails) -> dict:
+        """{id: is_human, or None if the model could not be asked} for every email"""
+        emails = list(emails)
+        verdicts = {}
+        for start in range(0, len(emails), self.batch_size):
+            chunk = emails[start:start + self.batch_size]
+            if len(chunk) > 1:
+                verdicts.update(self._classify_batch(chunk))
+            for email in chunk:
+                if email['id'] not in verdicts:
+                    verdicts[email['id']] = self.classify_one(email)
+        return verdicts
+
+    def classify_one(self, email: dict):
+        """True for HUMAN, False for BOT, None when the request fails"""
+        try:
+            decision = self._complete(
+                SYSTEM_PROMPT,
+                f"""Email Analysis:
+
+From: {email.get('from', '')}
+Subject: {email.get('subject', '')}
+Body: {email.get('body', '')[:BODY_CHARS]}
+
+Is this from a HUMAN or a BOT/AUTOMATED SYSTEM?""",
+                max_tokens=10,
+            )
+            return "HUMAN" in decision.strip().upper()
+        except Exception as e:
+            logger.error(f"AI filtering error: {e}")
+            return None  # No verdict; callers include the email but don't cache the sender
+
+    def _classify_batch(self, chunk) -> dict:
+        ids = [str(email['id']) for email in chunk]
+        payload = json.dumps([
+            {
+                'id': str(email['id']),
+                'from': email.get('from', ''),
+                'subject': email.get('subject', ''),
+                'body': email.get('body', '')[:BATCH_BODY_CHARS],
+            }
+            for email in chunk
+        ], ensure_ascii=False)
+        try:
+            text = self._complete(
+                SYSTEM_PROMPT + BATCH_INSTRUCTIONS,
+                f"Classify these emails:\n{payload}",
+                max_tokens=BATCH_TOKENS_PER_EMAIL * (len(chunk) + 1),
+            )
+            verdicts = parse_batch_verdicts(text, ids)
+        except Exception as e:
+            logger.warning(f"Batch classification failed, falling back to single calls: {e}")
+            verdicts = {}
+        missing = len(ids) - len(verdicts)
+        if missing:
+            self.fallbacks += missing
+        return verdicts
+
+    def _complete(self, system: str, user: str, max_tokens: int) -> str:
+        self.requests += 1
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": user},
+            ],
+            temperature=0.3,
+            max_tokens=max_tokens,
+        )
+        return response.choices[0].message.content or ''
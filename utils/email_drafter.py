@@ -3,10 +3,16 @@ import os
 import json
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Tuple
 
+from utils import vault_documents
+from utils.llm_cache import wrap_client
+from utils.prompt_builder import clean_message, count_tokens, fit_thread, truncate_tokens
+from utils.vault_markdown import load_document
+
 # Load environment variables from .env file
 try:
     from dotenv import load_dotenv
@@ -16,6 +22,58 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+TONE_CHECK_MODES = ('separate', 'merged', 'off')
+NEUTRAL_TONE = {'matches_style': True, 'deviations': [], 'confidence': 1.0}
+
+SELF_ASSESSMENT_INSTRUCTIONS = """
+
+OUTPUT FORMAT (overrides "ONLY the email body text" above):
+Return ONLY a JSON object (no markdown, no code blocks):
+{
+  "reply": "<the email body text, plain text with newlines>",
+  "style_check": {
+    "matches_style": true/false,
+    "deviations": ["list of specific differences from the style guide"],
+    "confidence": 0.0-1.0
+  }
+}
+For style_check, honestly compare your reply against the PERSONALIZED WRITING STYLE.
+Flag major deviations only: tone (too formal vs too casual), missing signature elements,
+significant structural differences, missing or incorrect closing."""
+
+
+def normalize_tone_analysis(result) -> dict:
+    """Coerce a model's style check into {matches_style, deviations, confidence}"""
+    if not isinstance(result, dict):
+        return dict(NEUTRAL_TONE)
+    deviations = result.get('deviations') or []
+    if isinstance(deviations, str):
+        deviations = [deviations]
+    try:
+        confidence = float(result.get('confidence', 1.0))
+    except (TypeError, ValueError):
+        confidence = 1.0
+    return {
+        'matches_style': bool(result.get('matches_style', True)),
+        'deviations': [str(d) for d in deviations],
+        'confidence': min(max(confidence, 0.0), 1.0),
+    }
+
+
+def parse_self_assessed_draft(text: str) -> Tuple[str, dict]:
+    """Split a merged draft response into (reply, tone analysis); raises ValueError if unusable"""
+    try:
+        payload = json.loads(text or '')
+    except json.JSONDecodeError as e:
+        raise ValueError(f"draft response is not JSON: {e}")
+    if not isinstance(payload, dict):
+        raise ValueError("draft response is not a JSON object")
+    reply = payload.get('reply')
+    if not isinstance(reply, str) or not reply.strip():
+        raise ValueError("draft response has no reply text")
+    return reply, normalize_tone_analysis(payload.get('style_check'))
+
+
 class EmailDrafter:
     """Uses OpenAI API to intelligently draft email responses"""
 
@@ -31,12 +89,26 @@ class EmailDrafter:
         self.model = "gpt-4o-mini"
         self.client = None
         self.client_type = None
+        # separate: tone check is its own call after the draft; merged: the draft
+        # call returns a style self-assessment; off: no tone check
+        self.tone_check = os.getenv('EMAIL_TONE_CHECK', 'separate').strip().lower()
+        if self.tone_check not in TONE_CHECK_MODES:
+            logger.warning(f"Unknown EMAIL_TONE_CHECK '{self.tone_check}' - using 'separate'")
+            self.tone_check = 'separate'
+        # Token budget for the variable part of the draft prompt (message, style guide, thread)
+        self.prompt_token_budget = int(os.getenv('EMAIL_PROMPT_TOKEN_BUDGET', '6000'))
+        self.style_token_budget = int(os.getenv('EMAIL_STYLE_TOKEN_BUDGET', '1500'))
+        # Thread summaries run beside the draft call; they never depend on it
+        self.summary_pool = ThreadPoolExecutor(
+            max_workers=int(os.getenv('EMAIL_SUMMARY_WORKERS', '4')),
+            thread_name_prefix='email-summary',
+        )
 
         # Initialize OpenAI client
         if self.api_key:
             try:
                 from openai import OpenAI
-                self.client = OpenAI(api_key=self.api_key)
+                self.client = wrap_client(OpenAI(api_key=self.api_key), self.vault)
                 self.client_type = "openai"
                 logger.info("✓ OpenAI initialized (gpt-4o-mini)")
                 return
@@ -64,95 +136,31 @@ class EmailDrafter:
             f.write(email_filename + '\n')
 
     def _load_handbook_rules(self) -> dict:
-        """Load automation rules from Company_Handbook.md"""
-        if not self.handbook.exists():
-            return {}
-
-        handbook_text = self.handbook.read_text()
-
-        # Parse known contacts
-        known_contacts = []
-        if "Known Contacts" in handbook_text:
-            section = handbook_text.split("Known Contacts")[1].split("**Response Rules")[0]
-            for line in section.split('\n'):
-                if line.strip().startswith('- '):
-                    email = line.strip().lstrip('- ')
-                    known_contacts.append(email)
-
-        return {
-            'known_contacts': known_contacts,
-            'handbook_text': handbook_text
-        }
+        """Automation rules from Company_Handbook.md (cached until the file changes)"""
+        return vault_documents.handbook_rules(self.handbook)
 
     def _load_email_style(self) -> str:
-        """Load user's personalized email writing style guide"""
-        if not self.email_style_path.exists():
+        """User's personalized email writing style guide (cached until the file changes)"""
+        email_style = vault_documents.read_cached_text(self.email_style_path)
+        if not email_style:
             logger.debug("EmailStyle.md not found - using default style")
-            return ""
-
-        try:
-            content = self.email_style_path.read_text()
-            logger.debug("✓ Email style guide loaded")
-            return content
-        except Exception as e:
-            logger.error(f"Error loading email style: {e}")
-            return ""
+        return email_style
 
     def _parse_email(self, email_file: Path) -> dict:
         """Parse markdown email file"""
-        content = email_file.read_text()
-
-        # Parse frontmatter
-        parts = content.split('---')
-        metadata = {}
-
-        if len(parts) >= 2:
-            frontmatter = parts[1]
-            for line in frontmatter.split('\n'):
-                if ':' in line:
-                    key, val = line.split(':', 1)
-                    metadata[key.strip()] = val.strip()
-
-        # Extract body sections
-        body = ''.join(parts[2:]) if len(parts) > 2 else ''
-
-        # Extract thread history from body if present
-        thread_history = ''
-        if '## Thread History' in body:
-            thread_section = body.split('## Thread History')[1]
-            # Get everything until the next section (##)
-            if '## Current Message' in thread_section:
-                thread_history = thread_section.split('## Current Message')[0].strip()
-            else:
-                # If no Current Message section, take until next ## section
-                thread_parts = thread_section.split('##')
-                if len(thread_parts) > 0:
-                    thread_history = '##'.join(thread_parts[:-1]).strip() if len(thread_parts) > 1 else thread_parts[0].strip()
-
-        # Extract current message body (everything after "## Current Message" or last ## section)
-        email_body = body
-        if '## Current Message' in body:
-            email_body = body.split('## Current Message')[1].split('##')[0].strip()
-        elif '## Body' in body:
-            email_body = body.split('## Body')[1].split('##')[0].strip()
+        document = load_document(email_file)
+        metadata = document.frontmatter
+
+        # Thread history and the current message are ## sections written by GmailWatcher
+        thread_history = document.section('Thread History')
+        email_body = document.section('Current Message', 'Body', default=None)
+        if email_body is None:
+            email_body = document.body
 
         # Parse thread metadata
         is_reply = metadata.get('is_reply', 'false').lower() == 'true'
         thread_id = metadata.get('thread_id', '')
-
-        # Parse attachments from frontmatter if present
-        attachments = []
-        if 'attachments:' in frontmatter:
-            in_attachments = False
-            for line in frontmatter.split('\n'):
-                if line.strip() == 'attachments:':
-                    in_attachments = True
-                elif in_attachments and line.strip().startswith('- '):
-                    attachment = line.strip().lstrip('- ').strip()
-                    if attachment:
-                        attachments.append(attachment)
-                elif in_attachments and not line.strip().startswith('- '):
-                    break
+        attachments = list(document.attachments)
 
         return {
             'filename': email_file.name,
@@ -174,8 +182,8 @@ class EmailDrafter:
         sender = email['from'].lower()
 
         # Check if known contact
-        known_contacts = handbook_rules.get('known_contacts', [])
-        is_known = any(contact.lower() in sender for contact in known_contacts)
+        known_contacts = handbook_rules.get('known_contacts_lower', ())
+        is_known = any(contact in sender for contact in known_contacts)
 
         # Classify by subject keywords
         if any(word in subject for word in ['meeting', 'schedule', 'calendar', 'time?']):
@@ -195,24 +203,31 @@ class EmailDrafter:
 
         return email_type, auto_approve
 
-    def _generate_draft(self, email: dict, email_type: str, handbook_rules: dict) -> Tuple[str, float]:
-        """Use OpenAI to generate email response draft"""
+    def _generate_draft(self, email: dict, email_type: str, handbook_rules: dict,
+                        self_assess: bool = False) -> Tuple[str, float, Optional[dict]]:
+        """Use OpenAI to generate email response draft.
+
+        With ``self_assess`` the same call also grades the draft against
+        EmailStyle.md and the third element is that tone analysis; it is None
+        otherwise, or when the structured reply could not be parsed (the plain
+        draft is then requested again so the caller still gets usable text).
+        """
 
         if not self.client or not self.model:
             logger.warning("OpenAI not configured - using template response")
-            return self._generate_template_response(email), 0.0
+            return self._generate_template_response(email), 0.0, None
 
-        # Load personalized email style
-        email_style = self._load_email_style()
+        # Load personalized email style and trim the thread/body/style to the token budget
+        body, thread_history, email_style = self._assemble_prompt_parts(email, self._load_email_style())
         style_section = ""
         if email_style:
             style_section = f"\n\nPERSONALIZED WRITING STYLE:\n{email_style}\n\nWhen drafting this email, match the tone, style, and voice from the style guide above as closely as possible."
 
         # Build context-aware prompt based on whether this is a reply
-        if email.get('is_reply') and email.get('thread_history'):
+        if email.get('is_reply') and thread_history:
             prompt = f"""THREAD CONTEXT (Previous Conversation):
 
-{email['thread_history']}
+{thread_history}
 
 ---
 
@@ -220,7 +235,7 @@ LATEST MESSAGE (Reply to this):
 From: {email['from']}
 Subject: {email['subject']}
 
-{email['body']}
+{body}
 
 ---
 
@@ -247,7 +262,7 @@ Provide ONLY the email body text. No markdown formatting, no headers."""
 From: {email['from']}
 Subject: {email['subject']}
 
-{email['body']}
+{body}
 
 ---
 
@@ -267,6 +282,9 @@ RESPONSE FORMAT:
 
 Provide ONLY the email body text. No markdown formatting, no headers."""
 
+        assess_section = SELF_ASSESSMENT_INSTRUCTIONS if self_assess and email_style else ""
+        extra = {"response_format": {"type": "json_object"}} if assess_section else {}
+
         try:
             # Call OpenAI API
             if self.client_type == "openai":
@@ -312,25 +330,53 @@ Hamza Paracha
 ---
 This message was composed with AI assistance and reviewed by Hamza Paracha before transmission.
 
-IMPORTANT: This is a Human-in-the-Loop (HITL) system. Hamza reviews all drafts before sending. Be helpful but never autonomous on commitments.{style_section}"""},
+IMPORTANT: This is a Human-in-the-Loop (HITL) system. Hamza reviews all drafts before sending. Be helpful but never autonomous on commitments.{style_section}{assess_section}"""},
                         {"role": "user", "content": prompt}
                     ],
                     temperature=0.7,
-                    max_tokens=1000
+                    max_tokens=1300 if assess_section else 1000,
+                    **extra
                 )
                 draft = response.choices[0].message.content
             else:
                 # Shouldn't happen, but fallback just in case
-                return self._generate_template_response(email), 0.7
+                return self._generate_template_response(email), 0.7, None
+
+            tone_analysis = None
+            if assess_section:
+                try:
+                    draft, tone_analysis = parse_self_assessed_draft(draft)
+                except ValueError as e:
+                    logger.warning(f"Self-assessed draft unusable ({e}) - requesting plain draft")
+                    return self._generate_draft(email, email_type, handbook_rules)
 
             confidence = 0.90  # OpenAI responses are generally high confidence
             logger.info(f"✓ Draft generated via OpenAI API ({self.model})")
-            return draft, confidence
+            return draft, confidence, tone_analysis
 
         except Exception as e:
             logger.error(f"OpenAI API error: {e}")
             logger.warning("Falling back to template response")
-            return self._generate_template_response(email), 0.7
+            return self._generate_template_response(email), 0.7, None
+
+    def _assemble_prompt_parts(self, email: dict, email_style: str) -> Tuple[str, str, str]:
+        """(body, thread history, style guide) with quotes stripped and trimmed to the token budget.
+
+        The latest message is kept whole, the style guide is capped at
+        ``style_token_budget`` and the thread gets whatever budget is left,
+        newest messages first.
+        """
+        body = clean_message(email['body'])
+        style = truncate_tokens(email_style, self.style_token_budget) if email_style else ""
+        thread = ""
+        if email.get('is_reply') and email.get('thread_history'):
+            remaining = self.prompt_token_budget - count_tokens(body) - count_tokens(style)
+            thread = fit_thread(email['thread_history'], max(remaining, 0))
+
+        before = sum(count_tokens(part) for part in (email['body'], email.get('thread_history', ''), email_style))
+        after = sum(count_tokens(part) for part in (body, thread, style))
+        logger.info(f"  Prompt tokens: {before} → {after} (budget {self.prompt_token_budget})")
+        return body, thread, style
 
     def _generate_template_response(self, email: dict) -> str:
         """Fallback template response if OpenAI is unavailable"""
@@ -349,7 +395,7 @@ Hamza Paracha's AI Assistant"""
     def _analyze_tone_deviation(self, draft_text: str, email_style: str) -> dict:
         """Compare draft tone against user's style guide"""
         if not self.client or not email_style:
-            return {'matches_style': True, 'deviations': [], 'confidence': 1.0}
+            return dict(NEUTRAL_TONE)
 
         try:
             response = self.client.chat.completions.create(
@@ -359,7 +405,7 @@ Hamza Paracha's AI Assistant"""
                     "content": f"""Compare this draft email against the user's style guide.
 
 STYLE GUIDE:
-{email_style}
+{truncate_tokens(email_style, self.style_token_budget)}
 
 DRAFT EMAIL:
 {draft_text}
@@ -384,17 +430,16 @@ Don't flag minor style differences."""
             )
 
             try:
-                import json as json_module
-                result = json_module.loads(response.choices[0].message.content)
+                result = json.loads(response.choices[0].message.content)
                 logger.debug("✓ Tone analysis complete")
                 return result
-            except json_module.JSONDecodeError:
+            except json.JSONDecodeError:
                 logger.debug("Failed to parse tone analysis response as JSON")
-                return {'matches_style': True, 'deviations': [], 'confidence': 1.0}
+                return dict(NEUTRAL_TONE)
 
         except Exception as e:
             logger.error(f"Tone analysis error: {e}")
-            return {'matches_style': True, 'deviations': [], 'confidence': 1.0}
+            return dict(NEUTRAL_TONE)
 
     def _generate_thread_summary(self, thread_history: str) -> str:
         """Generate AI summary of email thread"""
@@ -412,7 +457,7 @@ Don't flag minor style differences."""
 - What's still pending
 
 THREAD:
-{thread_history}
+{fit_thread(thread_history, self.prompt_token_budget)}
 
 Return ONLY bullet points, no introduction."""
                 }],
@@ -432,7 +477,7 @@ Return ONLY bullet points, no introduction."""
         """Create draft approval file in Pending_Approval/ or Approved/ if auto-approve"""
 
         # Generate filename
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
         draft_filename = f"EMAIL_DRAFT_{timestamp}.md"
         # If auto-approved, send directly to Approved folder for immediate sending
         draft_path = self.vault / 'Approved' / draft_filename if auto_approve else self.pending / draft_filename
@@ -603,23 +648,24 @@ This response was composed with advanced AI assistance and has been reviewed by
         email_type, auto_approve = self._classify_email_type(email, handbook_rules)
         logger.debug(f"  Type: {email_type}, Auto-approve: {auto_approve}")
 
-        # Generate draft via AI
-        draft_response, confidence = self._generate_draft(email, email_type, handbook_rules)
-
-        # Generate thread summary if this is a reply
-        thread_summary = ""
-        if email.get('is_reply') and email.get('thread_history'):
-            thread_summary = self._generate_thread_summary(email['thread_history'])
+        # Start the thread summary first - it only needs the history, so it
+        # runs while the draft (and any tone check) is being generated
+        summary_future = None
+        if self.client and email.get('is_reply') and email.get('thread_history'):
+            summary_future = self.summary_pool.submit(self._generate_thread_summary, email['thread_history'])
 
-        # Add thread summary to email dict for draft file creation
-        email['thread_summary'] = thread_summary
+        # Generate draft via AI (merged mode folds the tone check into this call)
+        email_style = self._load_email_style() if self.tone_check != 'off' else ""
+        draft_response, confidence, tone_analysis = self._generate_draft(
+            email, email_type, handbook_rules, self_assess=self.tone_check == 'merged')
 
-        # Analyze tone deviation if EmailStyle.md exists
-        email_style = self._load_email_style()
-        tone_analysis = None
-        if email_style:
+        # Analyze tone deviation if EmailStyle.md exists and the draft didn't grade itself
+        if email_style and tone_analysis is None:
             tone_analysis = self._analyze_tone_deviation(draft_response, email_style)
 
+        # Add thread summary to email dict for draft file creation
+        email['thread_summary'] = summary_future.result() if summary_future else ""
+
         # Add tone analysis to email dict for draft file creation
         email['tone_analysis'] = tone_analysis
 
@@ -631,6 +677,10 @@ This response was composed with advanced AI assistance and has been reviewed by
 
         return draft_path
 
+    def close(self):
+        """Stop the thread-summary workers; summaries still running finish on their own"""
+        self.summary_pool.shutdown(wait=False)
+
 
 # CLI for testing
 if __name__ == '__main__':
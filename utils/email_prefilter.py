@@ -0,0 +1,112 @@
+"""Email Pre-filter - Decide obvious human/bot emails from headers before asking the LLM"""
+import re
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parseaddr
+from pathlib import Path
+
+from utils import vault_documents
+
+HUMAN = 'HUMAN'
+BOT = 'BOT'
+
+NOREPLY_PATTERN = re.compile(
+    r'^(?:no[-_.]?reply|do[-_.]?not[-_.]?reply|mailer[-_.]daemon|postmaster|bounces?|'
+    r'notifications?|alerts?|automated|auto[-_.]?confirm)\b'
+)
+BULK_PRECEDENCE = {'bulk', 'list', 'junk'}
+
+
+class EmailPrefilter:
+    """Header heuristics plus a per-sender verdict cache in front of the LLM check.
+
+    ``classify`` returns ``(HUMAN|BOT, reason)`` when the headers settle it
+    and ``(None, 'ambiguous')`` otherwise; callers ask the model only then
+    and report its answer through ``record_llm`` so the sender's next email
+    is decided locally. ``stats`` shows how many model calls (and roughly
+    how much latency) the local stage saved.
+    """
+
+    def __init__(self, handbook: Path = None, cache_size: int = 1000, verdict_ttl: float = 7 * 24 * 3600,
+                 clock=time.monotonic):
+        self.handbook = Path(handbook) if handbook else None
+        self.cache_size = cache_size
+        self.verdict_ttl = verdict_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._verdicts = OrderedDict()  # sender -> (verdict, expires_at)
+        self.hits = {}
+        self.llm_calls = 0
+        self.llm_seconds = 0.0
+
+    def known_contacts(self) -> set:
+        """Handbook contacts (lowercased), parsed once for every drafter and filter"""
+        if not self.handbook:
+            return frozenset()
+        return vault_documents.handbook_rules(self.handbook).get('known_contacts_lower', frozenset())
+
+    def classify(self, headers: dict):
+        """Decide from lowercased headers; returns (verdict or None, reason)"""
+        verdict, reason = self._classify(headers)
+        with self._lock:
+            self.hits[reason] = self.hits.get(reason, 0) + 1
+        return verdict, reason
+
+    def _classify(self, headers):
+        sender = parseaddr(headers.get('from', ''))[1].lower()
+        # Auto-replies from known contacts (out of office, vacation) are still automated
+        if headers.get('auto-submitted', 'no').strip().lower() != 'no':
+            return BOT, 'auto_submitted'
+        if sender and sender in self.known_contacts():
+            return HUMAN, 'known_contact'
+        if headers.get('precedence', '').strip().lower() in BULK_PRECEDENCE:
+            return BOT, 'bulk_precedence'
+        # List-Id alone also marks people writing to a discussion list or Google Group
+        if 'list-unsubscribe' in headers:
+            return BOT, 'mailing_list'
+        if NOREPLY_PATTERN.match(sender.split('@')[0]):
+            return BOT, 'noreply_sender'
+        cached = self._cached_verdict(sender)
+        if cached:
+            return cached, 'sender_cache'
+        return None, 'ambiguous'
+
+    def _cached_verdict(self, sender):
+        with self._lock:
+            entry = self._verdicts.get(sender)
+            if entry is None:
+                return None
+            verdict, expires_at = entry
+            if expires_at <= self._clock():
+                del self._verdicts[sender]
+                return None
+            self._verdicts.move_to_end(sender)
+            return verdict
+
+    def record_llm(self, headers: dict, verdict: str, seconds: float):
+        """Remember the model's verdict for this sender and account for the call"""
+        sender = parseaddr(headers.get('from', ''))[1].lower()
+        with self._lock:
+            self.llm_calls += 1
+            self.llm_seconds += seconds
+            if sender:
+                self._verdicts[sender] = (verdict, self._clock() + self.verdict_ttl)
+                self._verdicts.move_to_end(sender)
+                while len(self._verdicts) > self.cache_size:
+                    self._verdicts.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            decided = sum(count for reason, count in self.hits.items() if reason != 'ambiguous')
+            total = decided + self.hits.get('ambiguous', 0)
+            avg_llm = self.llm_seconds / self.llm_calls if self.llm_calls else 0.0
+            return {
+                'checked': total,
+                'decided_locally': decided,
+                'hit_rate': round(decided / total, 3) if total else 0.0,
+                'by_reason': dict(self.hits),
+                'llm_calls': self.llm_calls,
+                'avg_llm_s': round(avg_llm, 3),
+                'est_saved_s': round(decided * avg_llm, 2),
+            }
@@ -0,0 +1,81 @@
+"""HTTP Client - Shared keep-alive sessions for outbound social and messaging APIs"""
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+POOL_CONNECTIONS = 10  # Distinct hosts kept per session
+POOL_MAXSIZE = 10  # Open connections kept per host
+
+
+def default_timeout():
+    """(connect, read) seconds, overridable via HTTP_CONNECT_TIMEOUT / HTTP_READ_TIMEOUT"""
+    return (
+        float(os.getenv('HTTP_CONNECT_TIMEOUT', '5')),
+        float(os.getenv('HTTP_READ_TIMEOUT', '30')),
+    )
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """Per-host connection pool that applies a default timeout when a call gives none"""
+
+    def __init__(self, timeout=None, **kwargs):
+        self.timeout = timeout or default_timeout()
+        kwargs.setdefault('pool_connections', POOL_CONNECTIONS)
+        kwargs.setdefault('pool_maxsize', POOL_MAXSIZE)
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def configure(session, timeout=None):
+    """Mount pooled, timeout-enforcing adapters on a requests.Session (or subclass)"""
+    adapter = TimeoutHTTPAdapter(timeout=timeout)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+_lock = threading.Lock()
+_sessions = {}
+_oauth1_sessions = {}
+
+
+def get_session(name: str = 'default') -> requests.Session:
+    """Process-wide session for one API, so repeat calls reuse its TLS connections"""
+    with _lock:
+        session = _sessions.get(name)
+        if session is None:
+            session = _sessions[name] = configure(requests.Session())
+        return session
+
+
+def oauth1_session(client_key, client_secret, resource_owner_key, resource_owner_secret):
+    """Cached OAuth1Session per credential set (requires requests-oauthlib)"""
+    from requests_oauthlib import OAuth1Session
+
+    key = (client_key, client_secret, resource_owner_key, resource_owner_secret)
+    with _lock:
+        session = _oauth1_sessions.get(key)
+        if session is None:
+            session = _oauth1_sessions[key] = configure(OAuth1Session(
+                client_key,
+                client_secret=client_secret,
+                resource_owner_key=resource_owner_key,
+                resource_owner_secret=resource_owner_secret,
+            ))
+        return session
+
+
+def close_sessions():
+    """Close every pooled connection (on shutdown, or after credentials rotate)"""
+    with _lock:
+        sessions = list(_sessions.values()) + list(_oauth1_sessions.values())
+        _sessions.clear()
+        _oauth1_sessions.clear()
+    for session in sessions:
+        session.close()
@@ -0,0 +1,136 @@
+"""Invoice Draft Index - O(1) lookup of pending invoice drafts by source file or message id"""
+import sqlite3
+import threading
+from collections import defaultdict
+from pathlib import Path
+
+
+def read_draft_keys(draft: Path):
+    """Return (source_file, message_id) from a draft's frontmatter without reading the body"""
+    source_file, message_id = '', ''
+    with open(draft, encoding='utf-8', errors='replace') as f:
+        if f.readline().strip() != '---':
+            return source_file, message_id
+        for line in f:
+            line = line.strip()
+            if line == '---':
+                break
+            if line.startswith('source_file:'):
+                source_file = line.split(':', 1)[1].strip()
+            elif line.startswith('message_id:'):
+                message_id = line.split(':', 1)[1].strip()
+    return source_file, message_id
+
+
+class InvoiceDraftIndex:
+    """Persistent index of INVOICE_DRAFT_*.md files in Pending_Approval.
+
+    Rows live in SQLite so a restart only reads drafts created while the
+    orchestrator was down. Hits are confirmed with a stat() so drafts that were
+    approved, moved or deleted without an event are dropped on the next lookup.
+    """
+
+    PATTERN = 'INVOICE_DRAFT_*.md'
+
+    def __init__(self, drafts_dir: Path, db_path: Path):
+        self.drafts_dir = Path(drafts_dir)
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn = None
+        self._drafts = None  # draft name -> (source_file, message_id); None until first use
+        self._by_source = defaultdict(set)
+        self._by_message = defaultdict(set)
+
+    def find(self, source_file: str, message_id: str = None):
+        """Name of a pending draft for this source file or message id, else None"""
+        with self._lock:
+            self._ensure_loaded()
+            candidates = set(self._by_source.get(source_file, ()))
+            if message_id:
+                candidates |= self._by_message.get(message_id, set())
+            for name in sorted(candidates):
+                if (self.drafts_dir / name).exists():
+                    return name
+                self._forget(name)
+            return None
+
+    def add(self, draft_name: str, source_file: str, message_id: str = ''):
+        with self._lock:
+            self._ensure_loaded()
+            self._remember(draft_name, source_file, message_id or '')
+            self._conn.execute(
+                'INSERT OR REPLACE INTO invoice_drafts (draft_name, source_file, message_id) VALUES (?, ?, ?)',
+                (draft_name, source_file, message_id or ''),
+            )
+            self._conn.commit()
+
+    def discard(self, draft_name: str):
+        with self._lock:
+            if self._drafts is not None and draft_name in self._drafts:
+                self._forget(draft_name)
+
+    def __len__(self):
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._drafts)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _ensure_loaded(self):
+        """Load persisted rows, then reconcile them with the directory listing once"""
+        if self._drafts is not None:
+            return
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS invoice_drafts ('
+            ' draft_name TEXT PRIMARY KEY, source_file TEXT NOT NULL, message_id TEXT NOT NULL)'
+        )
+        self._conn.commit()
+        self._drafts = {}
+        rows = self._conn.execute('SELECT draft_name, source_file, message_id FROM invoice_drafts').fetchall()
+        on_disk = {p.name: p for p in self.drafts_dir.glob(self.PATTERN)} if self.drafts_dir.exists() else {}
+
+        stale = [(name,) for name, _, _ in rows if name not in on_disk]
+        for name, source_file, message_id in rows:
+            if name in on_disk:
+                self._remember(name, source_file, message_id)
+        fresh = []
+        for name, path in on_disk.items():
+            if name in self._drafts:
+                continue
+            try:
+                source_file, message_id = read_draft_keys(path)
+            except OSError:
+                continue
+            self._remember(name, source_file, message_id)
+            fresh.append((name, source_file, message_id))
+
+        self._conn.executemany('DELETE FROM invoice_drafts WHERE draft_name = ?', stale)
+        self._conn.executemany(
+            'INSERT OR REPLACE INTO invoice_drafts (draft_name, source_file, message_id) VALUES (?, ?, ?)',
+            fresh,
+        )
+        self._conn.commit()
+
+    def _remember(self, name, source_file, message_id):
+        self._drafts[name] = (source_file, message_id)
+        if source_file:
+            self._by_source[source_file].add(name)
+        if message_id:
+            self._by_message[message_id].add(name)
+
+    def _forget(self, name):
+        source_file, message_id = self._drafts.pop(name)
+        for index, key in ((self._by_source, source_file), (self._by_message, message_id)):
+            names = index.get(key)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del index[key]
+        self._conn.execute('DELETE FROM invoice_drafts WHERE draft_name = ?', (name,))
+        self._conn.commit()
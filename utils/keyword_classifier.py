@@ -0,0 +1,135 @@
+"""Keyword Classifier - One compiled pass over a message for every routing signal"""
+import re
+from typing import Dict, Iterable, Set
+
+from utils.vault_markdown import parse_markdown
+
+# Keyword classifications for message urgency (checked in this order)
+URGENT_KEYWORDS = ['urgent', 'asap', 'emergency', 'help', 'problem', 'crisis', 'down', 'broken', 'critical', 'immediately']
+BUSINESS_KEYWORDS = ['pricing', 'rate', 'invoice', 'payment', 'contract', 'proposal', 'quote', 'budget', 'cost', 'fee']
+INFO_KEYWORDS = ['thanks', 'ok', 'yes', 'no', 'sounds', 'great', 'perfect', 'confirmed', 'received']
+
+POST_KEYWORDS = [
+    'post to', 'post about', 'post this', 'tweet about', 'tweet this',
+    'share on', 'share to', 'social media', 'facebook', 'linkedin',
+    'twitter', 'please post', 'can you post', 'pls post'
+]
+INVOICE_KEYWORDS = ['invoice', 'invoiced', 'invoicing']  # plurals match via the suffix rule
+
+URGENCY_ORDER = (('URGENT', 'urgent'), ('BUSINESS', 'business'), ('INFO', 'info'))
+
+# Sections whose text is not the sender's request: the address block and quoted earlier messages
+IGNORED_SECTIONS = ('From', 'Thread History')
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Regex for a keyword trie: shared prefixes are matched once, like an Aho-Corasick goto table"""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [
+            (r'\s+' if char == ' ' else re.escape(char)) + build(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class KeywordClassifier:
+    """Match many keyword groups in a single regex scan with word boundaries.
+
+    Keywords are compiled into one trie-shaped pattern, so the text is walked
+    once in C and each word start costs one character dispatch however many
+    keywords or groups there are. Multi-word keywords match across any
+    whitespace, and a trailing plural ``s``/``es`` still counts as the
+    keyword ("rates", "invoices", "problems").
+    """
+
+    def __init__(self, groups: Dict[str, Iterable[str]]):
+        self.groups_by_keyword = {}
+        for group, keywords in groups.items():
+            for keyword in keywords:
+                self.groups_by_keyword.setdefault(self._normalize(keyword), set()).add(group)
+        self.pattern = re.compile(r'\b(' + _trie_pattern(self.groups_by_keyword) + r')(?:s|es)?\b')
+
+    @staticmethod
+    def _normalize(keyword: str) -> str:
+        return ' '.join(keyword.lower().split())
+
+    def scan(self, text: str) -> Dict[str, Set[str]]:
+        """Return {group: keywords found} for every group with at least one hit"""
+        hits = {}
+        for match in self.pattern.finditer((text or '').lower()):
+            keyword = self._normalize(match.group(1))
+            for group in self.groups_by_keyword[keyword]:
+                hits.setdefault(group, set()).add(keyword)
+        return hits
+
+
+ROUTING_CLASSIFIER = KeywordClassifier({
+    'urgent': URGENT_KEYWORDS,
+    'business': BUSINESS_KEYWORDS,
+    'info': INFO_KEYWORDS,
+    'post': POST_KEYWORDS,
+    'invoice': INVOICE_KEYWORDS,
+})
+
+
+def urgency_from_hits(hits: Dict[str, Set[str]]) -> str:
+    for label, group in URGENCY_ORDER:
+        if group in hits:
+            return label
+    return 'NORMAL'
+
+
+def classify_urgency(message_text: str) -> str:
+    """URGENT / BUSINESS / INFO / NORMAL from whole-word keyword hits"""
+    return urgency_from_hits(ROUTING_CLASSIFIER.scan(message_text))
+
+
+def route_signals(content: str, filename: str = '') -> dict:
+    """Every inbox routing signal for a vault item from one keyword scan.
+
+    The channel comes from the frontmatter ``type`` and filename. Keyword
+    signals are scanned over the body minus the ``## From`` block and any
+    quoted ``## Thread History``, so sender addresses (frontmatter or body)
+    and requests already handled earlier in a thread do not count again.
+    """
+    document = parse_markdown(content)
+    doc_type = (document.get('type') or '').lower()
+    name = filename.upper()
+    if document.sections:
+        text = '\n'.join(
+            f'{heading}\n{section}' for heading, section in document.sections
+            if not heading.startswith(IGNORED_SECTIONS)
+        )
+    else:
+        text = document.body
+    hits = ROUTING_CLASSIFIER.scan(text)
+
+    is_whatsapp = doc_type.startswith('whatsapp') or 'WHATSAPP' in name
+    is_tweet = doc_type.startswith('tweet') or 'TWEET' in name or 'SOCIAL' in name
+    is_email = doc_type.startswith('email') or ('from' in document.frontmatter and not doc_type.startswith('whatsapp'))
+    channel = next(
+        (label for label, flag in (('whatsapp', is_whatsapp), ('tweet', is_tweet), ('email', is_email)) if flag),
+        None,
+    )
+    return {
+        'type': channel,
+        'is_whatsapp': is_whatsapp,
+        'is_tweet': is_tweet,
+        'is_email': is_email,
+        'post_request': 'post' in hits,
+        'invoice_request': 'invoice' in hits,
+        'urgency': urgency_from_hits(hits),
+        'keywords': hits,
+    }
@@ -0,0 +1,204 @@
+"""LLM Cache - On-disk cache of chat completions shared by the drafters"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE = '.llm_cache.sqlite3'
+
+
+def cache_key(**request) -> str:
+    """sha256 of the request: model, messages (system + user prompts), temperature and any other options"""
+    payload = json.dumps(request, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite-backed response cache with TTL expiry and LRU eviction.
+
+    Rows remember how long the original call took, so ``stats`` can report
+    the latency saved by hits next to the hit rate. ``bypass`` skips
+    lookups but still stores fresh answers (useful to force a re-draft).
+    """
+
+    PRUNE_EVERY = 100  # writes between expiry/size sweeps
+
+    def __init__(self, path: Path, max_entries: int = 5000, ttl_seconds: float = 72 * 3600,
+                 bypass: bool = False, clock=time.time):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.bypass = bypass
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = None  # opened on first use so constructing a drafter touches no files
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    @property
+    def _db(self):
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                ' key TEXT PRIMARY KEY, content TEXT NOT NULL, latency REAL NOT NULL,'
+                ' expires_at REAL NOT NULL, last_used REAL NOT NULL) WITHOUT ROWID'
+            )
+            self._conn.execute('CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_used)')
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: str):
+        """Cached content for ``key``, or None on a miss, an expired row or bypass"""
+        with self._lock:
+            if self.bypass:
+                self.misses += 1
+                return None
+            now = self._clock()
+            row = self._db.execute(
+                'SELECT content, latency, expires_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None or row[2] <= now:
+                if row is not None:
+                    self._db.execute('DELETE FROM responses WHERE key = ?', (key,))
+                    self._db.commit()
+                self.misses += 1
+                return None
+            self._db.execute('UPDATE responses SET last_used = ? WHERE key = ?', (now, key))
+            self._db.commit()
+            self.hits += 1
+            self.saved_seconds += row[1]
+            return row[0]
+
+    def put(self, key: str, content: str, latency: float):
+        with self._lock:
+            now = self._clock()
+            self._db.execute(
+                'INSERT OR REPLACE INTO responses (key, content, latency, expires_at, last_used)'
+                ' VALUES (?, ?, ?, ?, ?)',
+                (key, content, latency, now + self.ttl_seconds, now),
+            )
+            self._db.commit()
+            self._writes += 1
+            if self._writes >= self.PRUNE_EVERY:
+                self._writes = 0
+                self._prune()
+
+    def _prune(self):
+        self._db.execute('DELETE FROM responses WHERE expires_at <= ?', (self._clock(),))
+        self._db.execute(
+            'DELETE FROM responses WHERE key IN ('
+            ' SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)',
+            (self.max_entries,),
+        )
+        self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'saved_s': round(self.saved_seconds, 2),
+            }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class CachedChatClient:
+    """Drop-in for an OpenAI client whose ``chat.completions.create`` goes through the cache.
+
+    Only ``choices[0].message.content`` is kept, which is all the drafters
+    read. Only complete answers (``finish_reason == 'stop'``) are cached, so
+    a reply cut off at max_tokens is never replayed as if it were whole;
+    empty answers and errors are never cached either.
+    """
+
+    def __init__(self, client, cache: LLMResponseCache):
+        self.client = client
+        self.cache = cache
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **request):
+        key = cache_key(**request)
+        content = self.cache.get(key)
+        if content is not None:
+            logger.debug(f"LLM cache hit ({request.get('model')})")
+            return _response(content)
+        started = time.perf_counter()
+        response = self.client.chat.completions.create(**request)
+        choice = response.choices[0]
+        content = choice.message.content
+        if content and getattr(choice, 'finish_reason', None) == 'stop':
+            self.cache.put(key, content, time.perf_counter() - started)
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+def _response(content: str):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content), finish_reason='stop')])
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def shared_cache(vault_path: Path) -> LLMResponseCache:
+    """One cache per vault, configured from LLM_CACHE_* env vars"""
+    path = Path(vault_path) / CACHE_FILE
+    with _caches_lock:
+        cache = _caches.get(str(path))
+        if cache is None:
+            cache = LLMResponseCache(
+                path,
+                max_entries=int(os.getenv('LLM_CACHE_MAX_ENTRIES', '5000')),
+                ttl_seconds=float(os.getenv('LLM_CACHE_TTL_HOURS', '72')) * 3600,
+                bypass=os.getenv('LLM_CACHE_BYPASS', 'false').lower() == 'true',
+            )
+            _caches[str(path)] = cache
+        return cache
+
+
+def wrap_client(client, vault_path: Path):
+    """``client`` behind the vault's shared cache, or unchanged when LLM_CACHE=false or client is None"""
+    if client is None or os.getenv('LLM_CACHE', 'true').lower() != 'true':
+        return client
+    return CachedChatClient(client, shared_cache(vault_path))
+
+
+def cache_stats() -> dict:
+    """Stats of every open cache, keyed by file path"""
+    with _caches_lock:
+        caches = dict(_caches)
+    return {path: cache.stats() for path, cache in caches.items()}
+
+
+def close_caches():
+    with _caches_lock:
+        caches = list(_caches.values())
+        _caches.clear()
+    for cache in caches:
+        cache.close()
@@ -0,0 +1,191 @@
+"""Odoo Adapter Pool - Long-lived odoo_mcp processes spoken to over line-delimited JSON"""
+import itertools
+import json
+import logging
+import queue
+import subprocess
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class AdapterProcess:
+    """One ``node index.js --legacy-stdio`` child that answers ``{id, tool, input}`` lines.
+
+    stdout and stderr are drained by daemon threads so a chatty adapter can
+    never fill a pipe and stall; responses are matched to requests by ``id``.
+    """
+
+    def __init__(self, command, env=None, cwd=None):
+        self.command = command
+        self.env = env
+        self.cwd = cwd
+        self.proc = None
+        self.responses = queue.Queue()
+        self.exited = threading.Event()
+        self.stderr_tail = deque(maxlen=20)
+        self.requests_served = 0
+        self.started_at = None
+
+    def start(self):
+        self.proc = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            env=self.env,
+            cwd=self.cwd,
+        )
+        self.responses = queue.Queue()
+        self.exited = threading.Event()
+        self.started_at = time.monotonic()
+        threading.Thread(
+            target=self._read_stdout, args=(self.proc, self.responses, self.exited), daemon=True
+        ).start()
+        threading.Thread(target=self._read_stderr, args=(self.proc,), daemon=True).start()
+
+    def _read_stdout(self, proc, responses, exited):
+        for line in proc.stdout:
+            line = line.strip()
+            if line:
+                responses.put(line)
+        exited.set()  # EOF: the adapter exited, even if it has not been reaped yet
+        responses.put(None)
+
+    def _read_stderr(self, proc):
+        for line in proc.stderr:
+            self.stderr_tail.append(line.rstrip())
+
+    def alive(self) -> bool:
+        return self.proc is not None and not self.exited.is_set() and self.proc.poll() is None
+
+    def request(self, request_id: str, tool: str, tool_input: dict, timeout: float) -> dict:
+        try:
+            self.proc.stdin.write(json.dumps({'id': request_id, 'tool': tool, 'input': tool_input}) + '\n')
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError) as error:
+            raise RuntimeError(f"Odoo adapter failed: {self._detail('process exited')}") from error
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.stop()
+                raise RuntimeError("Odoo adapter request timed out")
+            try:
+                line = self.responses.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if line is None:
+                raise RuntimeError(f"Odoo adapter failed: {self._detail('process exited')}")
+            try:
+                response = json.loads(line)
+            except json.JSONDecodeError as error:
+                raise RuntimeError("Odoo adapter returned invalid JSON") from error
+            if not isinstance(response, dict):
+                raise RuntimeError("Odoo adapter returned an invalid response")
+            # Ignore late answers to requests that already timed out
+            if response.get('id', request_id) != request_id:
+                continue
+            self.requests_served += 1
+            return response
+
+    def _detail(self, fallback):
+        code = self.proc.poll() if self.proc else None
+        if self.stderr_tail:
+            return self.stderr_tail[-1]
+        return f"exit status {code}" if code is not None else fallback
+
+    def stop(self):
+        if self.proc is None:
+            return
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+
+
+class OdooAdapterPool:
+    """Fixed set of adapter processes reused across invoice/payment actions.
+
+    Each process authenticates with Odoo on its first call and keeps the uid,
+    so N approvals cost one login per process instead of one per action.
+    Dead processes are restarted on checkout; ``check_health`` pings idle ones.
+    """
+
+    def __init__(self, command, env=None, cwd=None, size: int = 1, timeout: float = 30.0):
+        self.command = command
+        self.env = env
+        self.cwd = cwd
+        self.size = size
+        self.timeout = timeout
+        self._ids = itertools.count(1)
+        self._idle = queue.Queue()
+        self._closed = False
+        self.restarts = 0
+        for _ in range(size):
+            self._idle.put(AdapterProcess(command, env=env, cwd=cwd))
+
+    def request(self, tool: str, tool_input: dict) -> dict:
+        """Send one tool call to an idle adapter, (re)starting it if needed"""
+        worker = self._checkout()
+        try:
+            return worker.request(str(next(self._ids)), tool, tool_input, self.timeout)
+        finally:
+            self._idle.put(worker)
+
+    def _checkout(self):
+        if self._closed:
+            raise RuntimeError("Odoo adapter pool is closed")
+        worker = self._idle.get()
+        if not worker.alive():
+            try:
+                if worker.proc is not None:
+                    self.restarts += 1
+                    logger.warning(f"Restarting Odoo adapter: {worker._detail('process exited')}")
+                worker.start()
+            except OSError as error:
+                self._idle.put(worker)
+                raise RuntimeError(f"Odoo adapter failed to start: {error}") from error
+        return worker
+
+    def check_health(self) -> dict:
+        """Ping every idle adapter; a failed ping stops it so the next checkout restarts it"""
+        healthy = 0
+        checked = 0
+        for _ in range(self.size):
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break  # busy workers are proving their health already
+            checked += 1
+            try:
+                if worker.alive():
+                    response = worker.request(str(next(self._ids)), 'ping', {}, min(self.timeout, 5.0))
+                    if response.get('status') == 'ok':
+                        healthy += 1
+                    else:
+                        worker.stop()
+            except RuntimeError as error:
+                logger.warning(f"Odoo adapter health check failed: {error}")
+                worker.stop()
+            finally:
+                self._idle.put(worker)
+        return {'checked': checked, 'healthy': healthy, 'restarts': self.restarts}
+
+    def close(self):
+        self._closed = True
+        for _ in range(self.size):
+            try:
+                self._idle.get(timeout=self.timeout).stop()
+            except queue.Empty:
+                break
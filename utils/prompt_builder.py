@@ -0,0 +1,103 @@
+"""Prompt Builder - Strip quoted text and fit email threads into a token budget before drafting"""
+import re
+
+# tiktoken is optional; without it tokens are estimated at ~4 characters each
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding('o200k_base')
+except Exception:
+    _encoding = None
+
+QUOTE_ATTRIBUTION = re.compile(r'^\s*On\b.{0,300}\bwrote:\s*$')
+REPLY_SEPARATOR = re.compile(r'^\s*(?:-{2,}\s*Original Message\s*-{2,}|_{10,})\s*$', re.IGNORECASE)
+SIGNATURE_DELIMITER = re.compile(r'^--\s?$')  # RFC 3676 "-- " line
+MESSAGE_HEADING = re.compile(r'^### Message \d+: (.*)$', re.MULTILINE)
+PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+TRUNCATED = "\n[...truncated]"
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    if _encoding is not None:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def truncate_tokens(text: str, budget: int) -> str:
+    """``text`` cut to roughly ``budget`` tokens, keeping the beginning"""
+    if count_tokens(text) <= budget:
+        return text
+    budget = max(budget - count_tokens(TRUNCATED), 0)
+    if _encoding is not None:
+        head = _encoding.decode(_encoding.encode(text, disallowed_special=())[:budget])
+    else:
+        head = text[:budget * 4]
+    return head.rstrip() + TRUNCATED
+
+
+def clean_message(text: str) -> str:
+    """Drop ``>`` quoted lines, "On ... wrote:" attributions, forwarded originals and the signature.
+
+    Returns the original text (stripped) if nothing but quotes would remain,
+    so inline replies to a fully quoted message are not lost entirely.
+    """
+    kept = []
+    for line in (text or '').splitlines():
+        if REPLY_SEPARATOR.match(line) or SIGNATURE_DELIMITER.match(line):
+            break
+        if line.lstrip().startswith('>') or QUOTE_ATTRIBUTION.match(line):
+            continue
+        kept.append(line.rstrip())
+    cleaned = re.sub(r'\n{3,}', '\n\n', '\n'.join(kept)).strip()
+    return cleaned or (text or '').strip()
+
+
+def split_thread(history: str) -> list:
+    """[(heading, body)] for the ``### Message N: <date> from <sender>`` blocks GmailWatcher writes"""
+    parts = MESSAGE_HEADING.split(history or '')
+    if len(parts) == 1:
+        body = parts[0].strip()
+        return [('', body)] if body else []
+    messages = []
+    for heading, body in zip(parts[1::2], parts[2::2]):
+        body = body.strip()
+        if body.endswith('---'):
+            body = body[:-3].rstrip()
+        messages.append((heading.strip(), body))
+    return messages
+
+
+def fit_thread(history: str, budget: int) -> str:
+    """Thread history cleaned, de-duplicated and trimmed to ``budget`` tokens, newest messages first.
+
+    Paragraphs already seen earlier in the thread (repeated signatures,
+    disclaimers, history pasted without ``>``) are dropped from later
+    messages. Messages are then kept from the newest backwards until the
+    budget is spent; older ones are replaced by a one-line note.
+    """
+    seen = set()
+    blocks = []
+    for index, (heading, body) in enumerate(split_thread(history), 1):
+        paragraphs = []
+        for paragraph in PARAGRAPH_BREAK.split(clean_message(body)):
+            key = ' '.join(paragraph.split()).lower()
+            if key and key not in seen:
+                seen.add(key)
+                paragraphs.append(paragraph.strip())
+        title = f"### Message {index}: {heading}\n\n" if heading else ""
+        blocks.append(title + ('\n\n'.join(paragraphs) or '(no new content)') + "\n\n---\n\n")
+
+    kept = []
+    remaining = budget
+    for block in reversed(blocks):
+        cost = count_tokens(block)
+        if cost > remaining:
+            if not kept:
+                kept.append(truncate_tokens(block, remaining) + "\n\n---\n\n")
+            break
+        kept.append(block)
+        remaining -= cost
+    omitted = len(blocks) - len(kept)
+    note = f"[{omitted} earlier message(s) omitted]\n\n" if omitted else ""
+    return note + ''.join(reversed(kept)).rstrip()
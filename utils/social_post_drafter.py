@@ -2,10 +2,13 @@
 import os
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Tuple, Dict
 
+from utils.llm_cache import wrap_client
+
 try:
     from dotenv import load_dotenv
     load_dotenv()
@@ -14,6 +17,23 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+PLATFORMS = ('twitter', 'facebook', 'linkedin')
+PLATFORM_LABELS = {'twitter': 'Twitter', 'facebook': 'Facebook', 'linkedin': 'LinkedIn'}
+# Hard post-length limits, enforced locally whatever the model returns
+PLATFORM_LIMITS = {'twitter': 280, 'facebook': 63206, 'linkedin': 3000}
+
+
+def enforce_length(platform: str, text: str) -> str:
+    """Cut ``text`` to the platform's limit, at a word boundary when one is close"""
+    limit = PLATFORM_LIMITS[platform]
+    if len(text) <= limit:
+        return text
+    cut = text[:limit - 3]
+    if ' ' in cut[-40:]:
+        cut = cut[:cut.rindex(' ')]
+    return cut.rstrip() + "..."
+
+
 class SocialPostDrafter:
     """Uses OpenAI to generate posts for Twitter, Facebook, and LinkedIn"""
 
@@ -23,11 +43,14 @@ class SocialPostDrafter:
         self.api_key = os.getenv('OPENAI_API_KEY')
         self.model = "gpt-4o-mini"
         self.client = None
+        # concurrent: one request per platform in parallel; single: one JSON request for all three
+        self.post_mode = os.getenv('SOCIAL_POST_MODE', 'concurrent').strip().lower()
+        self.pool = ThreadPoolExecutor(max_workers=len(PLATFORMS), thread_name_prefix='social-post')
 
         if self.api_key:
             try:
                 from openai import OpenAI
-                self.client = OpenAI(api_key=self.api_key)
+                self.client = wrap_client(OpenAI(api_key=self.api_key), self.vault)
                 logger.info("✓ SocialPostDrafter initialized (OpenAI gpt-4o-mini)")
             except ImportError:
                 logger.error("OpenAI SDK not installed")
@@ -41,34 +64,93 @@ class SocialPostDrafter:
             logger.warning("OpenAI not configured - skipping post drafting")
             return {}
 
-        results = {}
+        if self.post_mode == 'single':
+            posts = self._generate_all_posts(topic, context, style)
+        else:
+            posts = {}
+        missing = [platform for platform in PLATFORMS if platform not in posts]
+        if missing:
+            posts.update(self._generate_concurrently(missing, topic, context, style))
 
-        # Generate Twitter post (280 chars)
-        twitter_text, twitter_conf = self._generate_twitter_post(topic, context, style)
-        if twitter_text:
-            twitter_path = self._create_draft_file("twitter", topic, twitter_text, twitter_conf, context)
-            if twitter_path:
-                results['twitter'] = twitter_path
-                logger.info(f"✓ Twitter draft created: {twitter_path.name}")
-
-        # Generate Facebook post (longer, conversational)
-        facebook_text, facebook_conf = self._generate_facebook_post(topic, context, style)
-        if facebook_text:
-            facebook_path = self._create_draft_file("facebook", topic, facebook_text, facebook_conf, context)
-            if facebook_path:
-                results['facebook'] = facebook_path
-                logger.info(f"✓ Facebook draft created: {facebook_path.name}")
-
-        # Generate LinkedIn post (professional, detailed)
-        linkedin_text, linkedin_conf = self._generate_linkedin_post(topic, context, style)
-        if linkedin_text:
-            linkedin_path = self._create_draft_file("linkedin", topic, linkedin_text, linkedin_conf, context)
-            if linkedin_path:
-                results['linkedin'] = linkedin_path
-                logger.info(f"✓ LinkedIn draft created: {linkedin_path.name}")
+        results = {}
+        for platform in PLATFORMS:
+            text, confidence = posts[platform]
+            if not text:
+                continue
+            draft_path = self._create_draft_file(platform, topic, text, confidence, context)
+            if draft_path:
+                results[platform] = draft_path
+                logger.info(f"✓ {PLATFORM_LABELS[platform]} draft created: {draft_path.name}")
 
         return results
 
+    def _generate_concurrently(self, platforms, topic: str, context: str, style: str) -> Dict[str, Tuple[str, float]]:
+        """One request per platform, all in flight at once"""
+        generators = {
+            'twitter': self._generate_twitter_post,
+            'facebook': self._generate_facebook_post,
+            'linkedin': self._generate_linkedin_post,
+        }
+        futures = {platform: self.pool.submit(generators[platform], topic, context, style)
+                   for platform in platforms}
+        return {platform: future.result() for platform, future in futures.items()}
+
+    def _generate_all_posts(self, topic: str, context: str, style: str) -> Dict[str, Tuple[str, float]]:
+        """All three variants from one structured request; platforms it fails to return are left out"""
+        prompt = f"""Generate {style} social media posts about: {topic}
+
+Context: {context if context else 'N/A'}
+
+TWITTER REQUIREMENTS:
+1. Maximum 280 characters (strict)
+2. Engaging and shareable, 2-3 relevant hashtags
+3. Call to action if possible
+
+FACEBOOK REQUIREMENTS:
+1. Conversational but professional tone
+2. 2-4 paragraphs (150-300 words)
+3. Emoji OK (1-2 max)
+4. End with engagement question
+5. No hashtags
+
+LINKEDIN REQUIREMENTS:
+1. Professional and insightful, thought leadership tone
+2. 2-4 paragraphs (200-400 words)
+3. Include key takeaway at the end
+4. Relevant hashtags (#AI #Automation #Leadership etc)
+5. Call to action (discussion, feedback, connection)
+
+Return ONLY a JSON object (no markdown, no code blocks):
+{{"twitter": "<tweet text>", "facebook": "<post text>", "linkedin": "<post text>"}}"""
+
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": "You are a social media expert writing platform-native posts for Twitter, Facebook and LinkedIn."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.8,
+                max_tokens=1400,  # 280 chars + up to 300 + 400 words, plus JSON escaping
+                response_format={"type": "json_object"}
+            )
+            choice = response.choices[0]
+            if getattr(choice, 'finish_reason', None) == 'length':
+                raise ValueError("response was cut off at max_tokens")
+            variants = json.loads(choice.message.content)
+            if not isinstance(variants, dict):
+                raise ValueError("response is not a JSON object")
+        except Exception as e:
+            logger.warning(f"Combined post draft failed, drafting per platform: {e}")
+            return {}
+
+        posts = {}
+        for platform in PLATFORMS:
+            text = variants.get(platform)
+            if isinstance(text, str) and text.strip():
+                posts[platform] = (enforce_length(platform, text.strip()), 0.90)
+        return posts
+
     def _generate_twitter_post(self, topic: str, context: str, style: str) -> Tuple[str, float]:
         """Generate Twitter post (max 280 chars)"""
         prompt = f"""Generate a {style} tweet about: {topic}
@@ -95,9 +177,7 @@ Return ONLY the tweet text, nothing else."""
                 max_tokens=100
             )
             tweet = response.choices[0].message.content.strip()
-            if len(tweet) > 280:
-                tweet = tweet[:277] + "..."
-            return tweet, 0.90
+            return enforce_length('twitter', tweet), 0.90
         except Exception as e:
             logger.error(f"Twitter draft error: {e}")
             return "", 0.0
@@ -127,7 +207,7 @@ Return ONLY the post text, nothing else."""
                 temperature=0.8,
                 max_tokens=300
             )
-            return response.choices[0].message.content.strip(), 0.90
+            return enforce_length('facebook', response.choices[0].message.content.strip()), 0.90
         except Exception as e:
             logger.error(f"Facebook draft error: {e}")
             return "", 0.0
@@ -158,14 +238,14 @@ Return ONLY the post text, nothing else."""
                 temperature=0.8,
                 max_tokens=400
             )
-            return response.choices[0].message.content.strip(), 0.90
+            return enforce_length('linkedin', response.choices[0].message.content.strip()), 0.90
         except Exception as e:
             logger.error(f"LinkedIn draft error: {e}")
             return "", 0.0
 
     def _create_draft_file(self, platform: str, topic: str, content: str, confidence: float, context: str) -> Optional[Path]:
         """Create draft file in Pending_Approval"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
         platform_upper = platform.upper()
         draft_filename = f"{platform_upper}_DRAFT_{timestamp}.md"
         draft_path = self.pending / draft_filename
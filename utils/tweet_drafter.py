@@ -7,6 +7,8 @@ from pathlib import Path
 from datetime import datetime
 from typing import Optional, Tuple
 
+from utils.llm_cache import wrap_client
+
 # Load environment variables from .env file
 try:
     from dotenv import load_dotenv
@@ -33,7 +35,7 @@ class TweetDrafter:
         if self.api_key:
             try:
                 from openai import OpenAI
-                self.client = OpenAI(api_key=self.api_key)
+                self.client = wrap_client(OpenAI(api_key=self.api_key), self.vault)
                 logger.info("✓ TweetDrafter initialized (OpenAI gpt-4o-mini)")
             except ImportError:
                 logger.error("OpenAI SDK not installed. Install: pip install openai")
@@ -143,7 +145,7 @@ Topics often include: AI automation, productivity, business insights, tech trend
     def _create_draft_file(self, request: dict, tweet_text: str, confidence: float) -> Path:
         """Create POST draft file in Pending_Approval"""
 
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
         draft_filename = f"POST_TWEET_{timestamp}.md"
         draft_path = self.pending / draft_filename
 
@@ -0,0 +1,84 @@
+"""Vault Documents - Shared cache of parsed vault config files, reloaded when their mtime changes"""
+import logging
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_entries = {}  # (path, parser) -> ((mtime_ns, size) or None, value)
+_stats = {'reads': 0, 'hits': 0}
+
+
+def load(path: Path, parser, default=None):
+    """``parser(text)`` of the file at ``path``, re-read only when its (mtime, size) change.
+
+    Every drafter and filter that asks for the same file with the same parser
+    shares one parsed value, so treat it as read-only. A missing or
+    unreadable file yields ``default``.
+    """
+    path = Path(path)
+    try:
+        stat = path.stat()
+        version = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        version = None
+    key = (str(path), parser)
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and entry[0] == version:
+            _stats['hits'] += 1
+            return entry[1]
+
+    value = default
+    if version is not None:
+        try:
+            value = parser(path.read_text(encoding='utf-8'))
+            logger.debug(f"✓ Loaded {path.name}")
+        except OSError as e:
+            logger.error(f"Error loading {path.name}: {e}")
+            version = None
+    with _lock:
+        _stats['reads'] += 1
+        _entries[key] = (version, value)
+    return value
+
+
+def parse_handbook(text: str) -> dict:
+    """Known contacts and raw text from Company_Handbook.md"""
+    known_contacts = []
+    if "Known Contacts" in text:
+        section = text.split("Known Contacts")[1].split("**Response Rules")[0]
+        for line in section.split('\n'):
+            if line.strip().startswith('- '):
+                known_contacts.append(line.strip().lstrip('- '))
+    return {
+        'known_contacts': tuple(known_contacts),
+        'known_contacts_lower': frozenset(contact.lower() for contact in known_contacts),
+        'handbook_text': text,
+    }
+
+
+def _text(text: str) -> str:
+    return text
+
+
+def handbook_rules(path: Path) -> dict:
+    """Parsed Company_Handbook.md, or {} when it doesn't exist"""
+    return load(path, parse_handbook, {})
+
+
+def read_cached_text(path: Path) -> str:
+    """File contents (e.g. EmailStyle.md), or "" when it doesn't exist"""
+    return load(path, _text, "")
+
+
+def stats() -> dict:
+    with _lock:
+        return dict(_stats)
+
+
+def clear_cache():
+    with _lock:
+        _entries.clear()
+        _stats.update(reads=0, hits=0)
@@ -0,0 +1,226 @@
+"""Vault Markdown - Single-pass parser for vault items with a (path, mtime, size) cache"""
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+CACHE_SIZE = 512
+HEADER_CACHE_SIZE = 8192
+HEADER_BODY_BYTES = 4096
+
+_FRONTMATTER_END = re.compile(rb'\A\s*---[ \t]*\r?\n.*?^[ \t]*---[ \t]*(?:\r?\n|\Z)', re.S | re.M)
+
+
+class VaultDocument:
+    """Parsed vault markdown file.
+
+    ``frontmatter`` holds flat ``key: value`` strings exactly as written (the
+    orchestrator's historical behaviour); ``lists`` holds ``key:`` blocks of
+    ``- item`` lines such as attachments. ``sections`` keeps ``## `` headings
+    in file order; ``###`` sub-headings stay inside their parent section.
+    ``truncated`` is set on documents from ``load_header`` whose body was cut.
+    """
+
+    def __init__(self, content, frontmatter, lists, raw_frontmatter, body, sections, truncated=False):
+        self.content = content
+        self.frontmatter = frontmatter
+        self.lists = lists
+        self.raw_frontmatter = raw_frontmatter
+        self.body = body
+        self.sections = sections
+        self.truncated = truncated
+        self._yaml = None
+
+    def get(self, key, default=None):
+        return self.frontmatter.get(key, default)
+
+    @property
+    def attachments(self):
+        return self.lists.get('attachments', [])
+
+    def section(self, *titles, default=''):
+        """Text of the first ``## `` section whose heading starts with any of ``titles``"""
+        for heading, text in self.sections:
+            if any(heading.startswith(title) for title in titles):
+                return text
+        return default
+
+    def yaml_frontmatter(self) -> dict:
+        """Frontmatter parsed as YAML (typed values); parsed once per cached document"""
+        if self._yaml is None:
+            metadata = {}
+            if self.raw_frontmatter:
+                import yaml
+                try:
+                    # libyaml's loader when PyYAML was built with it; same safe semantics, ~10x faster
+                    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+                    metadata = yaml.load(self.raw_frontmatter, Loader=loader) or {}
+                except yaml.YAMLError:
+                    metadata = {}
+                if not isinstance(metadata, dict):
+                    metadata = {}
+            self._yaml = metadata
+        return dict(self._yaml)
+
+
+def _section_text(lines):
+    """Join section lines, dropping the ``---`` rules drafts use between sections"""
+    while lines and lines[-1].strip() in ('', '---'):
+        lines.pop()
+    return '\n'.join(lines).strip()
+
+
+def _parse(content: str) -> VaultDocument:
+    frontmatter, lists = {}, {}
+    raw_frontmatter = ''
+    sections = []
+    lines = content.splitlines(keepends=True)
+    body_start = 0
+    index = 0
+
+    # Frontmatter: first non-blank line is '---', closed by the next '---' line
+    while index < len(lines) and not lines[index].strip():
+        index += 1
+    if index < len(lines) and lines[index].strip() == '---':
+        offset = sum(len(line) for line in lines[:index + 1])
+        meta_lines = []
+        list_key = None
+        for close in range(index + 1, len(lines)):
+            stripped = lines[close].strip()
+            if stripped == '---':
+                raw_frontmatter = ''.join(meta_lines)
+                body_start = offset + len(lines[close])
+                index = close + 1
+                break
+            meta_lines.append(lines[close])
+            offset += len(lines[close])
+            if list_key and stripped.startswith('- '):
+                item = stripped[2:].strip()
+                if item:
+                    lists[list_key].append(item)
+                continue
+            list_key = None
+            if ':' in stripped:
+                key, value = stripped.split(':', 1)
+                key, value = key.strip(), value.strip()
+                if value:
+                    frontmatter[key] = value
+                else:
+                    lists[key] = []
+                    list_key = key
+                    frontmatter.setdefault(key, '')
+        else:
+            # Unclosed frontmatter is treated as plain body
+            frontmatter, lists, index = {}, {}, 0
+
+    body = content[body_start:]
+    heading, section_lines = None, []
+    for line in lines[index:]:
+        line = line.rstrip('\r\n')
+        if line.startswith('## '):
+            if heading is not None:
+                sections.append((heading, _section_text(section_lines)))
+            heading, section_lines = line[3:].strip(), []
+        elif heading is not None:
+            section_lines.append(line)
+    if heading is not None:
+        sections.append((heading, _section_text(section_lines)))
+
+    # Drop empty list placeholders that were really scalar keys with blank values
+    lists = {key: items for key, items in lists.items() if items}
+    return VaultDocument(content, frontmatter, lists, raw_frontmatter, body, sections)
+
+
+_lock = threading.Lock()
+_by_content = OrderedDict()
+_by_path = OrderedDict()
+_headers = OrderedDict()
+
+
+def _remember(cache, key, document, size=CACHE_SIZE):
+    cache[key] = document
+    cache.move_to_end(key)
+    while len(cache) > size:
+        cache.popitem(last=False)
+
+
+def parse_markdown(content: str) -> VaultDocument:
+    """Parse vault markdown; repeated calls with the same string are dict lookups"""
+    with _lock:
+        document = _by_content.get(content)
+        if document is not None:
+            _by_content.move_to_end(content)
+            return document
+    document = _parse(content)
+    with _lock:
+        _remember(_by_content, content, document)
+    return document
+
+
+def load_document(path: Path) -> VaultDocument:
+    """Read and parse a vault file, reusing the parse while (mtime, size) are unchanged"""
+    path = Path(path)
+    stat = path.stat()
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        document = _by_path.get(key)
+        if document is not None:
+            _by_path.move_to_end(key)
+            return document
+    document = parse_markdown(path.read_text(encoding='utf-8'))
+    with _lock:
+        _remember(_by_path, key, document)
+    return document
+
+
+def _read_head(handle, body_bytes):
+    """Bytes covering the whole frontmatter block plus ``body_bytes`` of body, and whether more remain"""
+    data = handle.read(body_bytes)
+    if data.lstrip()[:3] == b'---':
+        match = _FRONTMATTER_END.match(data)
+        while match is None:
+            more = handle.read(body_bytes)
+            if not more:
+                break
+            data += more
+            match = _FRONTMATTER_END.match(data)
+        if match is not None and len(data) < match.end() + body_bytes:
+            data += handle.read(match.end() + body_bytes - len(data))
+    return data, bool(handle.read(1))
+
+
+def load_header(path: Path, body_bytes: int = HEADER_BODY_BYTES) -> VaultDocument:
+    """Parse a vault file's frontmatter and only the first ``body_bytes`` of its body.
+
+    For listings and previews of large queues: the rest of the file is never
+    read. Results are cached while (mtime, size) are unchanged, and a cached
+    full ``load_document`` parse is reused when there is one.
+    """
+    path = Path(path)
+    stat = path.stat()
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    header_key = (*key, body_bytes)
+    with _lock:
+        document = _by_path.get(key)
+        if document is not None:
+            return document
+        document = _headers.get(header_key)
+        if document is not None:
+            _headers.move_to_end(header_key)
+            return document
+    with open(path, 'rb') as handle:
+        data, truncated = _read_head(handle, body_bytes)
+    # A multi-byte character cut at the boundary is dropped rather than failing the read
+    content = data.decode('utf-8', errors='ignore' if truncated else 'strict')
+    document = _parse(content)
+    document.truncated = truncated
+    with _lock:
+        _remember(_headers, header_key, document, HEADER_CACHE_SIZE)
+    return document
+
+
+def clear_cache():
+    with _lock:
+        _by_content.clear()
+        _by_path.clear()
+        _headers.clear()
@@ -5,6 +5,10 @@ from pathlib import Path
 from datetime import datetime
 from typing import Optional
 
+from utils import vault_documents
+from utils.llm_cache import wrap_client
+from utils.vault_markdown import load_document
+
 try:
     from dotenv import load_dotenv
     load_dotenv()
@@ -32,7 +36,7 @@ class WhatsAppDrafter:
         if self.api_key:
             try:
                 from openai import OpenAI
-                self.client = OpenAI(api_key=self.api_key)
+                self.client = wrap_client(OpenAI(api_key=self.api_key), self.vault)
                 logger.info("✓ WhatsAppDrafter initialized (OpenAI gpt-4o-mini)")
             except ImportError:
                 logger.error("OpenAI SDK not installed")
@@ -55,10 +59,8 @@ class WhatsAppDrafter:
         if not self.client:
             return self._fallback_reply(sender, message), 0.5
 
-        # Load handbook for context
-        handbook_context = ""
-        if self.handbook.exists():
-            handbook_context = self.handbook.read_text()[:2000]
+        # Load handbook for context (cached until the file changes)
+        handbook_context = vault_documents.handbook_rules(self.handbook).get('handbook_text', '')[:2000]
 
         prompt = f"""Incoming WhatsApp message from: {sender}
 Message: {message}
@@ -138,45 +140,14 @@ Hamza's AI Assistant"""
             return None
 
         try:
-            content = whatsapp_file.read_text()
+            document = load_document(whatsapp_file)
 
             # Parse the WhatsApp file
-            sender = "Unknown"
-            message = ""
-            full_context = ""
-            urgency = "NORMAL"  # Default urgency
-            priority = "NORMAL"  # Default priority
-
-            # Extract frontmatter for urgency
-            if content.startswith("---"):
-                frontmatter_end = content.find("---", 3)
-                if frontmatter_end > 0:
-                    frontmatter = content[:frontmatter_end]
-                    for line in frontmatter.split('\n'):
-                        if line.startswith('urgency:'):
-                            urgency = line.split(':', 1)[1].strip()
-                        elif line.startswith('priority:'):
-                            priority = line.split(':', 1)[1].strip()
-                        elif line.startswith('from:'):
-                            sender = line.split(':', 1)[1].strip()
-
-            # Extract message section
-            if '## Message' in content:
-                msg_section = content.split('## Message')[1]
-                if '## Full Context' in msg_section:
-                    message = msg_section.split('## Full Context')[0].strip()
-                elif '## Actions' in msg_section:
-                    message = msg_section.split('## Actions')[0].strip()
-                else:
-                    message = msg_section.strip()
-
-            # Extract full context
-            if '## Full Context' in content:
-                ctx_section = content.split('## Full Context')[1]
-                if '## Actions' in ctx_section:
-                    full_context = ctx_section.split('## Actions')[0].strip()
-                else:
-                    full_context = ctx_section.strip()
+            sender = document.get('from', 'Unknown')
+            urgency = document.get('urgency', 'NORMAL')
+            priority = document.get('priority', 'NORMAL')
+            message = document.section('Message')
+            full_context = document.section('Full Context')
 
             # Use full context if message is truncated
             if len(message) < 50 and full_context:
@@ -203,7 +174,7 @@ Hamza's AI Assistant"""
         """Create draft reply file in Pending_Approval"""
         self.pending.mkdir(parents=True, exist_ok=True)
 
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
         draft_filename = f"WHATSAPP_DRAFT_{timestamp}.md"
 
         # Urgency indicators